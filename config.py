@@ -6,7 +6,11 @@ DATABASE_CONFIG = {
     'user': 'medical_user',
     'password': 'your_password',
     'database': 'medical_store',
-    'raise_on_warnings': True
+    'raise_on_warnings': True,
+    # Connection pool (see database.connection.ConnectionPool); pool_size <= 1 disables pooling
+    'pool_size': 5,
+    'pool_timeout': 10,            # seconds to wait for a free connection
+    'pool_health_check_idle': 5    # ping connections that sat idle longer than this (seconds)
 }
 
 
@@ -18,6 +22,7 @@ COMPANY_NAME = "D. Chemist"
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ASSETS_DIR = os.path.join(BASE_DIR, 'assets')
 ICONS_DIR = os.path.join(ASSETS_DIR, 'icons')
+FONTS_DIR = os.path.join(ASSETS_DIR, 'fonts')  # <Family>-Regular/Bold/Italic.ttf for PDF invoices
 INVOICES_DIR = os.path.join(BASE_DIR, 'invoices')
 BACKUPS_DIR = os.path.join(BASE_DIR, 'backups')
 LOGS_DIR = os.path.join(BASE_DIR, 'logs')
@@ -25,4 +30,27 @@ LOGS_DIR = os.path.join(BASE_DIR, 'logs')
 GST_RATE = 12
 LOW_STOCK_THRESHOLD = 10
 EXPIRY_WARNING_DAYS = 30
-SESSION_TIMEOUT = 30
\ No newline at end of file
+SESSION_TIMEOUT = 30
+# bcrypt cost factor for new password hashes; older hashes are upgraded on next login
+BCRYPT_ROUNDS = 12
+# Barcode scan cache (see Medicine.lookup_barcode)
+BARCODE_CACHE_SIZE = 2048
+BARCODE_CACHE_TTL = 300      # seconds; bounds staleness from writes made on other tills
+# Audit log writer (see database.audit.AuditWriter)
+AUDIT_BATCH_SIZE = 200
+AUDIT_FLUSH_INTERVAL = 2.0   # seconds an entry may wait before its batch is written
+AUDIT_SPILL_FILE = os.path.join(LOGS_DIR, 'audit_spill.jsonl')  # entries kept here while the DB is unreachable
+AUDIT_REJECTS_FILE = os.path.join(LOGS_DIR, 'audit_rejects.jsonl')  # entries the DB refused (bad data), kept for inspection
+# Receipt printing (see services.printer_service.PrintSpooler)
+PRINTER_CONFIG = {
+    'backend': 'file',            # 'file' writes jobs to `directory`; 'socket' sends raw to host:port
+    'directory': os.path.join(LOGS_DIR, 'print_spool'),
+    'host': '192.168.1.100',
+    'port': 9100,
+    'format': 'escpos',           # 'escpos' for thermal printers, 'pdf' for A4
+    'width': 42,                  # characters per line: 42 on 80mm paper, 32 on 58mm
+    'auto_print': False,          # queue a receipt as soon as a sale is recorded; enable once a printer is set up
+    'max_attempts': 5,
+    'retry_backoff': 1.0,         # seconds before the first retry, doubling each time
+    'retry_backoff_max': 30.0,
+}
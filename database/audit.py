@@ -0,0 +1,280 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+# Markers passed through the queue alongside entries
+_STOP = object()
+
+
+class AuditWriter:
+    """Buffers audit entries and writes them from a background thread.
+
+    log() only enqueues, so callers never wait on the database. The writer
+    thread sends a batch as one multi-row insert once `batch_size` entries
+    are queued or `flush_interval` seconds after the first one arrived,
+    whichever comes first. If the database is unreachable (`is_transient`
+    says so) the batch is appended to `spill_path` (one JSON entry per
+    line) and replayed once it answers again. Any other error means the
+    database refused the data itself: the batch is split in halves until
+    the offending entries are found, and those go to `rejects_path` so the
+    rest still get written. close() drains the queue; it is registered
+    with atexit.
+    """
+    def __init__(self, write, batch_size=200, flush_interval=2.0, spill_path=None,
+                 max_queue=50000, retry_interval=10.0, rejects_path=None, is_transient=None):
+        self.write = write            # callable(list of entry tuples)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.spill_path = spill_path
+        self.rejects_path = rejects_path
+        self.retry_interval = retry_interval
+        self.is_transient = is_transient or is_connection_error
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._file_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self._db_down_until = 0.0
+        self._last_error = None
+
+        # Metrics
+        self.logged = 0
+        self.written = 0
+        self.batches = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.rejected = 0
+        self.write_time_max = 0.0
+
+    # --- Caller side ---
+
+    def log(self, entry):
+        """Queues one entry tuple; never blocks on the database."""
+        self.start()
+        self.logged += 1
+        if self._closed:
+            self._spill([entry])
+            return
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # The writer is far behind (database down and disk slow); keep the entry anyway
+            self._spill([entry])
+
+    def flush(self, timeout=5.0):
+        """Writes everything queued so far; returns False if that took longer than timeout."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Stops the writer after draining the queue; leftovers are spilled to disk."""
+        with self._start_lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, tuple):
+                leftover.append(item)
+        if leftover:
+            self._spill(leftover)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def stats(self):
+        return {
+            'pending': self.pending(),
+            'logged': self.logged,
+            'written': self.written,
+            'batches': self.batches,
+            'spilled': self.spilled,
+            'replayed': self.replayed,
+            'rejected': self.rejected,
+            'write_time_max': self.write_time_max,
+        }
+
+    # --- Writer thread ---
+
+    def _run(self):
+        while True:
+            batch, waiters, stop = self._next_batch()
+            # Older spilled entries go first, keeping inserts in log order
+            if self._spill_waiting():
+                self._replay()
+            if batch:
+                self._write(batch)
+            for done in waiters:
+                done.set()
+            if stop:
+                return
+
+    def _next_batch(self):
+        """Blocks for the first entry, then collects until batch_size or flush_interval."""
+        batch, waiters = [], []
+        deadline = None
+        while len(batch) < self.batch_size:
+            if deadline is None:
+                # Idle: wake up now and then to retry a spill file
+                timeout = self.retry_interval if self._spill_waiting() else None
+            else:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, waiters, True
+            if isinstance(item, threading.Event):
+                # flush(): write what we have now
+                waiters.append(item)
+                break
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.flush_interval
+        return batch, waiters, False
+
+    def _write(self, batch):
+        if time.monotonic() < self._db_down_until:
+            self._spill(batch)
+            return
+        start = time.perf_counter()
+        rejected = self.rejected
+        unsent = self._deliver(batch)
+        self.written += len(batch) - len(unsent) - (self.rejected - rejected)
+        if unsent:
+            print(f"Audit database unreachable, spilling {len(unsent)} entries to disk: {self._last_error}")
+            self._db_down_until = time.monotonic() + self.retry_interval
+            self._spill(unsent)
+            return
+        self.write_time_max = max(self.write_time_max, time.perf_counter() - start)
+        self.batches += 1
+
+    def _deliver(self, batch):
+        """Writes batch, rejecting entries the database refuses; returns the unsent tail if it went away."""
+        try:
+            self.write(batch)
+        except Exception as e:
+            self._last_error = e
+            if self.is_transient(e):
+                return batch
+            if len(batch) == 1:
+                self._reject(batch[0], e)
+                return []
+            mid = len(batch) // 2
+            unsent = self._deliver(batch[:mid])
+            if unsent:
+                return unsent + batch[mid:]
+            return self._deliver(batch[mid:])
+        return []
+
+    # --- Spill file ---
+
+    def _replay_path(self):
+        return self.spill_path + '.replay'
+
+    def _spill_waiting(self):
+        return bool(self.spill_path) and (os.path.exists(self.spill_path) or os.path.exists(self._replay_path()))
+
+    def _spill(self, entries):
+        if not self.spill_path:
+            print(f"Audit entries lost (no spill file configured): {len(entries)}")
+            return
+        _append(self.spill_path, "".join(json.dumps(_encode(e)) + "\n" for e in entries), self._file_lock)
+        self.spilled += len(entries)
+
+    def _replay(self):
+        """Writes spilled entries back to the database, oldest first."""
+        if time.monotonic() < self._db_down_until:
+            return
+        replay = self._replay_path()
+        with self._file_lock:
+            if not os.path.exists(replay):
+                if not os.path.exists(self.spill_path):
+                    return
+                os.replace(self.spill_path, replay)
+        with open(replay, encoding='utf-8') as f:
+            entries = [_decode(json.loads(line)) for line in f if line.strip()]
+        while entries:
+            chunk = entries[:self.batch_size]
+            rejected = self.rejected
+            unsent = self._deliver(chunk)
+            done = len(chunk) - len(unsent)
+            self.replayed += done - (self.rejected - rejected)
+            entries = entries[done:]
+            if done:
+                # Rewrite what is left so a crash mid-replay does not insert a chunk twice
+                tmp = replay + '.tmp'
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    f.write("".join(json.dumps(_encode(e)) + "\n" for e in entries))
+                os.replace(tmp, replay)
+            if unsent:
+                print(f"Audit replay failed, will retry: {self._last_error}")
+                self._db_down_until = time.monotonic() + self.retry_interval
+                return
+        os.remove(replay)
+
+    def _reject(self, entry, error):
+        """Keeps an entry the database will never accept out of the retry path."""
+        self.rejected += 1
+        if not self.rejects_path:
+            print(f"Audit entry rejected and dropped: {entry!r}: {error}")
+            return
+        print(f"Audit entry rejected, kept in {self.rejects_path}: {error}")
+        line = json.dumps({'entry': _encode(entry), 'error': str(error)}) + "\n"
+        _append(self.rejects_path, line, self._file_lock)
+
+
+def is_connection_error(e):
+    """True for errors that mean the database could not be reached, as opposed to refusing the data."""
+    from mysql.connector import errors
+    from database.connection import PoolTimeout
+    if isinstance(e, (errors.InterfaceError, errors.OperationalError, PoolTimeout, OSError)):
+        return True
+    # Client-side codes (CR_*, 2000-2999): connection refused, server gone away, lost connection...
+    return 2000 <= (getattr(e, 'errno', None) or 0) < 3000
+
+
+def _append(path, text, lock):
+    with lock:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _encode(entry):
+    return [v.isoformat() if isinstance(v, datetime) else v for v in entry]
+
+
+def _decode(values):
+    # The timestamp is always the last field of an entry
+    values[-1] = datetime.fromisoformat(values[-1])
+    return tuple(values)
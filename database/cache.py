@@ -0,0 +1,95 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe LRU cache whose entries also expire after `ttl` seconds.
+
+    `index` maps a cached value to a secondary key (e.g. its row id) so
+    entries can be invalidated by that key without scanning the cache.
+    """
+    def __init__(self, maxsize=1024, ttl=60.0, index=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.index = index
+        self._data = OrderedDict()   # key -> (value, expires_at)
+        self._keys_by_index = {}     # secondary key -> set(keys)
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key, count_miss=True):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                self._pop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                if count_miss:
+                    self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        with self._lock:
+            self._pop(key)
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            if self.index is not None:
+                self._keys_by_index.setdefault(self.index(value), set()).add(key)
+            while len(self._data) > self.maxsize:
+                self._pop(next(iter(self._data)))
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            if self._pop(key):
+                self.invalidations += 1
+
+    def invalidate_index(self, index_keys):
+        """Drops every entry whose value maps to one of `index_keys`."""
+        with self._lock:
+            for index_key in index_keys:
+                for key in list(self._keys_by_index.get(index_key, ())):
+                    if self._pop(key):
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._keys_by_index.clear()
+
+    def _pop(self, key):
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return False
+        if self.index is not None:
+            index_key = self.index(entry[0])
+            keys = self._keys_by_index.get(index_key)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_index[index_key]
+        return True
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
@@ -1,11 +1,137 @@
+import threading
+import time
+from contextlib import contextmanager
+
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, errors
 from config import DATABASE_CONFIG
 
+# Keys in DATABASE_CONFIG that configure our pool and must not reach mysql.connector
+POOL_OPTIONS = ('pool_size', 'pool_timeout', 'pool_health_check_idle')
+
+
+class PoolTimeout(Error):
+    """Raised when no pooled connection frees up within pool_timeout seconds."""
+
+
+class ConnectionPool:
+    """Fixed-size, thread-safe pool of autocommit MySQL connections."""
+    def __init__(self, config, size=5, timeout=10.0, health_check_idle=5.0):
+        self.config = config
+        self.size = max(1, int(size))
+        self.timeout = timeout
+        self.health_check_idle = health_check_idle
+        self._idle = []  # [(connection, returned_at)]
+        self._created = 0
+        self._cond = threading.Condition()
+
+        # Metrics
+        self.in_use = 0
+        self.borrows = 0
+        self.waits = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.reconnects = 0
+
+    def _new_connection(self):
+        return mysql.connector.connect(**self.config, autocommit=True)
+
+    def acquire(self):
+        start = time.perf_counter()
+        waited = False
+        with self._cond:
+            while not self._idle and self._created >= self.size:
+                waited = True
+                remaining = self.timeout - (time.perf_counter() - start)
+                if remaining <= 0:
+                    raise PoolTimeout(f"No database connection available after {self.timeout}s "
+                                      f"(pool_size={self.size})")
+                self._cond.wait(remaining)
+
+            if self._idle:
+                conn, returned_at = self._idle.pop()
+            else:
+                conn, returned_at = None, None
+                self._created += 1
+            self.in_use += 1
+            self.borrows += 1
+            wait = time.perf_counter() - start
+            if waited:
+                self.waits += 1
+                self.wait_time_total += wait
+                self.wait_time_max = max(self.wait_time_max, wait)
+
+        # Connect / health-check outside the lock so other threads are not stalled
+        try:
+            if conn is None:
+                conn = self._new_connection()
+            elif time.monotonic() - returned_at > self.health_check_idle and not conn.is_connected():
+                conn.reconnect(attempts=2, delay=0)
+                with self._cond:
+                    self.reconnects += 1
+        except Exception:
+            with self._cond:
+                self._created -= 1
+                self.in_use -= 1
+                self._cond.notify()
+            raise
+        return conn
+
+    def release(self, conn):
+        with self._cond:
+            self.in_use -= 1
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def discard(self, conn):
+        """Drops a broken connection instead of returning it to the pool."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self.in_use -= 1
+            self._created -= 1
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+        for conn, _ in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def stats(self):
+        with self._cond:
+            return {
+                'size': self.size,
+                'open': self._created,
+                'idle': len(self._idle),
+                'in_use': self.in_use,
+                'borrows': self.borrows,
+                'waits': self.waits,
+                'wait_time_total': self.wait_time_total,
+                'wait_time_max': self.wait_time_max,
+                'wait_time_avg': self.wait_time_total / self.waits if self.waits else 0.0,
+                'reconnects': self.reconnects,
+            }
+
+
 class Database:
-    def __init__(self):
+    # One pool per process, shared by every Database instance (and so by every model)
+    _pool = None
+    _pool_lock = threading.Lock()
+    # Connection pinned to the current thread by lease(); None outside a lease
+    _local = threading.local()
+
+    def __init__(self, pooled=None):
         self.connection = None
-        self.config = DATABASE_CONFIG
+        self.config = {k: v for k, v in DATABASE_CONFIG.items() if k not in POOL_OPTIONS}
+        self.pool_size = DATABASE_CONFIG.get('pool_size', 0)
+        self.pooled = self.pool_size > 1 if pooled is None else pooled
 
     def connect(self):
         try:
@@ -28,16 +154,146 @@ class Database:
         else:
             raise Exception("Failed to connect to database.")
 
+    def get_pool(self):
+        if Database._pool is None:
+            with Database._pool_lock:
+                if Database._pool is None:
+                    Database._pool = ConnectionPool(
+                        self.config,
+                        size=self.pool_size,
+                        timeout=DATABASE_CONFIG.get('pool_timeout', 10),
+                        health_check_idle=DATABASE_CONFIG.get('pool_health_check_idle', 5),
+                    )
+        return Database._pool
+
+    def pool_stats(self):
+        """Pool metrics (wait time, in-use count, reconnects...); empty when not pooled."""
+        return Database._pool.stats() if self.pooled and Database._pool else {}
+
+    @contextmanager
+    def lease(self):
+        """Pins one pooled connection to the calling thread for the duration of the block.
+
+        Nested leases on the same thread reuse the outer connection. A block
+        that ends in a connection error discards the connection instead of
+        returning it to the pool.
+        """
+        if not self.pooled:
+            if not self.connection or not self.connection.is_connected():
+                self.connect()
+            yield self.connection
+            return
+
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None:
+            yield conn
+            return
+
+        pool = self.get_pool()
+        conn = pool.acquire()
+        self._local.connection = conn
+        broken = False
+        try:
+            yield conn
+        except (errors.OperationalError, errors.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self._local.connection = None
+            if broken:
+                pool.discard(conn)
+            else:
+                pool.release(conn)
+
+    @contextmanager
+    def transaction(self):
+        """BEGIN ... COMMIT on one connection; rolls back if the block raises.
+
+        Every execute_query/execute_many issued by this thread inside the block
+        (including through other models) joins the transaction.
+        """
+        with self.lease() as conn:
+            if conn.in_transaction:
+                # Already inside an outer transaction on this thread
+                yield conn
+                return
+            conn.start_transaction()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                try:
+                    conn.rollback()
+                except Error as e:
+                    print(f"Error rolling back transaction: {e}")
+                raise
+
     def execute_query(self, query, params=None, dictionary=False):
-        if not self.connection or not self.connection.is_connected():
-            self.connect()
-        cursor = self.connection.cursor(dictionary=dictionary)
+        return self._execute(query, params or (), dictionary, many=False)
+
+    def execute_many(self, query, seq_params):
+        """Runs query for every params tuple; plain INSERT ... VALUES is sent as one multi-row insert."""
+        return self._execute(query, seq_params, False, many=True)
+
+    def _execute(self, query, params, dictionary, many):
+        if not self.pooled:
+            if not self.connection or not self.connection.is_connected():
+                self.connect()
+            cursor = self.connection.cursor(dictionary=dictionary)
+            try:
+                if many:
+                    cursor.executemany(query, params)
+                else:
+                    cursor.execute(query, params)
+                return cursor
+            except Error as e:
+                print(f"Error executing query: {e}")
+                raise
+
+        # Pooled: the cursor is buffered so the connection can go back to the pool
+        # straight away; callers still read rows / lastrowid from it as before.
+        leased = getattr(self._local, 'connection', None)
+        pool = self.get_pool()
+        conn = leased or pool.acquire()
         try:
-            cursor.execute(query, params or ())
-            return cursor
+            cursor = conn.cursor(dictionary=dictionary, buffered=True)
+            if many:
+                cursor.executemany(query, params)
+            else:
+                cursor.execute(query, params)
         except Error as e:
             print(f"Error executing query: {e}")
+            if not leased:
+                if conn.is_connected():
+                    pool.release(conn)
+                else:
+                    pool.discard(conn)
             raise
+        if not leased:
+            pool.release(conn)
+        return cursor
+
+    def stream(self, query, params=None, dictionary=True, batch_size=1000):
+        """Yields rows from an unbuffered cursor, fetching batch_size at a time.
+
+        The server streams the result set, so memory does not grow with it.
+        The connection stays leased to this thread until the generator is
+        exhausted or closed; run no other query on the thread meanwhile.
+        """
+        with self.lease() as conn:
+            cursor = conn.cursor(dictionary=dictionary, buffered=False)
+            try:
+                cursor.execute(query, params or ())
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from rows
+            finally:
+                # Stopped early: drain what is left so the connection can be reused
+                if conn.unread_result:
+                    conn.consume_results()
+                cursor.close()
 
     def fetch_one(self, query, params=None, dictionary=True):
         cursor = self.execute_query(query, params, dictionary=dictionary)
@@ -49,4 +305,4 @@ class Database:
         cursor = self.execute_query(query, params, dictionary=dictionary)
         result = cursor.fetchall()
         cursor.close()
-        return result
\ No newline at end of file
+        return result
@@ -0,0 +1,46 @@
+import threading
+
+# Topics published by the models layer
+INVENTORY_CHANGED = 'inventory.changed'   # (ids,) inventory rows created or updated
+SALE_COMPLETED = 'sale.completed'         # (sale_id,) after the checkout transaction commits
+USER_CHANGED = 'user.changed'             # (user_id,) user created or updated
+
+# Published by services
+PRINT_JOB_FINISHED = 'print.finished'     # (job,) PrintJob printed or given up on
+TEMPLATE_CHANGED = 'template.changed'     # (template,) bill template saved or reset
+
+
+class EventBus:
+    """In-process publish/subscribe.
+
+    Callbacks run synchronously on the publishing thread, which may be a
+    worker; GUI code should subscribe through services.gui_events instead.
+    A failing subscriber is reported and skipped, never raised to the
+    publisher.
+    """
+    def __init__(self):
+        self._subscribers = {}  # topic -> [callback]
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic, callback):
+        with self._lock:
+            self._subscribers.setdefault(topic, []).append(callback)
+        return callback
+
+    def unsubscribe(self, topic, callback):
+        with self._lock:
+            callbacks = self._subscribers.get(topic, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def publish(self, topic, *args):
+        with self._lock:
+            callbacks = list(self._subscribers.get(topic, ()))
+        for callback in callbacks:
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Event subscriber for {topic} failed: {e}")
+
+
+events = EventBus()
@@ -1,8 +1,9 @@
 from database.connection import Database
+from database.migrate import migrate
 import os
 
 def init_db():
-    db = Database()
+    db = Database(pooled=False)  # schema.sql relies on per-session USE / SET
     schema_path = os.path.join('database', 'schema.sql')
     
     if not os.path.exists(schema_path):
@@ -29,6 +30,9 @@ def init_db():
             # though execute_query should handle them or they are 'IF NOT EXISTS'
             print(f"Statement failed: {e}")
 
+    # Indexes and later schema changes
+    migrate()
+
     print("\nDatabase initialization complete.")
 
 if __name__ == "__main__":
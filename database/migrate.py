@@ -0,0 +1,50 @@
+from database.connection import Database
+import os
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+
+
+def split_statements(sql):
+    """Splits a .sql file on ';', dropping blank statements and comment-only chunks."""
+    statements = []
+    for chunk in sql.split(';'):
+        lines = [l for l in chunk.strip().splitlines() if not l.strip().startswith('--')]
+        cmd = "\n".join(lines).strip()
+        if cmd:
+            statements.append(cmd)
+    return statements
+
+
+def migrate():
+    """Applies every database/migrations/*.sql file not yet recorded in schema_migrations, in name order."""
+    db = Database(pooled=False)
+    db.execute_query("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version VARCHAR(100) PRIMARY KEY,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """).close()
+    applied = {r['version'] for r in db.fetch_all("SELECT version FROM schema_migrations")}
+
+    for name in sorted(os.listdir(MIGRATIONS_DIR)):
+        if not name.endswith('.sql') or name in applied:
+            continue
+
+        print(f"Applying migration {name}...")
+        with open(os.path.join(MIGRATIONS_DIR, name), 'r') as f:
+            statements = split_statements(f.read())
+
+        try:
+            for cmd in statements:
+                db.execute_query(cmd).close()
+        except Exception as e:
+            # DDL auto-commits in MySQL, so a half-applied file must be fixed by hand
+            print(f"Migration {name} failed: {e}")
+            raise
+        db.execute_query("INSERT INTO schema_migrations (version) VALUES (%s)", (name,)).close()
+
+    print("Migrations up to date.")
+
+
+if __name__ == "__main__":
+    migrate()
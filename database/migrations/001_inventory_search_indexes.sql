@@ -0,0 +1,8 @@
+-- Indexes backing Medicine.search
+-- B-tree on medicine_name serves the ranked "name starts with" branch (LIKE 'term%').
+-- The FULLTEXT index serves word-prefix matches (MATCH ... AGAINST 'term*') across the
+-- descriptive columns; barcode prefix lookups use the existing UNIQUE(barcode) index.
+
+ALTER TABLE inventory ADD INDEX idx_inventory_name (medicine_name);
+
+ALTER TABLE inventory ADD FULLTEXT INDEX ft_inventory_search (medicine_name, category, company, strength, form);
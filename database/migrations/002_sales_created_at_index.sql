@@ -0,0 +1,6 @@
+-- Index backing the date-range sales queries (Sale.get_report / get_summary_stats / get_todays_stats)
+-- Those queries filter on half-open created_at ranges, which range-scan this index. user_id is
+-- the second column so per-cashier reports over a range are served by the same index. A separate
+-- single-column (created_at) index would be a redundant left prefix of this one.
+
+ALTER TABLE sales ADD INDEX idx_sales_created_user (created_at, user_id);
@@ -0,0 +1,22 @@
+-- Per-day sales totals for the financial overview (Sale.get_summary_stats)
+-- One row per (day, cashier, payment mode). Sale.create_transaction adds each sale to its row
+-- inside the checkout transaction; Sale.rebuild_daily_rollup recomputes days from raw sales.
+
+CREATE TABLE IF NOT EXISTS sales_daily_rollup (
+    day DATE NOT NULL,
+    user_id INT NOT NULL,
+    payment_mode VARCHAR(20) NOT NULL DEFAULT 'cash',
+    sales_count INT NOT NULL DEFAULT 0,
+    subtotal DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    tax DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    discount DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    revenue DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (day, user_id, payment_mode)
+);
+
+-- Backfill from existing sales
+INSERT INTO sales_daily_rollup (day, user_id, payment_mode, sales_count, subtotal, tax, discount, revenue)
+SELECT DATE(created_at), user_id, COALESCE(payment_mode, 'cash'), COUNT(*),
+       SUM(total_amount), SUM(tax_amount), SUM(discount_amount), SUM(grand_total)
+FROM sales
+GROUP BY DATE(created_at), user_id, COALESCE(payment_mode, 'cash');
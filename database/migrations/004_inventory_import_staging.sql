@@ -0,0 +1,30 @@
+-- Bulk catalogue import (scripts/import_data.py, InventoryImport)
+-- Supplier rows are batch-inserted here first, then merged into inventory with a few
+-- set-based statements. row_key is a hash of the barcode, or of name+strength+form when
+-- there is no barcode, so a file listing the same product twice stages it once (last wins).
+
+CREATE TABLE IF NOT EXISTS inventory_import_staging (
+    row_key CHAR(40) NOT NULL PRIMARY KEY,
+    line_no INT NOT NULL,
+    medicine_name VARCHAR(255) NOT NULL,
+    category VARCHAR(100),
+    company VARCHAR(100),
+    barcode VARCHAR(100),
+    batch_no VARCHAR(50),
+    expiry_date DATE,
+    stock_qty INT DEFAULT 0,
+    price DECIMAL(10, 2) NOT NULL,
+    reorder_level INT DEFAULT 10,
+    strength VARCHAR(100),
+    form VARCHAR(100),
+    indication TEXT,
+    side_effects TEXT,
+    prescription_required BOOLEAN DEFAULT FALSE,
+    age_restriction VARCHAR(100),
+    matched_id INT NULL,
+    INDEX idx_staging_barcode (barcode),
+    INDEX idx_staging_natural (medicine_name, strength, form)
+);
+
+-- Matching staged rows without a barcode by name+strength+form
+ALTER TABLE inventory ADD INDEX idx_inventory_natural (medicine_name, strength, form);
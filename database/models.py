@@ -1,4 +1,11 @@
+import threading
+from datetime import date, datetime, timedelta
 from database.connection import Database
+from database.cache import LRUCache
+from database.events import events, INVENTORY_CHANGED, SALE_COMPLETED, USER_CHANGED
+from database.audit import AuditWriter
+from config import (BCRYPT_ROUNDS, BARCODE_CACHE_SIZE, BARCODE_CACHE_TTL,
+                    AUDIT_BATCH_SIZE, AUDIT_FLUSH_INTERVAL, AUDIT_SPILL_FILE, AUDIT_REJECTS_FILE)
 import bcrypt
 
 class BaseModel:
@@ -13,35 +20,291 @@ class User(BaseModel):
     def find_all(cls):
         return cls.db.fetch_all("SELECT * FROM users ORDER BY role, username")
 
+    @classmethod
+    def get_counts(cls, since):
+        """{'total': all users, 'recent': users created at or after `since`} in one query."""
+        res = cls.db.fetch_one(
+            "SELECT COUNT(*) AS total, COALESCE(SUM(created_at >= %s), 0) AS recent FROM users", (since,))
+        return {'total': int(res['total'] or 0), 'recent': int(res['recent'] or 0)} if res else {'total': 0, 'recent': 0}
+
     @classmethod
     def create(cls, username, password, full_name, role='staff'):
-        hashed = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        hashed = cls.hash_password(password)
         query = "INSERT INTO users (username, password_hash, full_name, role) VALUES (%s, %s, %s, %s)"
-        cls.db.execute_query(query, (username, hashed, full_name, role))
+        cursor = cls.db.execute_query(query, (username, hashed, full_name, role))
+        user_id = cursor.lastrowid
+        cursor.close()
+        events.publish(USER_CHANGED, user_id)
+        return user_id
+
+    @staticmethod
+    def hash_password(password, rounds=None):
+        """bcrypt hash at BCRYPT_ROUNDS; slow by design, keep it off the GUI thread."""
+        salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    @staticmethod
+    def hash_rounds(password_hash):
+        """Cost factor of a '$2b$12$...' hash, or None if it cannot be read."""
+        try:
+            return int(password_hash.split('$')[2])
+        except (AttributeError, IndexError, ValueError):
+            return None
+
+    @classmethod
+    def authenticate(cls, username, password):
+        """Returns the user row if the password matches, else None.
+
+        A hash made with a different cost factor than BCRYPT_ROUNDS is
+        replaced on the spot, while the plain password is at hand.
+        """
+        user = cls.find_by_username(username)
+        if not user:
+            return None
+        stored_hash = user['password_hash']
+        if isinstance(stored_hash, (bytes, bytearray)):
+            stored_hash = stored_hash.decode('utf-8')
+        if not bcrypt.checkpw(password.encode('utf-8'), stored_hash.encode('utf-8')):
+            return None
+        if cls.hash_rounds(stored_hash) != BCRYPT_ROUNDS:
+            try:
+                user['password_hash'] = cls.hash_password(password)
+                cls.db.execute_query("UPDATE users SET password_hash = %s WHERE id = %s",
+                                     (user['password_hash'], user['id'])).close()
+            except Exception as e:
+                # The old hash still works; try again next login
+                print(f"Password rehash failed for {username}: {e}")
+        return user
 
 class Medicine(BaseModel):
+    # barcode -> {id, medicine_name, price, stock_qty, barcode}; entries drop on any write to their row
+    _barcode_cache = LRUCache(BARCODE_CACHE_SIZE, BARCODE_CACHE_TTL, index=lambda row: row['id'])
+    events.subscribe(INVENTORY_CHANGED, _barcode_cache.invalidate_index)
+
+    @classmethod
+    def add_change_listener(cls, callback):
+        """Runs callback(ids) after create/stock/price writes; shorthand for the inventory.changed event."""
+        events.subscribe(INVENTORY_CHANGED, callback)
+
+    @classmethod
+    def _notify_changed(cls, ids):
+        events.publish(INVENTORY_CHANGED, list(ids))
+
     @classmethod
     def get_all(cls):
         return cls.db.fetch_all("SELECT * FROM inventory ORDER BY medicine_name")
 
     @classmethod
-    def search(cls, term):
-        query = """
-            SELECT * FROM inventory 
-            WHERE medicine_name LIKE %s 
-            OR category LIKE %s 
-            OR company LIKE %s 
-            OR strength LIKE %s
-            OR form LIKE %s
-            OR barcode LIKE %s
+    def iter_all(cls, columns=None):
+        """Every inventory row in name order, streamed one at a time."""
+        columns = columns or cls.LIST_COLUMNS
+        unknown = set(columns) - set(cls.COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown inventory columns: {sorted(unknown)}")
+        return cls.db.stream(f"SELECT {', '.join(columns)} FROM inventory ORDER BY medicine_name, id")
+
+    # Columns a caller may project in page(); long TEXT columns are opt-in
+    COLUMNS = ('id', 'medicine_name', 'category', 'company', 'barcode', 'batch_no', 'expiry_date',
+               'stock_qty', 'price', 'reorder_level', 'strength', 'form', 'indication',
+               'side_effects', 'prescription_required', 'age_restriction', 'created_at', 'updated_at')
+    LIST_COLUMNS = ('id', 'medicine_name', 'category', 'company', 'barcode', 'batch_no', 'expiry_date',
+                    'stock_qty', 'price', 'reorder_level', 'strength', 'form')
+
+    # Columns the inventory list can be ordered by -> (SQL sort expression, the value a NULL sorts as)
+    SORT_COLUMNS = {
+        'medicine_name': ("medicine_name", None),
+        'strength': ("COALESCE(strength, '')", ''),
+        'form': ("COALESCE(form, '')", ''),
+        'category': ("COALESCE(category, '')", ''),
+        'company': ("COALESCE(company, '')", ''),
+        'batch_no': ("COALESCE(batch_no, '')", ''),
+        'expiry_date': ("COALESCE(expiry_date, '9999-12-31')", date.max),
+        'stock_qty': ("COALESCE(stock_qty, 0)", 0),
+        'price': ("price", None),
+    }
+
+    @classmethod
+    def page(cls, after_name=None, limit=200, columns=None, after_id=None,
+             text=None, category=None, company=None, order_by='medicine_name', descending=False):
+        """One page of the catalogue in (order_by, id) order.
+
+        Keyset pagination: pass the sort value (the name, unless order_by
+        says otherwise) and id of the last row of the previous page, as
+        given by sort_key(), to get the next one. Name-ordered pages are
+        range scans on idx_inventory_name instead of an OFFSET walk.
+        text/category/company filter like list_filter(). `columns` defaults
+        to LIST_COLUMNS; id and the order_by column are always included.
+        """
+        if order_by not in cls.SORT_COLUMNS:
+            raise ValueError(f"Cannot order inventory by: {order_by}")
+        columns = list(columns or cls.LIST_COLUMNS)
+        unknown = [c for c in columns if c not in cls.COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown inventory columns: {', '.join(unknown)}")
+        for key in (order_by, 'id'):
+            if key not in columns:
+                columns.insert(0, key)
+
+        conditions, params = cls.list_filter(text, category, company)
+        expr = cls.SORT_COLUMNS[order_by][0]
+        op, direction = ("<", "DESC") if descending else (">", "ASC")
+        if after_name is not None:
+            if after_id is None:
+                conditions.append(f"{expr} {op} %s")
+                params.append(after_name)
+            else:
+                conditions.append(f"({expr} {op} %s OR ({expr} = %s AND id {op} %s))")
+                params += [after_name, after_name, after_id]
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        query = (f"SELECT {', '.join(columns)} FROM inventory {where} "
+                 f"ORDER BY {expr} {direction}, id {direction} LIMIT %s")
+        return cls.db.fetch_all(query, (*params, int(limit)))
+
+    @classmethod
+    def sort_key(cls, row, order_by='medicine_name'):
+        """(sort value, id) of a page() row; pass them back as after_name/after_id."""
+        value = row.get(order_by)
+        if value is None:
+            value = cls.SORT_COLUMNS[order_by][1]
+        return value, row['id']
+
+    @staticmethod
+    def _escape_like(term):
+        return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    @classmethod
+    def list_filter(cls, text=None, category=None, company=None):
+        """WHERE conditions and params for the inventory list.
+
+        `text` matches anywhere in the name, strength, form, category,
+        company, batch or barcode; category and company must match exactly.
+        """
+        conditions, params = [], []
+        if text:
+            conditions.append(
+                "CONCAT_WS(' ', medicine_name, strength, form, category, company, batch_no, barcode) LIKE %s")
+            params.append(f"%{cls._escape_like(text)}%")
+        if category is not None:
+            conditions.append("category = %s")
+            params.append(category)
+        if company is not None:
+            conditions.append("company = %s")
+            params.append(company)
+        return conditions, params
+
+    @classmethod
+    def find_by_ids(cls, ids, columns=None):
+        """Rows for the given ids, projected like page()."""
+        ids = list(ids)
+        if not ids:
+            return []
+        columns = list(columns or cls.LIST_COLUMNS)
+        unknown = [c for c in columns if c not in cls.COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown inventory columns: {', '.join(unknown)}")
+        if 'id' not in columns:
+            columns.insert(0, 'id')
+        placeholders = ", ".join(["%s"] * len(ids))
+        return cls.db.fetch_all(f"SELECT {', '.join(columns)} FROM inventory WHERE id IN ({placeholders})", ids)
+
+    @classmethod
+    def get_count(cls, text=None, category=None, company=None):
+        """Rows in inventory, or only those matching list_filter()."""
+        conditions, params = cls.list_filter(text, category, company)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        res = cls.db.fetch_one(f"SELECT COUNT(*) as count FROM inventory{where}", params)
+        return res['count'] if res else 0
+
+    @classmethod
+    def get_distinct_values(cls, column):
+        """Sorted non-empty values of a short column, e.g. for category/company filters."""
+        if column not in cls.LIST_COLUMNS:
+            raise ValueError(f"Unknown inventory column: {column}")
+        rows = cls.db.fetch_all(
+            f"SELECT DISTINCT {column} AS value FROM inventory "
+            f"WHERE {column} IS NOT NULL AND {column} <> '' ORDER BY value")
+        return [r['value'] for r in rows]
+
+    # Columns covered by the ft_inventory_search FULLTEXT index (migration 001)
+    SEARCH_COLUMNS = "medicine_name, category, company, strength, form"
+    # InnoDB ignores fulltext words shorter than innodb_ft_min_token_size (default 3)
+    FT_MIN_TOKEN = 3
+
+    @classmethod
+    def _fulltext_query(cls, term):
+        """'para 500' -> '+para* +500*' (boolean mode, every word required as a prefix)."""
+        words = ["".join(ch for ch in w if ch.isalnum()) for w in term.split()]
+        return " ".join(f"+{w}*" for w in words if len(w) >= cls.FT_MIN_TOKEN)
+
+    @classmethod
+    def search(cls, term, limit=50, offset=0):
+        """Ranked inventory search served entirely by indexes.
+
+        Order: barcode prefix hits, then medicine_name prefix hits, then
+        full-text relevance across name/category/company/strength/form.
+        """
+        term = term.strip()
+        if not term:
+            return []
+
+        prefix = cls._escape_like(term) + "%"
+        # Each branch only needs its own top (offset + limit) rows to fill the requested page
+        window = int(offset) + int(limit)
+        branches = [
+            "(SELECT id, 1 AS barcode_hit, 0 AS prefix_hit, 0 AS score FROM inventory "
+            "WHERE barcode LIKE %s ORDER BY medicine_name LIMIT %s)",
+            "(SELECT id, 0, 1, 0 FROM inventory WHERE medicine_name LIKE %s ORDER BY medicine_name LIMIT %s)",
+        ]
+        params = [prefix, window, prefix, window]
+
+        ft_query = cls._fulltext_query(term)
+        if ft_query:
+            branches.append(f"""
+                (SELECT id, 0, 0, MATCH({cls.SEARCH_COLUMNS}) AGAINST (%s IN BOOLEAN MODE) AS score
+                 FROM inventory WHERE MATCH({cls.SEARCH_COLUMNS}) AGAINST (%s IN BOOLEAN MODE)
+                 ORDER BY score DESC LIMIT %s)
+            """)
+            params += [ft_query, ft_query, window]
+
+        query = f"""
+            SELECT inv.* FROM (
+                SELECT id, MAX(barcode_hit) AS barcode_hit, MAX(prefix_hit) AS prefix_hit, MAX(score) AS score
+                FROM ({" UNION ALL ".join(branches)}) hits
+                GROUP BY id
+            ) ranked
+            JOIN inventory inv ON inv.id = ranked.id
+            ORDER BY ranked.barcode_hit DESC, ranked.prefix_hit DESC,
+                     IF(ranked.barcode_hit OR ranked.prefix_hit, 0, ranked.score) DESC, inv.medicine_name
+            LIMIT %s OFFSET %s
         """
-        pattern = f"%{term}%"
-        return cls.db.fetch_all(query, (pattern, pattern, pattern, pattern, pattern, pattern))
+        return cls.db.fetch_all(query, (*params, int(limit), int(offset)))
 
     @classmethod
     def find_by_barcode(cls, barcode):
         return cls.db.fetch_one("SELECT * FROM inventory WHERE barcode = %s", (barcode,))
 
+    @classmethod
+    def lookup_barcode(cls, barcode, cached_only=False):
+        """What a scan needs (id, name, price, stock), served from the barcode cache when possible.
+
+        With cached_only=True a miss returns None instead of querying, so the
+        GUI thread can try the cache before handing the scan to a worker.
+        """
+        # A cache-only probe that misses is followed by a full lookup, which counts the miss
+        row = cls._barcode_cache.get(barcode, count_miss=not cached_only)
+        if row is not None or cached_only:
+            return dict(row) if row else None
+        row = cls.db.fetch_one(
+            "SELECT id, medicine_name, price, stock_qty, barcode FROM inventory WHERE barcode = %s", (barcode,))
+        if row:
+            cls._barcode_cache.put(barcode, row)
+            return dict(row)
+        return None
+
+    @classmethod
+    def barcode_cache_stats(cls):
+        return cls._barcode_cache.stats()
+
     @classmethod
     def create(cls, data):
         query = """
@@ -70,7 +333,11 @@ class Medicine(BaseModel):
             data.get('prescription_required', False),
             data.get('age_restriction')
         )
-        cls.db.execute_query(query, params)
+        cursor = cls.db.execute_query(query, params)
+        med_id = cursor.lastrowid
+        cursor.close()
+        cls._notify_changed([med_id])
+        return med_id
 
     @classmethod
     def get_low_stock_count(cls):
@@ -85,6 +352,109 @@ class Medicine(BaseModel):
     def update_stock(cls, med_id, qty_change):
         query = "UPDATE inventory SET stock_qty = stock_qty + %s WHERE id = %s"
         cls.db.execute_query(query, (qty_change, med_id))
+        cls._notify_changed([med_id])
+
+    @classmethod
+    def update_price(cls, med_id, price):
+        cls.db.execute_query("UPDATE inventory SET price = %s WHERE id = %s", (price, med_id)).close()
+        cls._notify_changed([med_id])
+
+    @classmethod
+    def get_stock_levels(cls, ids):
+        """{inventory_id: stock_qty} for the given ids, read by primary key."""
+        ids = list(ids)
+        if not ids:
+            return {}
+        placeholders = ", ".join(["%s"] * len(ids))
+        rows = cls.db.fetch_all(f"SELECT id, stock_qty FROM inventory WHERE id IN ({placeholders})", ids)
+        return {r['id']: r['stock_qty'] for r in rows}
+
+    @classmethod
+    def decrement_stock(cls, qty_by_id, notify=True):
+        """Subtracts {inventory_id: qty} from stock in a single UPDATE ... CASE statement.
+
+        Pass notify=False inside a transaction and call _notify_changed after commit.
+        """
+        if not qty_by_id:
+            return
+        ids = list(qty_by_id)
+        cases = " ".join("WHEN %s THEN %s" for _ in ids)
+        placeholders = ", ".join(["%s"] * len(ids))
+        query = f"UPDATE inventory SET stock_qty = stock_qty - CASE id {cases} END WHERE id IN ({placeholders})"
+        params = [v for med_id in ids for v in (med_id, qty_by_id[med_id])] + ids
+        cls.db.execute_query(query, params).close()
+        if notify:
+            cls._notify_changed(ids)
+
+class InventoryImport(BaseModel):
+    """Bulk catalogue import through the inventory_import_staging table.
+
+    Rows are staged with batched multi-row inserts, then merge() folds the
+    whole file into inventory with a handful of set-based statements: it
+    matches on barcode first, then on name+strength+form where one side has
+    no barcode, and inserts what is left. Matched rows get the supplier's
+    price and descriptive fields; their stock, batch and expiry are kept.
+    Every touched id is published as INVENTORY_CHANGED once the merge commits.
+    """
+    COLUMNS = ('row_key', 'line_no', 'medicine_name', 'category', 'company', 'barcode', 'batch_no',
+               'expiry_date', 'stock_qty', 'price', 'reorder_level', 'strength', 'form',
+               'indication', 'side_effects', 'prescription_required', 'age_restriction')
+    # Refreshed on rows that already exist
+    UPDATE_COLUMNS = ('category', 'company', 'price', 'indication', 'side_effects',
+                      'prescription_required', 'age_restriction')
+    # Copied for new rows
+    INSERT_COLUMNS = COLUMNS[2:]
+
+    @classmethod
+    def clear(cls):
+        cls.db.execute_query("TRUNCATE TABLE inventory_import_staging").close()
+
+    @classmethod
+    def stage(cls, rows):
+        """Adds tuples ordered like COLUMNS; a repeated row_key replaces the earlier row."""
+        columns = ", ".join(cls.COLUMNS)
+        placeholders = ", ".join(["%s"] * len(cls.COLUMNS))
+        updates = ", ".join(f"{c} = VALUES({c})" for c in cls.COLUMNS[1:])
+        query = f"""
+            INSERT INTO inventory_import_staging ({columns}) VALUES ({placeholders})
+            ON DUPLICATE KEY UPDATE {updates}
+        """
+        cls.db.execute_many(query, rows).close()
+
+    @classmethod
+    def merge(cls):
+        """Upserts every staged row into inventory in one transaction; returns (updated, inserted)."""
+        updates = ", ".join(f"i.{c} = s.{c}" for c in cls.UPDATE_COLUMNS)
+        insert_columns = ", ".join(cls.INSERT_COLUMNS)
+        with cls.db.transaction():
+            cls.db.execute_query(f"""
+                UPDATE inventory i JOIN inventory_import_staging s ON i.barcode = s.barcode
+                SET {updates}, s.matched_id = i.id
+            """).close()
+            cls.db.execute_query(f"""
+                UPDATE inventory i JOIN inventory_import_staging s
+                    ON s.matched_id IS NULL
+                   AND i.medicine_name = s.medicine_name
+                   AND i.strength <=> s.strength
+                   AND i.form <=> s.form
+                   AND (s.barcode IS NULL OR i.barcode IS NULL)
+                SET {updates}, i.barcode = COALESCE(i.barcode, s.barcode), s.matched_id = i.id
+            """).close()
+            cursor = cls.db.execute_query(f"""
+                INSERT INTO inventory ({insert_columns})
+                SELECT {insert_columns} FROM inventory_import_staging WHERE matched_id IS NULL
+            """)
+            inserted, first_id = cursor.rowcount, cursor.lastrowid
+            cursor.close()
+            ids = [row['matched_id'] for row in cls.db.fetch_all(
+                "SELECT matched_id FROM inventory_import_staging WHERE matched_id IS NOT NULL")]
+            updated = len(ids)
+            if inserted:
+                # lastrowid is the first new id; the rest of the batch comes after it
+                ids += [row['id'] for row in cls.db.fetch_all(
+                    "SELECT id FROM inventory WHERE id >= %s", (first_id,))]
+        Medicine._notify_changed(dict.fromkeys(ids))
+        return updated, inserted
 
 class Customer(BaseModel):
     @classmethod
@@ -106,33 +476,65 @@ class Customer(BaseModel):
 class Sale(BaseModel):
     @classmethod
     def create_transaction(cls, bill_no, user_id, customer_id, items, totals, discount=0.0):
-        # totals: (total_amount, tax_amount, grand_total)
+        """Records a sale, its line items and the stock decrement atomically.
+
+        items: [(inventory_id, quantity, unit_price, subtotal), ...]
+        totals: (total_amount, tax_amount, grand_total)
+
+        Round-trips are constant in the number of lines: BEGIN, sale INSERT,
+        daily rollup upsert, one multi-row sale_items INSERT, one batched
+        stock UPDATE, COMMIT.
+        """
         sale_query = """
             INSERT INTO sales (bill_no, customer_id, user_id, total_amount, tax_amount, discount_amount, grand_total)
             VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
-        cursor = cls.db.execute_query(sale_query, (bill_no, customer_id, user_id, totals[0], totals[1], discount, totals[2]))
-        sale_id = cursor.lastrowid
-        cursor.close()
-
         item_query = """
             INSERT INTO sale_items (sale_id, inventory_id, quantity, unit_price, subtotal)
             VALUES (%s, %s, %s, %s, %s)
         """
-        for item in items:
-            # item: (inventory_id, quantity, unit_price, subtotal)
-            cls.db.execute_query(item_query, (sale_id, *item))
-            # Also update inventory stock
-            Medicine.update_stock(item[0], -item[1])
-        
+        with cls.db.transaction():
+            cursor = cls.db.execute_query(sale_query, (bill_no, customer_id, user_id, totals[0], totals[1], discount, totals[2]))
+            sale_id = cursor.lastrowid
+            cursor.close()
+            cls.db.execute_query(cls.ROLLUP_ADD_QUERY, (sale_id,)).close()
+
+            if items:
+                cls.db.execute_many(item_query, [(sale_id, *item) for item in items]).close()
+
+                qty_by_id = {}
+                for med_id, qty, *_ in items:
+                    qty_by_id[med_id] = qty_by_id.get(med_id, 0) + qty
+                Medicine.decrement_stock(qty_by_id, notify=False)
+
+        if items:
+            Medicine._notify_changed(list(qty_by_id))
+        events.publish(SALE_COMPLETED, sale_id)
         return sale_id
 
+    @staticmethod
+    def _day_range(start_date, end_date):
+        """Inclusive calendar days -> half-open [start 00:00, day after end 00:00).
+
+        Comparing the bare created_at column against constants lets MySQL
+        range-scan idx_sales_created_user; DATE(created_at) would force a
+        full table scan.
+        """
+        def as_date(value):
+            if isinstance(value, datetime):
+                return value.date()
+            if isinstance(value, date):
+                return value
+            return date.fromisoformat(str(value)[:10])
+        start, end = as_date(start_date), as_date(end_date)
+        return datetime.combine(start, datetime.min.time()), datetime.combine(end + timedelta(days=1), datetime.min.time())
+
     @classmethod
     def get_todays_stats(cls):
         query = """
             SELECT COUNT(*) as count, SUM(grand_total) as revenue 
             FROM sales 
-            WHERE DATE(created_at) = CURDATE()
+            WHERE created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY
         """
         res = cls.db.fetch_one(query)
         return {
@@ -140,49 +542,228 @@ class Sale(BaseModel):
             'orders': res['count'] or 0
         }
 
+    REPORT_QUERY = """
+        SELECT s.*, c.name as customer_name, u.full_name as cashier_name
+        FROM sales s
+        LEFT JOIN customers c ON s.customer_id = c.id
+        JOIN users u ON s.user_id = u.id
+        WHERE s.created_at >= %s AND s.created_at < %s
+        ORDER BY s.created_at DESC
+    """
+
+    SUMMARY_QUERY = """
+        SELECT 
+            COUNT(*) as count,
+            SUM(total_amount) as subtotal,
+            SUM(tax_amount) as tax,
+            SUM(discount_amount) as discount,
+            SUM(grand_total) as revenue
+        FROM sales
+        WHERE created_at >= %s AND created_at < %s
+    """
+
     @classmethod
-    def get_report(cls, start_date, end_date):
-        """Fetches detailed sales report for a date range"""
-        query = """
+    def get_report_row(cls, sale_id):
+        """One sale shaped like a get_report row (for patching a report in place)."""
+        return cls.db.fetch_one("""
             SELECT s.*, c.name as customer_name, u.full_name as cashier_name
             FROM sales s
             LEFT JOIN customers c ON s.customer_id = c.id
             JOIN users u ON s.user_id = u.id
-            WHERE DATE(s.created_at) BETWEEN %s AND %s
-            ORDER BY s.created_at DESC
-        """
-        return cls.db.fetch_all(query, (start_date, end_date))
+            WHERE s.id = %s
+        """, (sale_id,))
+
+    @classmethod
+    def get_report(cls, start_date, end_date):
+        """Fetches detailed sales report for a date range (both days inclusive)"""
+        return cls.db.fetch_all(cls.REPORT_QUERY, cls._day_range(start_date, end_date))
+
+    @classmethod
+    def iter_report(cls, start_date, end_date):
+        """get_report rows streamed one at a time (for exports of long ranges)."""
+        return cls.db.stream(cls.REPORT_QUERY, cls._day_range(start_date, end_date))
+
+    @classmethod
+    def get_report_count(cls, start_date, end_date):
+        res = cls.db.fetch_one("SELECT COUNT(*) AS n FROM sales WHERE created_at >= %s AND created_at < %s",
+                               cls._day_range(start_date, end_date))
+        return res['n'] if res else 0
+
+    ROLLUP_SUMMARY_QUERY = """
+        SELECT 
+            SUM(sales_count) as count,
+            SUM(subtotal) as subtotal,
+            SUM(tax) as tax,
+            SUM(discount) as discount,
+            SUM(revenue) as revenue
+        FROM sales_daily_rollup
+        WHERE day >= %s AND day < %s
+    """
+
+    # Adds one sale to its (day, cashier, payment mode) row in sales_daily_rollup (migration 003)
+    ROLLUP_ADD_QUERY = """
+        INSERT INTO sales_daily_rollup (day, user_id, payment_mode, sales_count, subtotal, tax, discount, revenue)
+        SELECT DATE(created_at), user_id, COALESCE(payment_mode, 'cash'), 1,
+               total_amount, tax_amount, discount_amount, grand_total
+        FROM sales WHERE id = %s
+        ON DUPLICATE KEY UPDATE
+            sales_count = sales_count + 1,
+            subtotal = subtotal + VALUES(subtotal),
+            tax = tax + VALUES(tax),
+            discount = discount + VALUES(discount),
+            revenue = revenue + VALUES(revenue)
+    """
 
     @classmethod
     def get_summary_stats(cls, start_date, end_date):
-        """Calculates total revenue, tax, and discount for a period"""
-        query = """
-            SELECT 
-                COUNT(*) as count,
-                SUM(total_amount) as subtotal,
-                SUM(tax_amount) as tax,
-                SUM(discount_amount) as discount,
-                SUM(grand_total) as revenue
-            FROM sales
-            WHERE DATE(created_at) BETWEEN %s AND %s
-        """
-        res = cls.db.fetch_one(query, (start_date, end_date))
-        if not res:
-            return {'count': 0, 'subtotal': 0, 'tax': 0, 'discount': 0, 'revenue': 0}
-            
-        return {
-            'count': res['count'] or 0,
-            'subtotal': float(res['subtotal'] or 0),
-            'tax': float(res['tax'] or 0),
-            'discount': float(res['discount'] or 0),
-            'revenue': float(res['revenue'] or 0)
-        }
+        """Calculates total revenue, tax, and discount for a period
+
+        Finished days are read from sales_daily_rollup, a handful of rows
+        per day however many sales it had; only today, which is still
+        changing, is summed from raw sales rows.
+        """
+        start, end = cls._day_range(start_date, end_date)
+        today = datetime.combine(date.today(), datetime.min.time())
+        totals = {'count': 0, 'subtotal': 0.0, 'tax': 0.0, 'discount': 0.0, 'revenue': 0.0}
+
+        parts = []
+        if start < today:
+            parts.append((cls.ROLLUP_SUMMARY_QUERY, (start.date(), min(end, today).date())))
+        if end > today:
+            parts.append((cls.SUMMARY_QUERY, (max(start, today), end)))
+        for query, params in parts:
+            res = cls.db.fetch_one(query, params)
+            if not res:
+                continue
+            totals['count'] += int(res['count'] or 0)
+            for key in ('subtotal', 'tax', 'discount', 'revenue'):
+                totals[key] += float(res[key] or 0)
+        return totals
+
+    @classmethod
+    def get_daily_totals(cls, start_date, end_date):
+        """{date: {'count', 'revenue', 'tax', 'discount'}} per day with sales, days inclusive.
+
+        Same split as get_summary_stats: finished days from the rollup in one
+        grouped query, today from raw rows.
+        """
+        start, end = cls._day_range(start_date, end_date)
+        today = datetime.combine(date.today(), datetime.min.time())
+        days = {}
+        if start < today:
+            rows = cls.db.fetch_all("""
+                SELECT day, SUM(sales_count) AS count, SUM(revenue) AS revenue,
+                       SUM(tax) AS tax, SUM(discount) AS discount
+                FROM sales_daily_rollup
+                WHERE day >= %s AND day < %s
+                GROUP BY day
+            """, (start.date(), min(end, today).date()))
+            for r in rows:
+                days[r['day']] = {'count': int(r['count'] or 0), 'revenue': float(r['revenue'] or 0),
+                                  'tax': float(r['tax'] or 0), 'discount': float(r['discount'] or 0)}
+        if end > today:
+            r = cls.db.fetch_one(cls.SUMMARY_QUERY, (max(start, today), end))
+            if r and r['count']:
+                days[today.date()] = {'count': int(r['count']), 'revenue': float(r['revenue'] or 0),
+                                      'tax': float(r['tax'] or 0), 'discount': float(r['discount'] or 0)}
+        return days
+
+    @classmethod
+    def get_recent_items(cls, limit=5):
+        """Latest sold lines: bill_no, created_at, medicine_name, quantity, subtotal."""
+        return cls.db.fetch_all("""
+            SELECT s.bill_no, s.created_at, i.medicine_name, si.quantity, si.subtotal
+            FROM (SELECT id, bill_no, created_at FROM sales ORDER BY id DESC LIMIT %s) s
+            JOIN sale_items si ON si.sale_id = s.id
+            JOIN inventory i ON i.id = si.inventory_id
+            ORDER BY s.id DESC, si.id
+            LIMIT %s
+        """, (int(limit), int(limit)))
+
+    @classmethod
+    def get_top_products(cls, since, limit=4):
+        """Best sellers by quantity since `since`: [{'medicine_name', 'quantity'}]."""
+        return cls.db.fetch_all("""
+            SELECT i.medicine_name, top.quantity
+            FROM (
+                SELECT si.inventory_id, SUM(si.quantity) AS quantity
+                FROM sales s JOIN sale_items si ON si.sale_id = s.id
+                WHERE s.created_at >= %s
+                GROUP BY si.inventory_id
+                ORDER BY quantity DESC
+                LIMIT %s
+            ) top
+            JOIN inventory i ON i.id = top.inventory_id
+            ORDER BY top.quantity DESC
+        """, (since, int(limit)))
+
+    @classmethod
+    def rebuild_daily_rollup(cls, start_date, end_date):
+        """Recomputes sales_daily_rollup for the given days (inclusive) from raw sales.
+
+        Catch-up job for sales recorded outside create_transaction, or after
+        the rollup has drifted; the days are replaced atomically.
+        """
+        start, end = cls._day_range(start_date, end_date)
+        with cls.db.transaction():
+            cls.db.execute_query("DELETE FROM sales_daily_rollup WHERE day >= %s AND day < %s",
+                                 (start.date(), end.date())).close()
+            cursor = cls.db.execute_query("""
+                INSERT INTO sales_daily_rollup (day, user_id, payment_mode, sales_count, subtotal, tax, discount, revenue)
+                SELECT DATE(created_at), user_id, COALESCE(payment_mode, 'cash'), COUNT(*),
+                       SUM(total_amount), SUM(tax_amount), SUM(discount_amount), SUM(grand_total)
+                FROM sales
+                WHERE created_at >= %s AND created_at < %s
+                GROUP BY DATE(created_at), user_id, COALESCE(payment_mode, 'cash')
+            """, (start, end))
+            rows = cursor.rowcount
+            cursor.close()
+        return rows
 
 class AuditLog(BaseModel):
+    INSERT_QUERY = """
+        INSERT INTO audit_logs (user_id, action_type, module_name, description, ip_address, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """
+    _writer = None
+    _writer_lock = threading.Lock()
+
+    @classmethod
+    def writer(cls):
+        with cls._writer_lock:
+            if cls._writer is None:
+                cls._writer = AuditWriter(cls.write_many, batch_size=AUDIT_BATCH_SIZE,
+                                          flush_interval=AUDIT_FLUSH_INTERVAL, spill_path=AUDIT_SPILL_FILE,
+                                          rejects_path=AUDIT_REJECTS_FILE)
+            return cls._writer
+
     @classmethod
     def log(cls, user_id, action, module, description, ip="127.0.0.1"):
-        query = """
-            INSERT INTO audit_logs (user_id, action_type, module_name, description, ip_address)
-            VALUES (%s, %s, %s, %s, %s)
-        """
-        cls.db.execute_query(query, (user_id, action, module, description, ip))
\ No newline at end of file
+        """Queues an entry for the background writer; returns without touching the database."""
+        cls.writer().log((user_id, action, module, description, ip, datetime.now()))
+
+    @classmethod
+    def write_many(cls, entries):
+        """Inserts (user_id, action, module, description, ip, created_at) tuples in one statement."""
+        cls.db.execute_many(cls.INSERT_QUERY, entries).close()
+
+    @classmethod
+    def iter_range(cls, start_date, end_date):
+        """Entries for a date range (both days inclusive), oldest first, streamed with the user's name."""
+        return cls.db.stream("""
+            SELECT a.created_at, u.username, a.action_type, a.module_name, a.description, a.ip_address
+            FROM audit_logs a
+            LEFT JOIN users u ON a.user_id = u.id
+            WHERE a.created_at >= %s AND a.created_at < %s
+            ORDER BY a.created_at, a.id
+        """, Sale._day_range(start_date, end_date))
+
+    @classmethod
+    def flush(cls, timeout=5.0):
+        return cls._writer.flush(timeout) if cls._writer else True
+
+    @classmethod
+    def shutdown(cls, timeout=5.0):
+        """Writes out queued entries (spilling them if the database is gone)."""
+        if cls._writer:
+            cls._writer.close(timeout)
\ No newline at end of file
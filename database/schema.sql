@@ -7,6 +7,9 @@ USE medical_store;
 
 -- Drop tables in reverse order of dependencies
 SET FOREIGN_KEY_CHECKS = 0;
+DROP TABLE IF EXISTS schema_migrations;
+DROP TABLE IF EXISTS sales_daily_rollup;
+DROP TABLE IF EXISTS inventory_import_staging;
 DROP TABLE IF EXISTS audit_logs;
 DROP TABLE IF EXISTS sale_items;
 DROP TABLE IF EXISTS sales;
@@ -38,6 +41,12 @@ CREATE TABLE IF NOT EXISTS inventory (
     stock_qty INT DEFAULT 0,
     price DECIMAL(10, 2) NOT NULL,
     reorder_level INT DEFAULT 10,
+    strength VARCHAR(100),
+    form VARCHAR(100),
+    indication TEXT,
+    side_effects TEXT,
+    prescription_required BOOLEAN DEFAULT FALSE,
+    age_restriction VARCHAR(100),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
 );
@@ -48,6 +57,7 @@ CREATE TABLE IF NOT EXISTS customers (
     name VARCHAR(100) NOT NULL,
     phone VARCHAR(20) UNIQUE,
     email VARCHAR(100),
+    address VARCHAR(255),
     loyalty_points INT DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -92,6 +102,9 @@ CREATE TABLE IF NOT EXISTS audit_logs (
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL
 );
 
+-- Indexes and later schema changes live in database/migrations/ and are
+-- applied by database/migrate.py (init_db runs them after this file).
+
 -- 8. Seed Initial Data
 -- Note: Admin password will be 'admin123' (hashed in setup script)
 INSERT INTO users (username, password_hash, full_name, role) 
@@ -451,10 +451,7 @@ class AddMedicineWindow(QWidget):
             # 3. Success
             QMessageBox.information(self, "Success", f"'{name}' has been added to inventory.")
             
-            # 4. Refresh Parent if InventoryWindow
-            if hasattr(self.parent(), 'refresh_data'):
-                self.parent().refresh_data()
-            
+            # Open inventory views pick the new row up from the inventory.changed event
             self.close()
             
         except Exception as e:
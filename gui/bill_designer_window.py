@@ -112,7 +112,8 @@ class BillDesignerWindow(QWidget):
         self.resize(1200, 800) # Compact size
         self.setStyleSheet(f"background-color: {Theme.BG_MAIN.name()};")
         
-        self.current_template = TemplateService.load_template()
+        # Edited in place, so never the shared cached dict
+        self.current_template = copy.deepcopy(TemplateService.load_template())
         self.zoom_level = 0.75 # Default zoomed out to fit better
         self.init_ui()
 
@@ -2,16 +2,20 @@ import sys
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QFrame, QScrollArea, QApplication, 
                              QMessageBox, QGridLayout, QSpacerItem, QSizePolicy)
-from PySide6.QtCore import Qt, QSize, QRect
+from PySide6.QtCore import Qt, QSize, QRect, QRectF
 from PySide6.QtGui import QFont, QColor, QPainter, QPen, QBrush, QPixmap, QPainterPath
 from datetime import datetime
+from config import GST_RATE
 from services.template_service import TemplateService
+from utils.theme import Theme
 
 class InvoicePaper(QFrame):
     """Refined paper widget with subtle medical cross watermark"""
     def __init__(self, template=None, parent=None):
         super().__init__(parent)
         self.template = template or TemplateService.load_template()
+        self.watermark = QColor(TemplateService.style(self.template).primary)
+        self.watermark.setAlpha(12)
         self.setFixedSize(794, 1123)
         self.setStyleSheet("background-color: white;")
 
@@ -26,9 +30,7 @@ class InvoicePaper(QFrame):
         
         # Draw Medical Cross Watermark (5% Opacity)
         painter.setPen(Qt.NoPen)
-        primary = QColor(self.template['theme']['primary'])
-        color = QColor(primary.red(), primary.green(), primary.blue(), 12) 
-        painter.setBrush(color)
+        painter.setBrush(self.watermark)
         
         size = 200
         thickness = 60
@@ -36,70 +38,92 @@ class InvoicePaper(QFrame):
         painter.drawRect(cx - thickness // 2, cy - size // 2, thickness, size)
         painter.drawRect(cx - size // 2, cy - thickness // 2, size, thickness)
 
-class InvoiceTable(QFrame):
-    """Spreadsheet-style table for invoice items"""
+class InvoiceTable(QWidget):
+    """Spreadsheet-style table for invoice items.
+
+    One widget paints every row: row strings are formatted once, column
+    edges and elided item names are laid out once per width, and
+    paintEvent only draws the rows inside the exposed rectangle, so long
+    invoices cost nothing while they are scrolled out of view.
+    """
+    HEADER_H = 35
+    ROW_H = 30
+    PADDING = 10
+    COLUMN_WEIGHTS = (1, 0.7, 0.7, 0.4, 0.6, 0.4, 0.8)
+    AMOUNT_COL = 6
+
     def __init__(self, items, template=None, parent=None):
         super().__init__(parent)
-        t = template or TemplateService.load_template()
-        self.setStyleSheet(f"background: white; border-top: 2px solid {t['theme']['primary']};")
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(0)
-
-        # Header Row
-        header = QFrame()
-        header.setFixedHeight(35)
-        header.setStyleSheet(f"background: {t['table']['header_bg']}; border-bottom: 1px solid {t['table']['row_border']};")
-        h_layout = QHBoxLayout(header)
-        h_layout.setContentsMargins(10, 0, 10, 0)
-        
-        cols = [
-            ("ITEM", 1), ("BATCH", 0.7), 
-            ("EXPIRY", 0.7), ("QTY", 0.4), ("RATE", 0.6), 
-            ("GST%", 0.4), ("AMOUNT", 0.8)
-        ]
-        
-        for text, stretch in cols:
-            lbl = QLabel(text)
-            f = QFont()
-            f.setFamily(t['theme']['font_family'])
-            f.setPointSize(8)
-            f.setBold(True)
-            lbl.setFont(f)
-            lbl.setStyleSheet(f"color: {t['table']['header_text']}; border: none;")
-            h_layout.addWidget(lbl, stretch * 10)
-            
-        layout.addWidget(header)
-
-        # Item Rows
-        for i, item in enumerate(items):
-            row = QFrame()
-            row.setFixedHeight(30)
-            row.setStyleSheet(f"border-bottom: 1px solid {t['table']['row_border']};")
-            r_layout = QHBoxLayout(row)
-            r_layout.setContentsMargins(10, 0, 10, 0)
-            
-            vals = [
-                (item[0], 1), ("BT-12", 0.7), 
-                ("12/26", 0.7), (str(item[2]), 0.4), (f"{item[1]:.2f}", 0.6), 
-                ("12%", 0.4), (f"{item[3]:.2f}", 0.8)
-            ]
-            
-            for val, stretch in vals:
-                lbl = QLabel(val)
-                f_row = QFont()
-                f_row.setFamily(t['theme']['font_family'])
-                f_row.setPointSize(9)
-                lbl.setFont(f_row)
-                if stretch == 0.8: # Amount col
-                    f_m = QFont()
-                    f_m.setFamily("JetBrains Mono")
-                    f_m.setPointSize(9)
-                    f_m.setBold(True)
-                    lbl.setFont(f_m)
-                    lbl.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                r_layout.addWidget(lbl, stretch * 10)
-            layout.addWidget(row)
+        self.table_style = TemplateService.style(template)
+        self.rows = [self.row_values(item) for item in items]
+        self.edges = []
+        self.names = []     # item names elided to the current column width
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.setFixedHeight(self.HEADER_H + self.ROW_H * len(self.rows))
+
+    @staticmethod
+    def row_values(item):
+        name, rate, qty, amount = item[:4]
+        batch = item[4] if len(item) > 4 else '-'
+        expiry = item[5] if len(item) > 5 else '-'
+        return (str(name), str(batch), str(expiry), str(qty), f"{float(rate):.2f}", f"{GST_RATE}%", f"{float(amount):.2f}")
+
+    def sizeHint(self):
+        return QSize(600, self.height())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.layout_columns()
+
+    def layout_columns(self):
+        weights = self.COLUMN_WEIGHTS[:len(self.table_style.columns)]
+        width, total = self.width() - 2 * self.PADDING, sum(weights)
+        self.edges = [self.PADDING]
+        for w in weights:
+            self.edges.append(self.edges[-1] + width * w / total)
+        name_w = int(self.edges[1] - self.edges[0]) - 6
+        elide = self.table_style.metrics(9).elidedText
+        self.names = [elide(r[0], Qt.ElideRight, name_w) for r in self.rows]
+
+    def cell_rect(self, col, top, height):
+        return QRectF(self.edges[col], top, self.edges[col + 1] - self.edges[col] - 6, height)
+
+    def paintEvent(self, event):
+        s = self.table_style
+        clip = event.rect()
+        painter = QPainter(self)
+        painter.fillRect(clip, Qt.white)
+
+        if clip.top() < self.HEADER_H:
+            painter.fillRect(0, 0, self.width(), self.HEADER_H, s.header_bg)
+            painter.setFont(s.font(8, bold=True))
+            painter.setPen(s.header_text)
+            for col, text in enumerate(s.columns[:len(self.edges) - 1]):
+                painter.drawText(self.cell_rect(col, 0, self.HEADER_H), Qt.AlignLeft | Qt.AlignVCenter, text)
+            painter.fillRect(0, self.HEADER_H - 1, self.width(), 1, s.row_border)
+
+        first = max(0, (clip.top() - self.HEADER_H) // self.ROW_H)
+        last = min(len(self.rows), (clip.bottom() - self.HEADER_H) // self.ROW_H + 1)
+        cols = range(min(len(self.edges) - 1, self.AMOUNT_COL))
+        painter.setFont(s.font(9))
+        painter.setPen(s.text)
+        for i in range(first, last):
+            top = self.HEADER_H + i * self.ROW_H
+            row = self.rows[i]
+            for col in cols:
+                painter.drawText(self.cell_rect(col, top, self.ROW_H), Qt.AlignLeft | Qt.AlignVCenter,
+                                 self.names[i] if col == 0 else row[col])
+            painter.fillRect(0, top + self.ROW_H - 1, self.width(), 1, s.row_border)
+        if len(self.edges) > self.AMOUNT_COL + 1:
+            painter.setFont(s.font(9, bold=True, mono=True))
+            for i in range(first, last):
+                painter.drawText(self.cell_rect(self.AMOUNT_COL, self.HEADER_H + i * self.ROW_H, self.ROW_H),
+                                 Qt.AlignRight | Qt.AlignVCenter, self.rows[i][self.AMOUNT_COL])
+
+        painter.fillRect(0, 0, self.width(), 2, s.primary)
+        painter.end()
+
 
 class BillPreviewWindow(QWidget):
     def __init__(self, master, bill_data):
@@ -109,10 +133,16 @@ class BillPreviewWindow(QWidget):
         self.setStyleSheet(f"background-color: {Theme.BG_MAIN.name()};")
         self.bill_data = bill_data
         self.template = TemplateService.load_template()
+        self.print_job = None
+        self.pdf_pending = False
         self.init_ui()
+        from services.gui_events import gui_events
+        from database.events import TEMPLATE_CHANGED
+        gui_events().subscribe(TEMPLATE_CHANGED, self.on_template_changed, owner=self)
 
     def init_ui(self):
         t = self.template
+        st = TemplateService.style(t)
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.setSpacing(0)
@@ -121,7 +151,7 @@ class BillPreviewWindow(QWidget):
         scroll.setWidgetResizable(True)
         scroll.setStyleSheet("border: none;")
         
-        self.paper = InvoicePaper()
+        self.paper = InvoicePaper(t)
         paper_layout = QVBoxLayout(self.paper)
         paper_layout.setContentsMargins(50, 50, 50, 50)
         paper_layout.setSpacing(15)
@@ -130,20 +160,12 @@ class BillPreviewWindow(QWidget):
         header = QHBoxLayout()
         logo_v = QVBoxLayout()
         name = QLabel(t['store']['name'])
-        f22b = QFont()
-        f22b.setFamily(t['theme']['font_family'])
-        f22b.setPointSize(22)
-        f22b.setBold(True)
-        name.setFont(f22b)
+        name.setFont(st.font(22, bold=True))
         name.setStyleSheet(f"color: {t['store']['color']}; letter-spacing: 2px;")
         logo_v.addWidget(name)
         
         tagline = QLabel(t['store']['tagline'])
-        f8b = QFont()
-        f8b.setFamily(t['theme']['font_family'])
-        f8b.setPointSize(8)
-        f8b.setBold(True)
-        tagline.setFont(f8b)
+        tagline.setFont(st.font(8, bold=True))
         tagline.setStyleSheet(f"color: {t['store']['tagline_color']}; letter-spacing: 1px;")
         logo_v.addWidget(tagline)
         header.addLayout(logo_v)
@@ -151,10 +173,7 @@ class BillPreviewWindow(QWidget):
         header.addStretch()
         
         addr = QLabel(t['store']['address'])
-        f9 = QFont()
-        f9.setFamily(t['theme']['font_family'])
-        f9.setPointSize(9)
-        addr.setFont(f9)
+        addr.setFont(st.font(9))
         addr.setAlignment(Qt.AlignRight)
         addr.setStyleSheet(f"color: {t['store']['address_color']}; line-height: 1.4;")
         header.addWidget(addr)
@@ -164,11 +183,7 @@ class BillPreviewWindow(QWidget):
         title_v = QVBoxLayout()
         title_v.setSpacing(5)
         title = QLabel("TAX INVOICE")
-        f18l = QFont()
-        f18l.setFamily(t['theme']['font_family'])
-        f18l.setPointSize(18)
-        f18l.setWeight(QFont.Light)
-        title.setFont(f18l)
+        title.setFont(st.font(18, weight=QFont.Light))
         title.setStyleSheet(f"color: {t['theme']['accent']}; letter-spacing: 4px; text-transform: uppercase;")
         title_v.addWidget(title)
         
@@ -184,12 +199,10 @@ class BillPreviewWindow(QWidget):
         cust_box = QFrame()
         cust_layout = QVBoxLayout(cust_box)
         lbl = QLabel("BILL TO")
-        f8ba = QFont(); f8ba.setFamily(t['theme']['font_family']); f8ba.setPointSize(8); f8ba.setBold(True)
-        lbl.setFont(f8ba); lbl.setStyleSheet("color: #94A3B8;")
+        lbl.setFont(st.font(8, bold=True)); lbl.setStyleSheet("color: #94A3B8;")
         cust_layout.addWidget(lbl)
         cust_name = QLabel(self.bill_data.get('customer_name', 'Walk-in Customer'))
-        f11b = QFont(); f11b.setFamily(t['theme']['font_family']); f11b.setPointSize(11); f11b.setBold(True)
-        cust_name.setFont(f11b)
+        cust_name.setFont(st.font(11, bold=True))
         cust_layout.addWidget(cust_name)
         cust_layout.addWidget(QLabel(f"PH: {self.bill_data.get('customer_phone', '--')}", styleSheet="color: #64748B;"))
         meta_row.addWidget(cust_box, 1)
@@ -201,8 +214,8 @@ class BillPreviewWindow(QWidget):
         inv_l.setSpacing(10)
         
         def add_meta_field(row, l, v):
-            kl = QLabel(l); f_k = QFont(); f_k.setFamily(t['theme']['font_family']); f_k.setPointSize(8); f_k.setBold(True); kl.setFont(f_k); kl.setStyleSheet("color: #64748B;")
-            vl = QLabel(v); f_v = QFont(); f_v.setFamily(t['theme']['font_family']); f_v.setPointSize(9); f_v.setBold(True); vl.setFont(f_v)
+            kl = QLabel(l); kl.setFont(st.font(8, bold=True)); kl.setStyleSheet("color: #64748B;")
+            vl = QLabel(v); vl.setFont(st.font(9, bold=True))
             inv_l.addWidget(kl, row, 0); inv_l.addWidget(vl, row, 1)
 
         add_meta_field(0, "INVOICE NO", self.bill_data.get('bill_no', 'POS-0001'))
@@ -226,19 +239,17 @@ class BillPreviewWindow(QWidget):
         words_v = QVBoxLayout()
         words_v.addStretch()
         w_lbl = QLabel("TOTAL AMOUNT IN WORDS")
-        f8bw = QFont(); f8bw.setFamily(t['theme']['font_family']); f8bw.setPointSize(8); f8bw.setBold(True); w_lbl.setFont(f8bw); w_lbl.setStyleSheet("color: #94A3B8;")
+        w_lbl.setFont(st.font(8, bold=True)); w_lbl.setStyleSheet("color: #94A3B8;")
         words_v.addWidget(w_lbl)
         
         total_words = QLabel("Seventy-Two Rupees and Eighty Paise Only")
-        f10i = QFont(); f10i.setFamily(t['theme']['font_family']); f10i.setPointSize(10); f10i.setItalic(True)
-        total_words.setFont(f10i)
+        total_words.setFont(st.font(10, italic=True))
         total_words.setStyleSheet("color: #0F172A; border-bottom: 2px dotted #E2E8F0; padding-bottom: 10px;")
         words_v.addWidget(total_words)
         
         if t['footer'].get('show_bank', True):
             bank = QLabel("BANK DETAILS\nStandard Chartered Bank | A/C: 1234567890\nIBAN: PK12 SCBL 0000 0001 2345 6789")
-            f7 = QFont(); f7.setFamily(t['theme']['font_family']); f7.setPointSize(7)
-            bank.setFont(f7); bank.setStyleSheet("color: #94A3B8; margin-top: 15px;")
+            bank.setFont(st.font(7)); bank.setStyleSheet("color: #94A3B8; margin-top: 15px;")
             words_v.addWidget(bank)
         flex_row.addLayout(words_v, 1)
         
@@ -253,10 +264,9 @@ class BillPreviewWindow(QWidget):
         def sum_row(l, v, b=False, s=False):
             row = QHBoxLayout()
             kl = QLabel(l)
-            fk = QFont(); fk.setFamily(t['theme']['font_family']); fk.setPointSize(9); fk.setBold(b); kl.setFont(fk)
+            kl.setFont(st.font(9, bold=b))
             vl = QLabel(f"Rs. {float(v):.2f}")
-            fv = QFont(); fv.setFamily("JetBrains Mono"); fv.setPointSize(10 if not s else 14); fv.setBold(True)
-            vl.setFont(fv)
+            vl.setFont(st.font(14 if s else 10, bold=True, mono=True))
             vl.setAlignment(Qt.AlignRight)
             if s: vl.setStyleSheet("color: white;")
             row.addWidget(kl); row.addStretch(); row.addWidget(vl)
@@ -276,13 +286,13 @@ class BillPreviewWindow(QWidget):
         cg = QVBoxLayout()
         cg.addWidget(QLabel("CGST (6%)", styleSheet="color: #64748B; font-size: 8px; font-weight: bold;"))
         vl_cg = QLabel(f"Rs. {self.bill_data.get('gst', 0)/2:.2f}")
-        fcg = QFont(); fcg.setFamily(t['theme']['font_family']); fcg.setPointSize(9); fcg.setBold(True); vl_cg.setFont(fcg)
+        vl_cg.setFont(st.font(9, bold=True))
         cg.addWidget(vl_cg)
         
         sg = QVBoxLayout()
         sg.addWidget(QLabel("SGST (6%)", styleSheet="color: #64748B; font-size: 8px; font-weight: bold;"))
         vl_sg = QLabel(f"Rs. {self.bill_data.get('gst', 0)/2:.2f}")
-        fsg = QFont(); fsg.setFamily(t['theme']['font_family']); fsg.setPointSize(9); fsg.setBold(True); vl_sg.setFont(fsg)
+        vl_sg.setFont(st.font(9, bold=True))
         sg.addWidget(vl_sg)
         
         gst_split.addLayout(cg); gst_split.addLayout(sg)
@@ -317,6 +327,8 @@ class BillPreviewWindow(QWidget):
         footer.addWidget(thanks)
         
         paper_layout.addLayout(footer)
+        # Long invoices run past one A4 sheet; let the paper grow with the table
+        self.paper.setFixedHeight(max(self.paper.height(), paper_layout.minimumSize().height()))
 
         scroll_content = QWidget()
         scroll_content.setStyleSheet(f"background-color: {Theme.BG_MAIN.name()};")
@@ -333,15 +345,73 @@ class BillPreviewWindow(QWidget):
         ff_layout = QHBoxLayout(float_footer)
         ff_layout.setContentsMargins(40, 0, 40, 0)
         
-        p_btn = QPushButton("Print Receipt")
-        p_btn.setFixedSize(160, 45)
-        p_btn.setStyleSheet(f"background: {t['theme']['primary']}; color: white; border-radius: 8px; font-weight: bold;")
-        p_btn.clicked.connect(lambda: QMessageBox.information(self, "Print", "Dispatching to thermal printer..."))
+        self.print_btn = QPushButton("Print Receipt")
+        self.print_btn.setFixedSize(160, 45)
+        self.print_btn.setStyleSheet(st.primary_button_qss)
+        self.print_btn.clicked.connect(self.print_receipt)
+
+        self.pdf_btn = QPushButton("Save PDF")
+        self.pdf_btn.setFixedSize(140, 45)
+        self.pdf_btn.setStyleSheet(st.outline_button_qss)
+        self.pdf_btn.clicked.connect(self.save_pdf)
         ff_layout.addStretch()
-        ff_layout.addWidget(p_btn)
+        ff_layout.addWidget(self.pdf_btn)
+        ff_layout.addWidget(self.print_btn)
         
         main_layout.addWidget(float_footer)
 
+    def on_template_changed(self, template):
+        """template.changed: rebuilds the invoice with the new template."""
+        self.template = template
+        # Hand the old layout and its widgets to a throwaway parent, which deletes them
+        QWidget().setLayout(self.layout())
+        self.init_ui()
+        # The rebuilt buttons must reflect work started from the old ones
+        if self.print_job is not None and self.print_job.status in ('queued', 'printing'):
+            self.print_btn.setEnabled(False)
+            self.print_btn.setText("Printing...")
+        self.pdf_btn.setEnabled(not self.pdf_pending)
+
+    def print_receipt(self):
+        # Only queues the job; the spooler thread renders and sends it
+        from services.printer_service import get_printer
+        from services.gui_events import gui_events
+        from database.events import PRINT_JOB_FINISHED
+        if self.print_job is None:
+            gui_events().subscribe(PRINT_JOB_FINISHED, self.on_print_finished, owner=self)
+        self.print_job = get_printer().submit(self.bill_data)
+        self.print_btn.setEnabled(False)
+        self.print_btn.setText("Printing...")
+
+    def on_print_finished(self, job):
+        if self.print_job is None or job.id != self.print_job.id:
+            return
+        self.print_btn.setEnabled(True)
+        self.print_btn.setText("Print Receipt")
+        if job.status == 'failed':
+            QMessageBox.critical(self, "Print Error", f"Could not print the receipt.\n\nError: {job.error}")
+
+    def save_pdf(self):
+        # Rendered on a worker; reportlab never touches Qt
+        from services.pdf_generator import get_invoice_generator
+        from services.query_executor import get_executor
+        if self.pdf_pending:
+            return
+        self.pdf_pending = True
+        self.pdf_btn.setEnabled(False)
+        get_executor().submit(get_invoice_generator().render, dict(self.bill_data)).then(
+            self.on_pdf_saved, self.on_pdf_failed)
+
+    def on_pdf_saved(self, path):
+        self.pdf_pending = False
+        self.pdf_btn.setEnabled(True)
+        QMessageBox.information(self, "Invoice Saved", f"Invoice saved to:\n{path}")
+
+    def on_pdf_failed(self, e):
+        self.pdf_pending = False
+        self.pdf_btn.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Could not save the invoice PDF.\n\nError: {e}")
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     data = {
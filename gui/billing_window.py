@@ -1,87 +1,199 @@
 import sys
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QLineEdit, QPushButton, QFrame, QGraphicsDropShadowEffect, 
-                             QScrollArea, QListWidget, QListWidgetItem,
+                             QScrollArea, QListWidget, QListWidgetItem, QListView,
+                             QStyledItemDelegate, QStyle, QAbstractItemView,
                              QApplication, QSpacerItem, QSizePolicy, QMessageBox)
-from PySide6.QtCore import Qt, QSize, QTimer
-from PySide6.QtGui import (QFont, QColor, QPainter, QPen, QBrush, QLinearGradient)
+from PySide6.QtCore import Qt, QSize, QTimer, QRect, QAbstractListModel, QModelIndex
+from PySide6.QtGui import (QFont, QColor, QPainter, QPen, QBrush, QLinearGradient, QFontMetrics)
 from datetime import datetime
 
 from utils.theme import Theme
 from gui.components import ModernButton
+from services.cart import Cart
+from services.paging import InventoryPager
+from services.query_executor import get_executor, ImmediateExecutor
+from services.gui_events import gui_events
+from database.events import INVENTORY_CHANGED, PRINT_JOB_FINISHED
 
-class ProductRow(QFrame):
-    """List row for products in the POS"""
-    def __init__(self, name, price, stock, callback, parent=None):
+class ProductListModel(QAbstractListModel):
+    """POS search results or the paged catalogue; rows are plain inventory dicts, painted by ProductDelegate"""
+    ProductRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None, executor=None):
         super().__init__(parent)
-        self.setFixedHeight(40)
-        self.setCursor(Qt.PointingHandCursor)
-        self.name = name
-        self.price = float(price)
-        self.stock = int(stock)
-        self.callback = callback
-        
-        self.setStyleSheet(f"""
-            QFrame {{
-                background: white;
-                border: none;
-                border-radius: 12px;
-            }}
-            QFrame:hover {{
-                background: {Theme.BG_MAIN.name()};
-            }}
-        """)
-        
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(10, 0, 10, 0)
-        layout.setSpacing(10)
-        
-        name_info = QVBoxLayout()
-        name_info.setSpacing(1)
-        self.lbl_name = QLabel(name)
-        self.lbl_name.setFont(Theme.get_font(11, QFont.Bold))
-        self.lbl_name.setStyleSheet(f"color: {Theme.TEXT_MAIN.name()}; border: none;")
-        
-        self.lbl_stock = QLabel(f"Stock: {stock} units available")
-        stock_color = Theme.PRIMARY.name() if self.stock > 10 else Theme.ERROR.name()
-        self.lbl_stock.setStyleSheet(f"color: {stock_color}; font-size: 9px; border: none;")
-        name_info.addWidget(self.lbl_name)
-        name_info.addWidget(self.lbl_stock)
-        layout.addLayout(name_info)
-        
-        layout.addStretch()
-        
-        self.lbl_price = QLabel(f"Rs. {self.price:.2f}")
-        self.lbl_price.setFont(Theme.get_font(12, QFont.Bold))
-        self.lbl_price.setStyleSheet(f"color: {Theme.PRIMARY.name()}; border: none;")
-        layout.addWidget(self.lbl_price)
-        
-        self.add_btn = QPushButton("+")
-        self.add_btn.setFixedSize(30, 30)
-        self.add_btn.setStyleSheet(f"""
-            QPushButton {{ 
-                background: {Theme.BG_MAIN.name()}; 
-                border-radius: 15px; 
-                font-weight: bold; 
-                border: none; 
-                color: {Theme.TEXT_SUB.name()}; 
-            }}
-            QPushButton:hover {{ 
-                background: {Theme.PRIMARY.name()}; 
-                color: white; 
-            }}
-        """)
-        self.add_btn.clicked.connect(lambda: self.callback(self.name, self.price))
-        layout.addWidget(self.add_btn)
+        self._products = []
+        self._row_of = {}  # inventory id -> row
+        self.pager = None  # set while browsing the catalogue
+        self.executor = executor or ImmediateExecutor()
+        self._loading = None  # in-flight page request
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._products)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        prod = self._products[index.row()]
+        if role == Qt.DisplayRole:
+            return prod['medicine_name']
+        if role == self.ProductRole:
+            return prod
+        return None
+
+    def browse(self, pager):
+        """Shows the catalogue from its first page; later pages load as the view scrolls."""
+        self._cancel_loading()
+        self.pager = pager
+        pager.reset()
+        self._request(None, self._first_page)
+
+    def _request(self, after, on_rows):
+        self._loading = self.executor.submit(self.pager.fetch, after)
+        self._loading.then(on_rows, self._load_failed)
+
+    def _cancel_loading(self):
+        if self._loading is not None:
+            self._loading.cancel()
+            self._loading = None
+
+    def _load_failed(self, error):
+        self._loading = None
+        print(f"Error loading inventory: {error}")
+
+    def _first_page(self, rows):
+        self._loading = None
+        self._replace(self.pager.advance(rows))
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.pager is not None and self.pager.has_more()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self._loading is None and self.canFetchMore(parent):
+            self._request(self.pager.after, self._append_page)
+
+    def _append_page(self, rows):
+        self._loading = None
+        self.pager.advance(rows)
+        if not rows:
+            return
+        first = len(self._products)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._products.extend(rows)
+        self._row_of.update((p['id'], first + i) for i, p in enumerate(rows))
+        self.endInsertRows()
+
+    def product_ids(self):
+        return list(self._row_of)
+
+    def set_products(self, products):
+        self._cancel_loading()
+        self.pager = None
+        products = list(products)
+        if [p['id'] for p in products] == [p['id'] for p in self._products]:
+            # Same result set (e.g. a refresh): only repaint rows whose figures moved
+            for row, (old, new) in enumerate(zip(self._products, products)):
+                if old.get('stock_qty') != new.get('stock_qty') or old.get('price') != new.get('price'):
+                    self._products[row] = new
+                    idx = self.index(row)
+                    self.dataChanged.emit(idx, idx)
+            return
+        self._replace(products)
+
+    def _replace(self, products):
+        self.beginResetModel()
+        self._products = products
+        self._row_of = {p['id']: row for row, p in enumerate(products)}
+        self.endResetModel()
+
+    def patch_rows(self, rows):
+        """Replaces shown products by id (fresh stock/price); emits dataChanged for those rows only."""
+        for prod in rows:
+            row = self._row_of.get(prod['id'])
+            if row is None:
+                continue
+            self._products[row] = dict(self._products[row], **prod)
+            idx = self.index(row)
+            self.dataChanged.emit(idx, idx)
+
+    def update_stock(self, stock_by_id):
+        """Patches stock figures in place; emits dataChanged for affected rows only."""
+        for med_id, qty in stock_by_id.items():
+            row = self._row_of.get(med_id)
+            if row is None:
+                continue
+            self._products[row]['stock_qty'] = qty
+            idx = self.index(row)
+            self.dataChanged.emit(idx, idx)
+
+class ProductDelegate(QStyledItemDelegate):
+    """Paints a POS product row (name, stock, price, + button) without any child widgets"""
+    ROW_HEIGHT = 40
 
-    def mousePressEvent(self, event):
-        self.callback(self.name, self.price)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name_font = Theme.get_font(11, QFont.Bold)
+        self.price_font = Theme.get_font(12, QFont.Bold)
+        self.stock_font = Theme.get_font(9)
+        self.stock_font.setPixelSize(9)
+        self.price_metrics = QFontMetrics(self.price_font)
+        self.name_metrics = QFontMetrics(self.name_font)
+        self.white = QColor("white")
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter, option, index):
+        prod = index.data(ProductListModel.ProductRole)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        stock = int(prod.get('stock_qty') or 0)
+        rect = option.rect
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(Theme.BG_MAIN if hovered else self.white)
+        painter.drawRoundedRect(rect, 12, 12)
+
+        inner = rect.adjusted(10, 0, -10, 0)
+
+        # "+" button
+        btn = QRect(inner.right() - 30, inner.center().y() - 15, 30, 30)
+        painter.setBrush(Theme.PRIMARY if hovered else Theme.BG_MAIN)
+        painter.drawEllipse(btn)
+        painter.setPen(self.white if hovered else Theme.TEXT_SUB)
+        painter.setFont(self.name_font)
+        painter.drawText(btn, Qt.AlignCenter, "+")
+
+        # Price
+        price_text = f"Rs. {float(prod.get('price') or 0):.2f}"
+        pw = self.price_metrics.horizontalAdvance(price_text)
+        price_rect = QRect(btn.left() - 10 - pw, rect.top(), pw, rect.height())
+        painter.setPen(Theme.PRIMARY)
+        painter.setFont(self.price_font)
+        painter.drawText(price_rect, Qt.AlignVCenter | Qt.AlignRight, price_text)
+
+        # Name + stock line
+        text_w = max(0, price_rect.left() - 10 - inner.left())
+        half = rect.height() // 2
+        name_rect = QRect(inner.left(), rect.top() + 2, text_w, half)
+        painter.setPen(Theme.TEXT_MAIN)
+        painter.setFont(self.name_font)
+        name = self.name_metrics.elidedText(prod['medicine_name'], Qt.ElideRight, text_w)
+        painter.drawText(name_rect, Qt.AlignLeft | Qt.AlignBottom, name)
+
+        stock_rect = QRect(inner.left(), rect.top() + half + 1, text_w, half - 2)
+        painter.setPen(Theme.PRIMARY if stock > 10 else Theme.ERROR)
+        painter.setFont(self.stock_font)
+        painter.drawText(stock_rect, Qt.AlignLeft | Qt.AlignTop, f"Stock: {stock} units available")
+        painter.restore()
 
 class CartItem(QFrame):
     """Stacked card for cart items"""
-    def __init__(self, name, price, qty, on_change, parent=None):
+    def __init__(self, inventory_id, name, price, qty, on_change, parent=None):
         super().__init__(parent)
         self.setFixedHeight(65)
+        self.inventory_id = inventory_id
         self.name = name
         self.price = price
         self.qty = qty
@@ -141,14 +253,13 @@ class CartItem(QFrame):
         layout.addWidget(self.total_lbl)
 
     def update_qty(self, delta):
-        new_qty = self.qty + delta
-        if new_qty > 0:
-            self.qty = new_qty
-            self.qty_lbl.setText(str(self.qty))
-            self.total_lbl.setText(f"Rs. {self.price * self.qty:.2f}")
-            self.on_change()
-        elif new_qty == 0:
-            self.on_change(remove=self.name)
+        self.on_change(self.inventory_id, delta)
+
+    def set_qty(self, qty):
+        """Refreshes this card only; called by BillingWindow after the cart changed"""
+        self.qty = qty
+        self.qty_lbl.setText(str(qty))
+        self.total_lbl.setText(f"Rs. {self.price * qty:.2f}")
 
 class BillingWindow(QWidget):
     def __init__(self, parent=None):
@@ -157,15 +268,28 @@ class BillingWindow(QWidget):
         self.setMinimumSize(1000, 700)
         self.resize(1150, 750)
         self.setStyleSheet(f"background: {Theme.BG_MAIN.name()};")
-        self.cart_data = {}
+        self.cart = Cart()
+        self.cart_widgets = {}  # inventory_id -> CartItem
+        self.sale_pending = False
         self.primary = Theme.PRIMARY.name()
         self.accent = Theme.PRIMARY.name() # Standardizing on primary for now
         
         self.search_timer = QTimer()
         self.search_timer.setSingleShot(True)
         self.search_timer.timeout.connect(self.execute_search)
+        self.executor = get_executor()
+        self.catalogue_pager = InventoryPager(
+            page_size=100, columns=('id', 'medicine_name', 'company', 'strength', 'form', 'barcode', 'price', 'stock_qty'))
 
         self.init_ui()
+        self.refresh_inventory_list()
+        # Stock moved by any till or window (e.g. this checkout) patches the shown rows
+        gui_events().subscribe(INVENTORY_CHANGED, self.on_inventory_changed, owner=self)
+        gui_events().subscribe(PRINT_JOB_FINISHED, self.on_print_finished, owner=self)
+        self.print_jobs = set()
+        # Build the search index in the background before the first keystroke needs it
+        from services.search_index import get_inventory_index
+        self.executor.submit(get_inventory_index)
 
 
     def init_ui(self):
@@ -201,21 +325,20 @@ class BillingWindow(QWidget):
         self.search_input.textChanged.connect(self.handle_search_input)
         left_layout.addWidget(self.search_input)
 
-        # Product List Area
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("background: transparent; border: none;")
-        list_container = QWidget()
-        self.list_v = QVBoxLayout(list_container)
-        self.list_v.setContentsMargins(0, 0, 0, 0)
-        self.list_v.setSpacing(0)
-        
-
-        self.products = []
-        
-        self.list_v.addStretch()
-        scroll.setWidget(list_container)
-        left_layout.addWidget(scroll)
+        # Product List Area (virtualized: only visible rows are painted)
+        self.product_model = ProductListModel(self, executor=self.executor)
+        self.product_view = QListView()
+        self.product_view.setModel(self.product_model)
+        self.product_view.setItemDelegate(ProductDelegate(self.product_view))
+        self.product_view.setUniformItemSizes(True)
+        self.product_view.setMouseTracking(True)
+        self.product_view.viewport().setAttribute(Qt.WA_Hover, True)
+        self.product_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.product_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.product_view.setCursor(Qt.PointingHandCursor)
+        self.product_view.setStyleSheet("background: transparent; border: none;")
+        self.product_view.clicked.connect(self.on_product_clicked)
+        left_layout.addWidget(self.product_view)
 
         main_layout.addWidget(left_panel, 40)
 
@@ -304,13 +427,13 @@ class BillingWindow(QWidget):
         self.discount_input_percent.setPlaceholderText("%")
         self.discount_input_percent.setFixedWidth(50)
         self.discount_input_percent.setStyleSheet(f"border: none; background: {Theme.BG_MAIN.name()}; border-radius: 4px; padding: 2px; color: {Theme.TEXT_MAIN.name()}; font-weight: bold;")
-        self.discount_input_percent.textChanged.connect(self.update_cart_ui)
+        self.discount_input_percent.textChanged.connect(self.refresh_totals)
         
         self.discount_input_fixed = QLineEdit()
         self.discount_input_fixed.setPlaceholderText("Fixed Rs.")
         self.discount_input_fixed.setFixedWidth(80)
         self.discount_input_fixed.setStyleSheet(f"border: none; background: {Theme.BG_MAIN.name()}; border-radius: 4px; padding: 2px; color: {Theme.TEXT_MAIN.name()}; font-weight: bold;")
-        self.discount_input_fixed.textChanged.connect(self.update_cart_ui)
+        self.discount_input_fixed.textChanged.connect(self.refresh_totals)
         
         self.discount_lbl = QLabel("Rs. 0.00")
         self.discount_lbl.setAlignment(Qt.AlignRight)
@@ -350,7 +473,7 @@ class BillingWindow(QWidget):
         term = self.search_input.text().strip()
         if not term:
             self.search_timer.stop()
-            self.update_inventory_list([])
+            self.refresh_inventory_list()
             return
             
         # If it's a long number, it's likely a barcode scan - handle immediately
@@ -358,164 +481,216 @@ class BillingWindow(QWidget):
             self.search_timer.stop()
             self.execute_search()
         else:
-            # Debounce for typing names
-            self.search_timer.start(150) # 150ms delay
+            # Debounce for typing names; results come from the in-memory index
+            self.search_timer.start(40) # 40ms delay
 
     def execute_search(self):
         term = self.search_input.text().strip()
         if not term: return
 
-        from database.models import Medicine
-        
-        # Barcode match (Full match)
+        # Repeat scans of a SKU are answered from the barcode cache with no round-trip
         if term.isdigit() and len(term) >= 8:
-            med = Medicine.find_by_barcode(term)
+            from database.models import Medicine
+            med = Medicine.lookup_barcode(term, cached_only=True)
             if med:
-                self.add_to_cart(med['medicine_name'], med['price'])
-                self.search_input.clear()
+                self.executor.cancel('billing.search')
+                self.show_search_result(term, ('barcode', med))
                 return
 
-        # Real-time Filter (DB Search)
-        results = Medicine.search(term)
-        self.update_inventory_list(results)
+        # Runs on a worker; a newer keystroke cancels this one's result
+        self.executor.submit(self.lookup_products, term, key='billing.search').then(
+            lambda result: self.show_search_result(term, result),
+            lambda e: print(f"Search failed: {e}"))
+
+    @staticmethod
+    def lookup_products(term):
+        """Worker-thread half of a search: ('barcode', row) or ('list', rows)."""
+        from database.models import Medicine
+        from services.search_index import get_inventory_index
+
+        # Barcode match (Full match); fills the barcode cache for the next scan
+        if term.isdigit() and len(term) >= 8:
+            med = Medicine.lookup_barcode(term)
+            if med:
+                return 'barcode', med
+
+        index = get_inventory_index()
+        # Real-time Filter (in-memory index), then authoritative stock for the shown rows only
+        results = index.search(term, limit=50)
+        stock = Medicine.get_stock_levels(r['id'] for r in results)
+        for r in results:
+            r['stock_qty'] = stock.get(r['id'], r['stock_qty'])
+        return 'list', results
+
+    def show_search_result(self, term, result):
+        if term != self.search_input.text().strip():
+            return  # the box changed while the query ran
+        kind, payload = result
+        if kind == 'barcode':
+            self.add_to_cart(payload['medicine_name'], payload['price'], payload['id'])
+            self.search_input.clear()
+        else:
+            self.update_inventory_list(payload)
 
     def refresh_inventory_list(self):
+        # Browse the catalogue a page at a time instead of loading it whole
+        self.executor.cancel('billing.search')
+        self.product_model.browse(self.catalogue_pager)
+
+    def on_inventory_changed(self, ids):
+        """inventory.changed: re-reads only the changed products that are on screen."""
         from database.models import Medicine
-        self.update_inventory_list(Medicine.get_all())
+        shown = set(self.product_model.product_ids())
+        ids = [i for i in ids if i in shown]
+        if ids:
+            self.executor.submit(Medicine.find_by_ids, ids, self.catalogue_pager.columns).then(
+                self.product_model.patch_rows)
 
     def update_inventory_list(self, products):
-        # Clear layout
-        while self.list_v.count() > 1:
-            item = self.list_v.takeAt(0)
-            if item.widget(): item.widget().deleteLater()
-            
-        for prod in products:
-            row = ProductRow(prod['medicine_name'], prod['price'], prod['stock_qty'], self.add_to_cart)
-            row.inventory_id = prod['id']
-            self.list_v.insertWidget(self.list_v.count()-1, row)
-
-    def add_to_cart(self, name, price):
-        if name in self.cart_data:
-            self.cart_data[name][1] += 1
+        self.product_model.set_products(products)
+
+    def on_product_clicked(self, index):
+        prod = index.data(ProductListModel.ProductRole)
+        if prod:
+            self.add_to_cart(prod['medicine_name'], prod['price'], prod['id'])
+
+    def add_to_cart(self, name, price, inventory_id):
+        if self.sale_pending:
+            return  # inputs are locked until the running checkout lands
+        # The inventory id is captured here so checkout never maps names back to rows
+        line, created = self.cart.add(inventory_id, name, price)
+        if created:
+            widget = CartItem(inventory_id, line.name, line.price, line.qty, self.change_cart_qty)
+            self.cart_v.insertWidget(self.cart_v.count()-1, widget)
+            self.cart_widgets[inventory_id] = widget
         else:
-            self.cart_data[name] = [price, 1]
-        self.update_cart_ui()
+            self.cart_widgets[inventory_id].set_qty(line.qty)
+        self.refresh_totals()
 
-    def update_cart_ui(self, remove=None):
-        if remove:
-            if remove in self.cart_data: del self.cart_data[remove]
-            
-        # Clear layout
-        while self.cart_v.count() > 1:
-            item = self.cart_v.takeAt(0)
-            if item.widget(): item.widget().deleteLater()
-            
-        subtotal = 0
-        for name, (price, qty) in self.cart_data.items():
-            item_widget = CartItem(name, price, qty, self.update_cart_ui)
-            self.cart_v.insertWidget(self.cart_v.count()-1, item_widget)
-            subtotal += price * qty
-            
-        tax = subtotal * 0.12 # GST as configured (12%)
-        
-        # Discount Logic
-        discount = 0
-        try:
-            p_val = self.discount_input_percent.text()
-            if p_val:
-                discount += (subtotal * float(p_val) / 100)
-            
-            f_val = self.discount_input_fixed.text()
-            if f_val:
-                discount += float(f_val)
-        except: pass
-        
-        total = subtotal + tax - discount
-        if total < 0: total = 0
-        
+    def change_cart_qty(self, inventory_id, delta):
+        if self.sale_pending:
+            return
+        line = self.cart.change_qty(inventory_id, delta)
+        if line is None:
+            widget = self.cart_widgets.pop(inventory_id, None)
+            if widget:
+                self.cart_v.removeWidget(widget)
+                widget.deleteLater()
+        else:
+            self.cart_widgets[inventory_id].set_qty(line.qty)
+        self.refresh_totals()
+
+    def clear_cart(self):
+        self.cart.clear()
+        for widget in self.cart_widgets.values():
+            self.cart_v.removeWidget(widget)
+            widget.deleteLater()
+        self.cart_widgets = {}
+        self.refresh_totals()
+
+    def get_discount_inputs(self):
+        """(percent, fixed) from the discount boxes; unparsable input counts as 0"""
+        values = []
+        for box in (self.discount_input_percent, self.discount_input_fixed):
+            try:
+                values.append(float(box.text()) if box.text() else 0.0)
+            except ValueError:
+                values.append(0.0)
+        return tuple(values)
+
+    def refresh_totals(self):
+        subtotal, tax, discount, total = self.cart.totals(*self.get_discount_inputs())
         self.sub_lbl.setText(f"Rs. {subtotal:.2f}")
         self.tax_lbl.setText(f"Rs. {tax:.2f}")
         self.discount_lbl.setText(f"- Rs. {discount:.2f}")
         self.total_lbl.setText(f"Rs. {total:.2f}")
-        self.complete_btn.setEnabled(len(self.cart_data) > 0)
+        self.complete_btn.setEnabled(len(self.cart) > 0 and not self.sale_pending)
 
     def complete_sale(self):
-        try:
-            from database.models import Sale, Customer, AuditLog
-            
-            subtotal = sum(p[0]*p[1] for p in self.cart_data.values())
-            tax = subtotal * 0.12
-            
-            discount = 0
-            try:
-                p_val = self.discount_input_percent.text()
-                if p_val: discount += (subtotal * float(p_val) / 100)
-                f_val = self.discount_input_fixed.text()
-                if f_val: discount += float(f_val)
-            except: pass
-            
-            total = subtotal + tax - discount
-            if total < 0: total = 0
-            
-            # 1. Handle Customer
-            c_name = self.cust_name.text().strip() or "Walk-in Customer"
-            c_phone = self.cust_phone.text().strip() or None
-            c_address = self.cust_address.text().strip() or None
-            
-            cust = Customer.find_or_create(c_name, c_phone, c_address)
-            
-            # 2. Prepare items for model (inventory_id, quantity, unit_price, subtotal)
-            sale_items = []
-            from database.models import Medicine
-            all_meds = {m['medicine_name']: m['id'] for m in Medicine.get_all()}
-            
-            for name, (price, qty) in self.cart_data.items():
-                med_id = all_meds.get(name)
-                if med_id:
-                    sale_items.append((med_id, qty, price, price * qty))
-
-            # 3. Create Sale in DB
-            bill_no = self.bill_no_lbl.text()
-            user_id = 1 
-            
-            sale_id = Sale.create_transaction(
-                bill_no, 
-                user_id, 
-                cust['id'], 
-                sale_items, 
-                (subtotal, tax, total),
-                discount=discount
-            )
-            
-            # 4. Log Action
-            AuditLog.log(user_id, "SALE_COMPLETE", "BILLING", f"Processed Bill {bill_no}")
-
-            # 5. Show Preview
-            bill_data = {
-                "bill_no": bill_no,
-                "date": datetime.now().strftime("%Y-%m-%d"),
-                "customer_name": cust['name'],
-                "items": [(n, p[0], p[1], p[0]*p[1]) for n, p in self.cart_data.items()],
-                "subtotal": subtotal,
-                "discount": discount,
-                "gst": tax,
-                "total": total
-            }
-            from gui.bill_preview_window import BillPreviewWindow
-            self.preview = BillPreviewWindow(self, bill_data)
-            self.preview.show()
-            
-            # Clear cart on success
-            self.cart_data = {}
-            self.cust_name.clear()
-            self.cust_phone.clear()
-            self.cust_address.clear()
-            self.update_cart_ui()
-            
-        except Exception as e:
-            import traceback
-            print(traceback.format_exc())
-            QMessageBox.critical(self, "Error", f"Failed to record sale: {e}")
+        subtotal, tax, discount, total = self.cart.totals(*self.get_discount_inputs())
+
+        # 1. Customer details
+        c_name = self.cust_name.text().strip() or "Walk-in Customer"
+        c_phone = self.cust_phone.text().strip() or None
+        c_address = self.cust_address.text().strip() or None
+
+        # 2. Prepare items for model (inventory_id, quantity, unit_price, subtotal)
+        sale_items = self.cart.sale_items()
+        bill_no = self.bill_no_lbl.text()
+        user_id = 1
+        bill_data = {
+            "bill_no": bill_no,
+            "date": datetime.now().strftime("%Y-%m-%d"),
+            "customer_name": c_name,
+            "items": [(l.name, l.price, l.qty, l.amount) for l in self.cart],
+            "subtotal": subtotal,
+            "discount": discount,
+            "gst": tax,
+            "total": total
+        }
+
+        # 3. Record it off the GUI thread; the cart and customer inputs stay locked until it lands,
+        # so nothing entered meanwhile is cleared with the finished sale
+        self.sale_pending = True
+        self.set_sale_inputs_enabled(False)
+        self.complete_btn.setEnabled(False)
+        self.complete_btn.setText("Processing...")
+        self.executor.submit(self.record_sale, bill_no, user_id, (c_name, c_phone, c_address),
+                             sale_items, (subtotal, tax, total), discount).then(
+            lambda cust: self.on_sale_recorded(bill_data, cust),
+            self.on_sale_failed)
+
+    @staticmethod
+    def record_sale(bill_no, user_id, customer, sale_items, totals, discount):
+        """Worker-thread half of checkout; returns the customer row."""
+        from database.models import Sale, Customer, AuditLog
+        cust = Customer.find_or_create(*customer)
+        Sale.create_transaction(bill_no, user_id, cust['id'], sale_items, totals, discount=discount)
+        AuditLog.log(user_id, "SALE_COMPLETE", "BILLING", f"Processed Bill {bill_no}")
+        return cust
+
+    def set_sale_inputs_enabled(self, enabled):
+        for widget in (self.search_input, self.product_view, self.cart_container, self.cust_name,
+                       self.cust_phone, self.cust_address, self.discount_input_percent, self.discount_input_fixed):
+            widget.setEnabled(enabled)
+
+    def on_sale_recorded(self, bill_data, cust):
+        self.sale_pending = False
+        self.set_sale_inputs_enabled(True)
+        self.complete_btn.setText("COMPLETE SALE →")
+
+        bill_data["customer_name"] = cust['name']
+        # The sale is committed; the receipt prints in the background
+        from config import PRINTER_CONFIG
+        if PRINTER_CONFIG.get('auto_print'):
+            from services.printer_service import get_printer
+            self.print_jobs.add(get_printer().submit(bill_data).id)
+
+        # Show Preview
+        from gui.bill_preview_window import BillPreviewWindow
+        self.preview = BillPreviewWindow(self, bill_data)
+        self.preview.show()
+
+        # Clear cart on success
+        self.clear_cart()
+        self.cust_name.clear()
+        self.cust_phone.clear()
+        self.cust_address.clear()
+
+    def on_print_finished(self, job):
+        if job.id not in self.print_jobs:
+            return
+        self.print_jobs.discard(job.id)
+        if job.status == 'failed':
+            QMessageBox.warning(self, "Printer", f"Receipt for {job.bill_no} could not be printed.\n\n{job.error}\n\n"
+                                "Use Print Receipt on the invoice preview to try again.")
+
+    def on_sale_failed(self, error):
+        self.sale_pending = False
+        self.set_sale_inputs_enabled(True)
+        self.complete_btn.setText("COMPLETE SALE →")
+        self.refresh_totals()
+        QMessageBox.critical(self, "Error", f"Failed to record sale: {error}")
 
     def handle_logout(self):
         reply = QMessageBox.question(self, 'Logout', 'Are you sure you want to logout?',
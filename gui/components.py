@@ -148,11 +148,79 @@ class EnhancedMetricCard(QFrame):
         
         bottom_row.addStretch()
         
-        self.change_label = QLabel(change)
+        self.change_label = QLabel()
         self.change_label.setFont(Theme.get_font(11, QFont.Bold))
-        # Logic to determine color based on '+' or '-'
-        c_color = "#10B981" if "+" in change else "#EF4444"
-        self.change_label.setStyleSheet(f"color: {c_color}; background: transparent; border: none;")
+        self.set_change(change)
         bottom_row.addWidget(self.change_label)
         
         layout.addLayout(bottom_row)
+
+    def set_value(self, value, change=None):
+        """Updates the figures in place (live dashboard refresh)."""
+        self.val_label.setText(value)
+        if change is not None:
+            self.set_change(change)
+
+    def set_change(self, change):
+        self.change_label.setText(change)
+        # Logic to determine color based on '+' or '-'
+        c_color = "#10B981" if "+" in change else "#EF4444"
+        self.change_label.setStyleSheet(f"color: {c_color}; background: transparent; border: none;")
+
+
+class ExcelExportButton(ModernButton):
+    """Asks for a file name, then streams an Excel export in the background.
+
+    `prepare` runs on the GUI thread when the export starts, so it may read
+    widgets (date filters...); it returns a callable that the worker thread
+    runs to build the services.excel_exporter SheetSpecs, which must only
+    use plain values captured from those widgets. `default_name` may be a
+    callable for names that depend on the current filter. The button shows
+    progress while the export runs; clicking it again cancels.
+    """
+    def __init__(self, text, prepare, default_name="export.xlsx", parent=None):
+        super().__init__(text, primary=False, parent=parent)
+        self.label = text
+        self.prepare = prepare
+        self.default_name = default_name
+        self.job = None
+        self.clicked.connect(self.on_clicked)
+
+    def on_clicked(self):
+        from PySide6.QtWidgets import QFileDialog
+        if self.job is not None:
+            self.job.cancel()
+            return
+        name = self.default_name() if callable(self.default_name) else self.default_name
+        path, _ = QFileDialog.getSaveFileName(self, "Export to Excel", name, "Excel Workbook (*.xlsx)")
+        if not path:
+            return
+        if not path.lower().endswith('.xlsx'):
+            path += '.xlsx'
+        self.start_export(path)
+
+    def start_export(self, path):
+        from services.excel_exporter import ExcelExportJob
+        self.job = ExcelExportJob(path, self.prepare(), parent=self)
+        self.job.progress.connect(self.on_progress)
+        self.job.finished.connect(self.on_finished)
+        self.job.failed.connect(self.on_failed)
+        self.setText("Exporting...")
+        self.job.start()
+
+    def on_progress(self, done, total):
+        self.setText(f"Exporting {done * 100 // total}%" if total else f"Exporting {done:,} rows")
+
+    def on_finished(self, path, rows):
+        from PySide6.QtWidgets import QMessageBox
+        self.job = None
+        self.setText(self.label)
+        QMessageBox.information(self, "Export", f"Exported {rows:,} rows to:\n{path}")
+
+    def on_failed(self, e):
+        from PySide6.QtWidgets import QMessageBox
+        from services.excel_exporter import ExportCancelled
+        self.job = None
+        self.setText(self.label)
+        if not isinstance(e, ExportCancelled):
+            QMessageBox.critical(self, "Export Error", f"Could not export to Excel.\n\nError: {e}")
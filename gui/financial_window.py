@@ -4,7 +4,10 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
 from PySide6.QtCore import Qt, QDate
 from PySide6.QtGui import QFont, QColor
 from utils.theme import Theme
-from gui.components import ModernButton, GlassCard as GlobalGlassCard
+from gui.components import ModernButton, GlassCard as GlobalGlassCard, ExcelExportButton
+from services.query_executor import get_executor
+from services.gui_events import gui_events
+from database.events import SALE_COMPLETED
 
 class FinancialSummaryCard(QFrame):
     def __init__(self, title, value, color=None, parent=None):
@@ -52,6 +55,8 @@ class FinancialOverviewWindow(QWidget):
         
         self.init_ui()
         self.apply_filter("today")
+        # New sales are added to the open report instead of reloading it
+        gui_events().subscribe(SALE_COMPLETED, self.on_sale_completed, owner=self)
 
     def init_ui(self):
         main_layout = QVBoxLayout(self)
@@ -236,42 +241,75 @@ class FinancialOverviewWindow(QWidget):
         self.load_data(start.toString("yyyy-MM-dd"), end.toString("yyyy-MM-dd"))
 
     def load_data(self, start_str, end_str):
+        # Queried on a worker; switching filters again drops the older result
+        get_executor().submit(self.fetch_data, start_str, end_str, key='financial.load').then(
+            self.show_data, self.show_load_error)
+
+    @staticmethod
+    def fetch_data(start_str, end_str):
+        from database.models import Sale
+        return Sale.get_summary_stats(start_str, end_str), Sale.get_report(start_str, end_str)
+
+    def show_data(self, result):
+        stats, data = result
         try:
-            from database.models import Sale
-            
             # 1. Load Stats
-            stats = Sale.get_summary_stats(start_str, end_str)
-            self.card_revenue.v_lbl.setText(f"Rs. {stats['revenue']:.2f}")
-            self.card_tax.v_lbl.setText(f"Rs. {stats['tax']:.2f}")
-            self.card_discount.v_lbl.setText(f"Rs. {stats['discount']:.2f}")
-            self.card_orders.v_lbl.setText(str(stats['count']))
+            self.show_stats(stats)
             
             # 2. Load Table
-            data = Sale.get_report(start_str, end_str)
             self.table.setRowCount(0)
             for row_data in data:
-                row = self.table.rowCount()
-                self.table.insertRow(row)
-                
-                items = [
-                    row_data['bill_no'],
-                    row_data['created_at'].strftime("%Y-%m-%d %H:%M"),
-                    row_data['customer_name'] or "Walk-in",
-                    row_data['cashier_name'],
-                    f"Rs. {row_data['total_amount']:.2f}",
-                    f"Rs. {row_data['tax_amount']:.2f}",
-                    f"Rs. {row_data['grand_total']:.2f}"
-                ]
-                
-                for col, text in enumerate(items):
-                    item = QTableWidgetItem(str(text))
-                    item.setTextAlignment(Qt.AlignCenter)
-                    self.table.setItem(row, col, item)
+                self.insert_sale_row(self.table.rowCount(), row_data)
                     
         except Exception as e:
-            import traceback
-            traceback.print_exc()
-            QMessageBox.critical(self, "Load Error", f"Could not load sales data.\n\nError: {e}")
+            self.show_load_error(e)
+
+    def show_stats(self, stats):
+        self.stats = stats
+        self.card_revenue.v_lbl.setText(f"Rs. {stats['revenue']:.2f}")
+        self.card_tax.v_lbl.setText(f"Rs. {stats['tax']:.2f}")
+        self.card_discount.v_lbl.setText(f"Rs. {stats['discount']:.2f}")
+        self.card_orders.v_lbl.setText(str(stats['count']))
+
+    def insert_sale_row(self, row, row_data):
+        self.table.insertRow(row)
+        items = [
+            row_data['bill_no'],
+            row_data['created_at'].strftime("%Y-%m-%d %H:%M"),
+            row_data['customer_name'] or "Walk-in",
+            row_data['cashier_name'],
+            f"Rs. {row_data['total_amount']:.2f}",
+            f"Rs. {row_data['tax_amount']:.2f}",
+            f"Rs. {row_data['grand_total']:.2f}"
+        ]
+        for col, text in enumerate(items):
+            item = QTableWidgetItem(str(text))
+            item.setTextAlignment(Qt.AlignCenter)
+            self.table.setItem(row, col, item)
+
+    def on_sale_completed(self, sale_id):
+        # Only a range that includes today can gain the new sale
+        today = QDate.currentDate()
+        if not hasattr(self, 'stats') or not (self.start_date.date() <= today <= self.end_date.date()):
+            return
+        from database.models import Sale
+        get_executor().submit(Sale.get_report_row, sale_id).then(self.add_sale)
+
+    def add_sale(self, row_data):
+        if not row_data:
+            return
+        # Newest first, same as the report query
+        self.insert_sale_row(0, row_data)
+        stats = dict(self.stats)
+        stats['count'] += 1
+        stats['subtotal'] += float(row_data['total_amount'] or 0)
+        stats['tax'] += float(row_data['tax_amount'] or 0)
+        stats['discount'] += float(row_data['discount_amount'] or 0)
+        stats['revenue'] += float(row_data['grand_total'] or 0)
+        self.show_stats(stats)
+
+    def show_load_error(self, e):
+        QMessageBox.critical(self, "Load Error", f"Could not load sales data.\n\nError: {e}")
 
     def export_report(self):
         try:
@@ -309,6 +347,41 @@ class FinancialOverviewWindow(QWidget):
         self.export_btn.clicked.connect(self.export_report)
         layout.addWidget(self.export_btn)
 
+        # Streams the whole selected range from the database, not just the table on screen
+        self.excel_btn = ExcelExportButton("Export Excel", self.build_export_sheets, self.export_file_name)
+        self.excel_btn.setFixedWidth(180)
+        layout.addWidget(self.excel_btn)
+
+        # Audit trail for the same range (this window is admin-only)
+        self.audit_btn = ExcelExportButton("Export Audit Log", self.build_audit_export_sheets,
+                                           lambda: "audit_{}_to_{}.xlsx".format(*self.export_range()))
+        self.audit_btn.setFixedWidth(180)
+        layout.addWidget(self.audit_btn)
+
+    def export_range(self):
+        return self.start_date.date().toString("yyyy-MM-dd"), self.end_date.date().toString("yyyy-MM-dd")
+
+    def export_file_name(self):
+        start, end = self.export_range()
+        return f"sales_{start}_to_{end}.xlsx"
+
+    def build_export_sheets(self):
+        # Read the date pickers here on the GUI thread; the worker only gets the strings
+        start, end = self.export_range()
+
+        def build():
+            from services.excel_exporter import sales_sheet
+            return [sales_sheet(start, end)]
+        return build
+
+    def build_audit_export_sheets(self):
+        start, end = self.export_range()
+
+        def build():
+            from services.excel_exporter import audit_sheet
+            return [audit_sheet(start, end)]
+        return build
+
 if __name__ == "__main__":
     from PySide6.QtWidgets import QApplication
     app = QApplication(sys.argv)
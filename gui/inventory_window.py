@@ -2,13 +2,318 @@ import sys
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QLineEdit, QPushButton, QTableWidget, QTableWidgetItem, 
                              QHeaderView, QFrame, QGraphicsDropShadowEffect, QScrollArea,
-                             QCheckBox, QComboBox, QSpacerItem, QSizePolicy)
-from PySide6.QtCore import Qt, QSize
+                             QCheckBox, QComboBox, QSpacerItem, QSizePolicy, QTableView)
+from PySide6.QtCore import Qt, QSize, QAbstractTableModel, QModelIndex, QTimer
 from PySide6.QtGui import QFont, QColor, QIcon
-from datetime import datetime
+from datetime import date, datetime
 
 from utils.theme import Theme
-from gui.components import ModernButton
+from gui.components import ModernButton, ExcelExportButton
+from services.paging import InventoryPager
+from services.query_executor import get_executor, ImmediateExecutor
+from services.gui_events import gui_events
+from database.events import INVENTORY_CHANGED
+
+class InventoryTableModel(QAbstractTableModel):
+    """Read-only inventory table over a compact column store.
+
+    Display strings, sort keys and highlight flags are computed once per
+    row as rows arrive. With a pager the catalogue is read a page at a time
+    as the view scrolls (canFetchMore/fetchMore), and filters and sorting
+    are sent to the database, so only the pages scrolled through are ever
+    held. Without one, filtering and sorting only rebuild the list of
+    visible store rows.
+    """
+    HEADERS = ["Medicine Name", "Strength", "Form", "Category", "Company", "Batch", "Expiry", "Stock", "Price"]
+    FIELDS = ['medicine_name', 'strength', 'form', 'category', 'company', 'batch_no']
+    SORT_FIELDS = FIELDS + ['expiry_date', 'stock_qty', 'price']   # per column, for Medicine.page(order_by=...)
+    EXPIRY_COL, STOCK_COL, PRICE_COL = 6, 7, 8
+    LOW_STOCK = 10
+
+    def __init__(self, parent=None, pager=None, executor=None):
+        super().__init__(parent)
+        self.alert_color = QColor("#EF4444")
+        self.alert_font = QFont("Inter", 10, QFont.Bold)
+        self.align = int(Qt.AlignCenter)
+        self.pager = pager
+        self.executor = executor or ImmediateExecutor()  # reads pages off the GUI thread
+        self._loading = None      # in-flight page request
+        self.filter_text = ''
+        self.filter_category = None
+        self.filter_company = None
+        self.sort_column, self.sort_order = -1, Qt.AscendingOrder
+        self._clear_columns()
+
+    def _clear_columns(self):
+        self.ids = []
+        self.row_of = {}      # inventory id -> store row
+        self.unordered = False  # rows were patched in from events; store order is no longer the sort order
+        self.columns = [[] for _ in self.HEADERS]
+        self.sort_keys = {self.EXPIRY_COL: [], self.STOCK_COL: [], self.PRICE_COL: []}
+        self.expired = []
+        self.low_stock = []
+        self.haystack = []    # lower-cased text for filtering, built once per row
+        self.order = []       # store rows in sort order
+        self.rows = []        # visible store rows, in sort order
+
+    def _extend_columns(self, data):
+        today = date.today()
+        # A row patched in from an event may arrive again with a later page
+        data = [r for r in data if r.get('id') not in self.row_of]
+        start = len(self.ids)
+        self.row_of.update((r.get('id'), start + i) for i, r in enumerate(data))
+        self.ids.extend(r.get('id') for r in data)
+        for col, field in enumerate(self.FIELDS):
+            self.columns[col].extend(r.get(field) or '' for r in data)
+        expiry = [self._as_date(r.get('expiry_date')) for r in data]
+        stock = [int(r.get('stock_qty') or 0) for r in data]
+        price = [float(r.get('price') or 0) for r in data]
+        self.columns[self.EXPIRY_COL].extend(str(d) if d else '' for d in expiry)
+        self.columns[self.STOCK_COL].extend(str(q) for q in stock)
+        self.columns[self.PRICE_COL].extend(f"{p:.2f}" for p in price)
+        self.sort_keys[self.EXPIRY_COL].extend(d or date.max for d in expiry)
+        self.sort_keys[self.STOCK_COL].extend(stock)
+        self.sort_keys[self.PRICE_COL].extend(price)
+        self.expired.extend(bool(d and d < today) for d in expiry)
+        self.low_stock.extend(q < self.LOW_STOCK for q in stock)
+        self.haystack.extend(self._haystack(start + i, r) for i, r in enumerate(data))
+        return range(start, len(self.ids))
+
+    def _haystack(self, i, row):
+        return " ".join(str(c[i]) for c in self.columns[:len(self.FIELDS)]).lower() + " " + (row.get('barcode') or '').lower()
+
+    def _set_row(self, i, r):
+        """Overwrites store row i with fresh values for the same id."""
+        for col, field in enumerate(self.FIELDS):
+            self.columns[col][i] = r.get(field) or ''
+        d = self._as_date(r.get('expiry_date'))
+        q = int(r.get('stock_qty') or 0)
+        p = float(r.get('price') or 0)
+        self.columns[self.EXPIRY_COL][i] = str(d) if d else ''
+        self.columns[self.STOCK_COL][i] = str(q)
+        self.columns[self.PRICE_COL][i] = f"{p:.2f}"
+        self.sort_keys[self.EXPIRY_COL][i] = d or date.max
+        self.sort_keys[self.STOCK_COL][i] = q
+        self.sort_keys[self.PRICE_COL][i] = p
+        self.expired[i] = bool(d and d < date.today())
+        self.low_stock[i] = q < self.LOW_STOCK
+        self.haystack[i] = self._haystack(i, r)
+
+    def upsert_rows(self, rows):
+        """Patches changed rows in place and adds new ones that fall inside the loaded pages.
+
+        Returns the number of rows added. Rows past the last loaded page are
+        left for fetchMore to bring in.
+        """
+        changed, added = [], []
+        for r in rows:
+            i = self.row_of.get(r['id'])
+            if i is not None:
+                self._set_row(i, r)
+                changed.append(i)
+            elif self.pager is None or self.pager.covers(r):
+                added.append(r)
+        if added:
+            self._extend_columns(added)
+        if added or changed:
+            # A new or edited row may belong elsewhere in the order, or no longer match the filter
+            self.unordered = True
+            self._sort_order()
+            self._show(self._filter(self.order))
+            position = {store_row: pos for pos, store_row in enumerate(self.rows)}
+            for i in changed:
+                pos = position.get(i)
+                if pos is not None:
+                    self.dataChanged.emit(self.index(pos, 0), self.index(pos, self.columnCount() - 1))
+        return len(added)
+
+    def _show(self, rows):
+        """Moves the view to `rows` with row-level signals, so selection and persistent indexes keep their rows."""
+        keep = set(rows)
+        for pos in range(len(self.rows) - 1, -1, -1):
+            if self.rows[pos] not in keep:
+                self.beginRemoveRows(QModelIndex(), pos, pos)
+                del self.rows[pos]
+                self.endRemoveRows()
+        shown = set(self.rows)
+        survivors = [r for r in rows if r in shown]
+        if survivors != self.rows:
+            self.layoutAboutToBeChanged.emit()
+            old = self.persistentIndexList()
+            position = {r: pos for pos, r in enumerate(survivors)}
+            new = [self.index(position[self.rows[i.row()]], i.column()) for i in old]
+            self.rows = survivors
+            self.changePersistentIndexList(old, new)
+            self.layoutChanged.emit()
+        for pos, r in enumerate(rows):
+            if pos >= len(self.rows) or self.rows[pos] != r:
+                self.beginInsertRows(QModelIndex(), pos, pos)
+                self.rows.insert(pos, r)
+                self.endInsertRows()
+
+    @staticmethod
+    def _as_date(value):
+        if isinstance(value, date):
+            return value
+        if value:
+            try:
+                return date.fromisoformat(str(value)[:10])
+            except ValueError:
+                return None
+        return None
+
+    def load(self, data):
+        """Replaces the contents with `data`, already in name order."""
+        self.beginResetModel()
+        self._clear_columns()
+        self._extend_columns(data)
+        self._sort_order()
+        self._compute_rows()
+        self.endResetModel()
+
+    def reload(self):
+        """Drops loaded rows and reads the first page again from the pager."""
+        self._cancel_loading()
+        self.pager.reset()
+        self.load([])
+        self._request(self.pager.fetch, None, self._first_page)
+
+    # --- Lazy loading ------------------------------------------------------
+    def _request(self, fn, after, on_rows):
+        # Assign before then(): an inline executor delivers (and clears _loading) immediately
+        self._loading = self.executor.submit(fn, after)
+        self._loading.then(on_rows, self._load_failed)
+
+    def _cancel_loading(self):
+        if self._loading is not None:
+            self._loading.cancel()
+        self._loading = None
+
+    def _load_failed(self, error):
+        self._loading = None
+        print(f"Error loading inventory page: {error}")
+
+    def _first_page(self, rows):
+        self._loading = None
+        self.pager.advance(rows)
+        self.load(rows)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.pager is not None and self.pager.has_more()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self._loading is None and self.canFetchMore(parent):
+            self._request(self.pager.fetch, self.pager.after, self._append_page)
+
+    def _append_page(self, rows):
+        self._loading = None
+        self.pager.advance(rows)
+        new = self._extend_columns(rows)
+        # Pages arrive in sort order, after every row loaded so far, so they simply append
+        self.order.extend(new)
+        visible = self._filter(new)
+        if visible:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(visible) - 1)
+            self.rows.extend(visible)
+            self.endInsertRows()
+
+    # --- Qt model API --------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        row, col = self.rows[index.row()], index.column()
+        if role == Qt.DisplayRole:
+            return self.columns[col][row]
+        if role == Qt.TextAlignmentRole:
+            return self.align
+        if role == Qt.ForegroundRole:
+            if (col == self.STOCK_COL and self.low_stock[row]) or (col == self.EXPIRY_COL and self.expired[row]):
+                return self.alert_color
+        elif role == Qt.FontRole:
+            if col == self.STOCK_COL and self.low_stock[row]:
+                return self.alert_font
+        return None
+
+    def values(self, field):
+        return self.columns[self.FIELDS.index(field)]
+
+    # --- Filtering / sorting -------------------------------------------------
+    def has_filter(self):
+        return bool(self.filter_text) or self.filter_category is not None or self.filter_company is not None
+
+    def _filter(self, rows):
+        text = self.filter_text
+        category, company = self.filter_category, self.filter_company
+        if text:
+            haystack = self.haystack
+            rows = [i for i in rows if text in haystack[i]]
+        if category is not None:
+            cats = self.values('category')
+            rows = [i for i in rows if cats[i] == category]
+        if company is not None:
+            comps = self.values('company')
+            rows = [i for i in rows if comps[i] == company]
+        return list(rows)
+
+    def _compute_rows(self):
+        self.rows = self._filter(self.order)
+
+    def set_filter(self, text=None, category=False, company=False):
+        """Text / category / company filter. False leaves a criterion unchanged, None clears it.
+
+        With a pager the filter runs in SQL and the first matching page is read again.
+        """
+        if text is not None: self.filter_text = text.lower().strip()
+        if category is not False: self.filter_category = category
+        if company is not False: self.filter_company = company
+        if self.pager is not None:
+            self._query_pager()
+            return
+        self.beginResetModel()
+        self._compute_rows()
+        self.endResetModel()
+
+    def _query_pager(self):
+        self.pager.set_query(text=self.filter_text, category=self.filter_category, company=self.filter_company,
+                             order_by=self.SORT_FIELDS[self.sort_column] if self.sort_column >= 0 else 'medicine_name',
+                             descending=self.sort_column >= 0 and self.sort_order == Qt.DescendingOrder)
+        self.reload()
+
+    def _sort_order(self):
+        if not self.unordered and (self.pager is not None or self.sort_column < 0):
+            # Rows arrived in the order the pager asked the database for (or in name order)
+            self.order = list(range(len(self.ids)))
+            return
+        ids = self.ids
+        if self.sort_column < 0:
+            names = self.columns[0]
+            self.order = sorted(range(len(ids)), key=lambda i: (str(names[i]).lower(), ids[i]))
+            return
+        keys = self.sort_keys.get(self.sort_column)
+        if keys is None:
+            keys = [str(v).lower() for v in self.columns[self.sort_column]]
+        self.order = sorted(range(len(ids)), key=lambda i: (keys[i], ids[i]),
+                            reverse=(self.sort_order == Qt.DescendingOrder))
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        if column < 0:
+            return
+        self.sort_column, self.sort_order = column, order
+        if self.pager is not None:
+            self._query_pager()
+            return
+        self._sort_order()
+        self._show(self._filter(self.order))
 
 class InventoryWindow(QWidget):
     def __init__(self, parent=None):
@@ -54,9 +359,27 @@ class InventoryWindow(QWidget):
         self.search_input.setPlaceholderText("Search medicines, categories, companies...")
         self.search_input.setStyleSheet("border: none; background: transparent;")
         self.search_input.setFont(Theme.get_font(12))
-        self.search_input.textChanged.connect(self.search)
+        # Each search reads from the database; wait for a pause in typing
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.search)
+        self.search_input.textChanged.connect(lambda: self.search_timer.start(150))
         s_layout.addWidget(self.search_input)
         header_row.addWidget(search_container)
+
+        # Category / company filters
+        combo_style = f"background: {Theme.BG_MAIN.name()}; border: 1px solid {Theme.BORDER.name()}; border-radius: 8px; padding: 6px 10px; color: {Theme.TEXT_MAIN.name()};"
+        self.cat_combo = QComboBox()
+        self.cat_combo.setStyleSheet(combo_style)
+        self.cat_combo.setMinimumWidth(160)
+        self.cat_combo.currentIndexChanged.connect(self.filter_data)
+        header_row.addWidget(self.cat_combo)
+
+        self.company_combo = QComboBox()
+        self.company_combo.setStyleSheet(combo_style)
+        self.company_combo.setMinimumWidth(160)
+        self.company_combo.currentIndexChanged.connect(self.filter_data)
+        header_row.addWidget(self.company_combo)
         
         header_row.addStretch()
         
@@ -68,11 +391,23 @@ class InventoryWindow(QWidget):
         
         tl.addLayout(header_row)
         
-        self.table = QTableWidget()
-        self.table.setColumnCount(9)
-        self.table.setHorizontalHeaderLabels(["Medicine Name", "Strength", "Form", "Category", "Company", "Batch", "Expiry", "Stock", "Price"])
+        self.total_items = 0
+        self.filtered_total = None   # rows matching the current filter, counted in the database
+        self.model = InventoryTableModel(self, pager=InventoryPager(), executor=get_executor())
+        # Pages arrive asynchronously; keep the count in step
+        self.model.modelReset.connect(self.update_stats)
+        self.model.rowsInserted.connect(self.update_stats)
+        self.model.rowsRemoved.connect(self.update_stats)
+        # Sales, stock edits and new medicines patch just the affected rows
+        gui_events().subscribe(INVENTORY_CHANGED, self.on_inventory_changed, owner=self)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        # Pages arrive ordered by name; no initial sort
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
         self.table.setStyleSheet(f"""
-            QTableWidget {{
+            QTableView {{
                 background: white;
                 border: none;
                 gridline-color: transparent;
@@ -80,11 +415,11 @@ class InventoryWindow(QWidget):
                 font-size: 13px;
                 outline: none;
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 15px;
                 border-bottom: 1px solid {Theme.BG_MAIN.name()};
             }}
-            QTableWidget::item:selected {{
+            QTableView::item:selected {{
                 background-color: {Theme.PRIMARY.name()};
                 color: white;
                 border: none;
@@ -103,22 +438,18 @@ class InventoryWindow(QWidget):
         self.table.verticalHeader().setVisible(False)
         self.table.setAlternatingRowColors(True)
         self.table.setShowGrid(False)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+        self.table.verticalHeader().setDefaultSectionSize(45)
         
         # Configure column resizing
         header = self.table.horizontalHeader()
         header.setMinimumSectionSize(80)
         header.setSectionResizeMode(QHeaderView.Interactive)
         header.setSectionResizeMode(0, QHeaderView.Stretch)          # Name
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents) # Strength
-        header.setSectionResizeMode(2, QHeaderView.ResizeToContents) # Form
-        header.setSectionResizeMode(3, QHeaderView.ResizeToContents) # Category
-        header.setSectionResizeMode(4, QHeaderView.ResizeToContents) # Company
-        header.setSectionResizeMode(7, QHeaderView.ResizeToContents) # Stock
-        header.setSectionResizeMode(8, QHeaderView.ResizeToContents) # Price
-        
-        self.table.setColumnWidth(0, 200)
+        # Fixed starting widths: ResizeToContents would measure every row on each reload
+        for col, width in ((1, 100), (2, 100), (3, 120), (4, 140), (5, 100), (6, 110), (7, 80), (8, 90)):
+            self.table.setColumnWidth(col, width)
         tl.addWidget(self.table)
         
         main_layout.addWidget(table_card)
@@ -126,83 +457,91 @@ class InventoryWindow(QWidget):
 
 
     def refresh_data(self):
-        try:
-            from database.models import Medicine
-            self.current_data = Medicine.get_all()
-            self.load_data(self.current_data)
-        except Exception as e:
-            print(f"Error refreshing inventory: {e}")
+        self.model.reload()
+        self.refresh_filtered_count()
+        # Catalogue size and filter choices come from the database, not the loaded pages
+        get_executor().submit(self._fetch_catalogue_info, key='inventory.info').then(
+            self._show_catalogue_info, lambda e: print(f"Error refreshing inventory: {e}"))
+
+    @staticmethod
+    def _fetch_catalogue_info():
+        from database.models import Medicine
+        return (Medicine.get_count(), Medicine.get_distinct_values('category'),
+                Medicine.get_distinct_values('company'))
+
+    def _show_catalogue_info(self, info):
+        self.total_items, categories, companies = info
+        self.populate_filter_combos(categories, companies)
+        self.update_stats()
+
+    def on_inventory_changed(self, ids):
+        from database.models import Medicine
+        get_executor().submit(Medicine.find_by_ids, ids).then(self.apply_changed_rows)
+
+    def apply_changed_rows(self, rows):
+        self.total_items += self.model.upsert_rows(rows)
+        if self.model.has_filter():
+            self.refresh_filtered_count()
+        self.update_stats()
 
     def load_data(self, data):
-        self.table.setRowCount(len(data))
-        for row, r_data in enumerate(data):
-            # Map dictionary fields to table columns
-            # ["Medicine Name", "Strength", "Form", "Category", "Company", "Batch", "Expiry", "Stock", "Price"]
-            fields = [
-                r_data.get('medicine_name', ''),
-                r_data.get('strength', ''),
-                r_data.get('form', ''),
-                r_data.get('category', ''),
-                r_data.get('company', ''),
-                r_data.get('batch_no', ''),
-                str(r_data.get('expiry_date', '')),
-                str(r_data.get('stock_qty', '0')),
-                f"{float(r_data.get('price', 0)):.2f}"
-            ]
-            
-            for col, val in enumerate(fields):
-                item = QTableWidgetItem(val)
-                item.setTextAlignment(Qt.AlignCenter)
-                
-                # Style critical values
-                if col == 7: # Stock
-                    try:
-                        stock_val = int(float(val))
-                        if stock_val < 10:
-                            item.setForeground(QColor("#EF4444")) # Urgent
-                            item.setFont(QFont("Inter", 10, QFont.Bold))
-                    except: pass
-                elif col == 6: # Expiry
-                    try:
-                        from datetime import date
-                        exp_date = r_data.get('expiry_date')
-                        if isinstance(exp_date, str):
-                            exp_date = datetime.strptime(exp_date, "%Y-%m-%d").date()
-                        
-                        if exp_date and exp_date < date.today():
-                            item.setForeground(QColor("#EF4444"))
-                    except Exception as ex: 
-                        print(f"Exp styling error: {ex}")
-                
-                self.table.setItem(row, col, item)
-        
-        self.stats_lbl.setText(f"Total Items: {len(data)}")
+        self.model.load(data)
+        self.total_items = len(data)
+        self.populate_filter_combos(sorted({v for v in self.model.values('category') if v}),
+                                    sorted({v for v in self.model.values('company') if v}))
+        self.update_stats()
 
-    def search(self):
-        query = self.search_input.text().lower().strip()
-        if not query:
-            self.refresh_data()
+    def update_stats(self):
+        shown = self.model.rowCount()
+        total = self.filtered_total if self.model.has_filter() else self.total_items
+        if total is not None:
+            # Later pages load as the table scrolls; report the size of the whole (filtered) catalogue
+            shown = max(shown, total)
+        self.stats_lbl.setText(f"Total Items: {shown}")
+
+    def refresh_filtered_count(self):
+        self.filtered_total = None
+        if not self.model.has_filter():
+            get_executor().cancel('inventory.count')
             return
-            
-        try:
-            from database.models import Medicine
-            filtered = Medicine.search(query)
-            self.load_data(filtered)
-        except Exception as e:
-            print(f"Search error: {e}")
+        from database.models import Medicine
+        get_executor().submit(Medicine.get_count, self.model.filter_text, self.model.filter_category,
+                              self.model.filter_company, key='inventory.count').then(
+            self._show_filtered_count, lambda e: print(f"Error counting inventory: {e}"))
+
+    def _show_filtered_count(self, count):
+        self.filtered_total = count
+        self.update_stats()
+
+    def populate_filter_combos(self, categories, companies):
+        for combo, values, label in ((self.cat_combo, categories, "All Categories"),
+                                     (self.company_combo, companies, "All Companies")):
+            current = combo.currentData()
+            combo.blockSignals(True)
+            combo.clear()
+            combo.addItem(label, None)
+            for value in values:
+                combo.addItem(value, value)
+            idx = combo.findData(current)
+            combo.setCurrentIndex(idx if idx >= 0 else 0)
+            combo.blockSignals(False)
+
+    def search(self):
+        # The database filters one page at a time; only the number of matches is counted in full
+        self.model.set_filter(text=self.search_input.text())
+        self.refresh_filtered_count()
+        self.update_stats()
 
     def filter_data(self):
-        selected_cats = [cat for cat, cb in self.cat_checks.items() if cb.isChecked()]
-        
-        if not hasattr(self, 'current_data') or not self.current_data:
-            return
+        self.model.set_filter(category=self.cat_combo.currentData(),
+                              company=self.company_combo.currentData())
+        self.refresh_filtered_count()
+        self.update_stats()
 
-        if not selected_cats:
-            self.load_data(self.current_data)
-            return
-            
-        filtered = [item for item in self.current_data if item.get('category') in selected_cats]
-        self.load_data(filtered)
+    @staticmethod
+    def build_export_sheets():
+        from services.excel_exporter import inventory_sheet
+        return lambda: [inventory_sheet()]
 
     def add_medicine(self):
         # Open the new PySide6 AddMedicineWindow
@@ -215,6 +554,10 @@ class InventoryWindow(QWidget):
             QMessageBox.critical(self, "Integration Error", f"Could not launch Add Medicine module.\n\nError: {e}")
 
     def setup_header_actions(self, layout):
+        self.excel_btn = ExcelExportButton("Export Excel", self.build_export_sheets,
+                                           lambda: f"inventory_{date.today()}.xlsx")
+        layout.addWidget(self.excel_btn)
+
         self.add_btn = ModernButton("+ Register Medicine")
         self.add_btn.setMinimumWidth(220)
         self.add_btn.clicked.connect(self.add_medicine)
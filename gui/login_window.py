@@ -1,7 +1,7 @@
 import sys
-import bcrypt
 from PySide6.QtWidgets import (QApplication, QWidget, QLabel, QLineEdit, QPushButton, QCheckBox,
-                             QVBoxLayout, QHBoxLayout, QMessageBox, QFrame, QGraphicsDropShadowEffect)
+                             QVBoxLayout, QHBoxLayout, QMessageBox, QFrame, QGraphicsDropShadowEffect,
+                             QProgressBar)
 from PySide6.QtCore import Qt, QSize, QPropertyAnimation, QPoint, QEasingCurve, QRect, QEvent
 from PySide6.QtGui import QFont, QColor, QLinearGradient, QPalette, QBrush, QPainter, QPen, QPixmap
 from database.connection import Database
@@ -231,7 +231,20 @@ class LoginWindow(QWidget):
             }}
         """)
         self.signin_btn.clicked.connect(self.login)
+        self.pass_input.returnPressed.connect(self.login)
         card_layout.addWidget(self.signin_btn)
+
+        # Busy indicator while the password is verified in the background
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 0)
+        self.progress.setFixedHeight(4)
+        self.progress.setTextVisible(False)
+        self.progress.setStyleSheet(f"""
+            QProgressBar {{ background: rgba(255, 255, 255, 0.1); border: none; border-radius: 2px; }}
+            QProgressBar::chunk {{ background: {Theme.PRIMARY_TEAL.name()}; border-radius: 2px; }}
+        """)
+        self.progress.hide()
+        card_layout.addWidget(self.progress)
         
         forgot_btn = QPushButton("Having trouble signing in?")
         forgot_btn.setFont(Theme.get_font(12))
@@ -257,32 +270,41 @@ class LoginWindow(QWidget):
         self.anim.start()
 
     def login(self):
+        if self.progress.isVisible():
+            return  # already verifying
         username = self.user_input.text().strip()
         password = self.pass_input.text().strip()
         
         if not username or not password:
             QMessageBox.warning(self, "Login Error", "Please enter both username and password.")
             return
-            
-        try:
-            from database.models import User
-            user = User.find_by_username(username)
-            
-            if user:
-                stored_hash = user['password_hash']
-                role = user['role']
-                
-                if isinstance(stored_hash, str):
-                    stored_hash = stored_hash.encode('utf-8')
-                
-                if bcrypt.checkpw(password.encode('utf-8'), stored_hash):
-                    self.accept_login(username, role)
-                else:
-                    QMessageBox.critical(self, "Login Failed", "Invalid username or password.")
-            else:
-                QMessageBox.critical(self, "Login Failed", "Invalid username or password.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"An internal error occurred: {e}")
+
+        # bcrypt takes hundreds of ms at the default cost; verify on a worker thread
+        from database.models import User
+        from services.query_executor import get_executor
+        self.set_busy(True)
+        get_executor().submit(User.authenticate, username, password, key='login').then(
+            self.on_authenticated, self.on_login_error)
+
+    def set_busy(self, busy):
+        self.progress.setVisible(busy)
+        self.user_input.setEnabled(not busy)
+        self.pass_input.setEnabled(not busy)
+        self.signin_btn.setEnabled(not busy)
+        self.signin_btn.setText("Signing in..." if busy else "Sign In")
+
+    def on_authenticated(self, user):
+        self.set_busy(False)
+        if user:
+            from database.models import AuditLog
+            AuditLog.log(user.get('id'), "LOGIN", "AUTH", f"{user['username']} signed in")
+            self.accept_login(user['username'], user['role'])
+        else:
+            QMessageBox.critical(self, "Login Failed", "Invalid username or password.")
+
+    def on_login_error(self, e):
+        self.set_busy(False)
+        QMessageBox.critical(self, "Error", f"An internal error occurred: {e}")
 
     def accept_login(self, username, role):
         try:
@@ -133,8 +133,14 @@ class AreaChart(QWidget):
         self.setMouseTracking(True)
         self.hover_index = -1
 
+    def set_data(self, data):
+        self.data = list(data)
+        if self.hover_index >= len(self.data):
+            self.hover_index = -1
+        self.update()
+
     def paintEvent(self, event):
-        if not self.data: return
+        if len(self.data) < 2: return
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         
@@ -142,7 +148,7 @@ class AreaChart(QWidget):
         padding = 40
         chart_w, chart_h = w - padding * 2, h - padding * 2
         
-        max_val = max(self.data) * 1.2
+        max_val = max(self.data) * 1.2 or 1
         step_x = chart_w / (len(self.data) - 1)
         
         path = QPainterPath()
@@ -184,9 +190,10 @@ class AreaChart(QWidget):
             painter.drawRoundedRect(tooltip_rect, 6, 6)
             painter.setPen(QColor("white"))
             painter.setFont(QFont("Inter", 9, QFont.Bold))
-            painter.drawText(tooltip_rect, Qt.AlignCenter, f"Rs.{self.data[self.hover_index]}")
+            painter.drawText(tooltip_rect, Qt.AlignCenter, f"Rs.{self.data[self.hover_index]:.0f}")
 
     def mouseMoveEvent(self, event):
+        if len(self.data) < 2: return
         padding = 40
         chart_w = self.width() - padding * 2
         step_x = chart_w / (len(self.data) - 1)
@@ -205,6 +212,11 @@ class DonutChart(QWidget):
         super().__init__(parent)
         self.segments = segments 
 
+    def set_segments(self, segments):
+        self.segments = list(segments)
+        self.setToolTip("\n".join(f"{label}: {percent:.0f}%" for label, percent, _ in self.segments))
+        self.update()
+
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
@@ -228,7 +240,7 @@ class DonutChart(QWidget):
         
         painter.setPen(QColor("#1E293B"))
         painter.setFont(QFont("Inter", 12, QFont.Bold))
-        painter.drawText(inner_rect, Qt.AlignCenter, "Inventory\nStatus")
+        painter.drawText(inner_rect, Qt.AlignCenter, "Top\nSellers")
 
 from utils.theme import Theme
 from gui.components import ModernButton, GlassCard as GlobalGlassCard, SidebarButton
@@ -461,15 +473,18 @@ class MainWindow(QWidget):
         metrics_layout = QHBoxLayout()
         metrics_layout.setSpacing(25)
         
+        # Figures are filled in by the metrics service (apply_dashboard_metrics)
         metrics = [
-            ("Total Profit", "Rs. 1250.00", "+12.5%/Month", Theme.ROYAL_BLUE),
-            ("Total Sale", "Rs. 1250.00", "+18%/Month", Theme.PRIMARY_TEAL),
-            ("Low Stock", "752", "-5.2%", Theme.ERROR),
-            ("System Users", "355", "+12", Theme.INFO)
+            ('profit', "Total Profit", "Rs. 0.00", "", Theme.ROYAL_BLUE),
+            ('total_sale', "Total Sale", "Rs. 0.00", "", Theme.PRIMARY_TEAL),
+            ('low_stock', "Low Stock", "0", "", Theme.ERROR),
+            ('users', "System Users", "0", "", Theme.INFO)
         ]
         
-        for title, val, change, color in metrics:
+        self.metric_cards = {}
+        for key, title, val, change, color in metrics:
             card = EnhancedMetricCard(title, val, change, color)
+            self.metric_cards[key] = card
             metrics_layout.addWidget(card)
         self.body_layout.addLayout(metrics_layout)
         
@@ -480,15 +495,15 @@ class MainWindow(QWidget):
         # Big Sales Chart
         sales_container = self.create_container_card("Total Sale", 400)
         sales_container.layout().setContentsMargins(0, 0, 0, 0)
-        area = AreaChart([4500, 5200, 4800, 6100, 5900, 7200, 6800, 8100, 7500, 9200])
-        sales_container.layout().addWidget(area)
+        self.sales_chart = AreaChart([])
+        sales_container.layout().addWidget(self.sales_chart)
         charts_row.addWidget(sales_container, 2)
         
         # Profit Chart (or Bar chart)
         profit_container = self.create_container_card("Total Profit", 400)
         # For now reusing AreaChart but could be a BarChart
-        area2 = AreaChart([3000, 4000, 3500, 5000, 4500, 6000])
-        profit_container.layout().addWidget(area2)
+        self.profit_chart = AreaChart([])
+        profit_container.layout().addWidget(self.profit_chart)
         charts_row.addWidget(profit_container, 1)
         
         self.body_layout.addLayout(charts_row)
@@ -499,7 +514,8 @@ class MainWindow(QWidget):
         
         # Transaction Table
         trans_card = self.create_container_card("Transaction", 350)
-        table = QTableWidget(3, 5)
+        table = QTableWidget(0, 5)
+        self.trans_table = table
         table.setHorizontalHeaderLabels(["Order ID", "Date", "Medicine Name", "Quantity", "Price"])
         table.setEditTriggers(QTableWidget.NoEditTriggers)
         table.verticalHeader().setVisible(False)
@@ -519,27 +535,56 @@ class MainWindow(QWidget):
         """)
         table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         
-        # Dummy data
-        data = [
-            ("025636", "12-08-26", "Doxiva 200mg", "2", "Rs. 25"),
-            ("025637", "12-08-26", "Monus 10mg", "1", "Rs. 17"),
-            ("052366", "12-08-26", "Revortil 2mg", "1", "Rs. 15")
-        ]
-        for r, row in enumerate(data):
-            for c, val in enumerate(row):
-                table.setItem(r, c, QTableWidgetItem(val))
-        
         trans_card.layout().addWidget(table)
         bottom_row.addWidget(trans_card, 2)
         
         # Demanded Drugs
         drugs_card = self.create_container_card("Demanded Drugs", 350)
-        donut = DonutChart([("Doxiva", 40, "#F43F5E"), ("Exium", 20, "#6366F1"), ("Paracetomol", 20, "#EAB308"), ("Sef", 20, "#2563EB")])
-        drugs_card.layout().addWidget(donut)
+        self.donut = DonutChart([])
+        drugs_card.layout().addWidget(self.donut)
         bottom_row.addWidget(drugs_card, 1)
         
         self.body_layout.addLayout(bottom_row)
 
+        # Live figures: refreshed in the background, pushed into the widgets above
+        if not hasattr(self, 'metrics_service'):
+            from services.dashboard_metrics import DashboardMetricsService
+            self.metrics_service = DashboardMetricsService(parent=self)
+            self.metrics_service.updated.connect(self.apply_dashboard_metrics)
+            self.metrics_service.start()
+        else:
+            self.metrics_service.refresh()
+
+    DONUT_COLORS = ["#F43F5E", "#6366F1", "#EAB308", "#2563EB"]
+
+    def apply_dashboard_metrics(self, m):
+        """Updates the dashboard widgets in place from a DashboardMetrics snapshot."""
+        cards = self.metric_cards
+        cards['profit'].set_value(f"Rs. {m['profit']:.2f}", m['profit_change'])
+        cards['total_sale'].set_value(f"Rs. {m['total_sale']:.2f}", m['total_sale_change'])
+        cards['low_stock'].set_value(str(m['low_stock']), "Reorder" if m['low_stock'] else "")
+        cards['users'].set_value(str(m['users']), f"+{m['new_users']}" if m['new_users'] else "")
+
+        self.sales_chart.set_data(m['revenue_series'])
+        self.profit_chart.set_data(m['profit_series'])
+
+        rows = m['transactions']
+        self.trans_table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            values = (row['bill_no'], row['created_at'].strftime("%d-%m-%y"), row['medicine_name'],
+                      str(row['quantity']), f"Rs. {float(row['subtotal']):.0f}")
+            for c, val in enumerate(values):
+                item = self.trans_table.item(r, c)
+                if item is None:
+                    self.trans_table.setItem(r, c, QTableWidgetItem(val))
+                elif item.text() != val:
+                    item.setText(val)
+
+        top = m['top_products']
+        total_qty = sum(float(p['quantity']) for p in top) or 1
+        self.donut.set_segments([(p['medicine_name'], float(p['quantity']) / total_qty * 100, color)
+                                 for p, color in zip(top, self.DONUT_COLORS)])
+
 
     def handle_logout(self):
         reply = QMessageBox.question(self, 'Logout', 'Are you sure you want to logout?',
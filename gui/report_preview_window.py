@@ -24,8 +24,19 @@ class ReportPreviewWindow(QWidget):
         self.template = TemplateService.load_template()
         
         self.init_ui()
+        from services.gui_events import gui_events
+        from database.events import TEMPLATE_CHANGED
+        gui_events().subscribe(TEMPLATE_CHANGED, self.on_template_changed, owner=self)
+
+    def on_template_changed(self, template):
+        """template.changed: rebuilds the report with the new template."""
+        self.template = template
+        # Hand the old layout and its widgets to a throwaway parent, which deletes them
+        QWidget().setLayout(self.layout())
+        self.init_ui()
 
     def init_ui(self):
+        st = TemplateService.style(self.template)
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
         main_layout.setSpacing(0)
@@ -46,7 +57,7 @@ class ReportPreviewWindow(QWidget):
         
         btn_print = QPushButton("Print PDF")
         btn_print.setFixedSize(120, 40)
-        btn_print.setStyleSheet(f"background: {self.template['theme']['primary']}; color: white; border-radius: 6px; font-weight: bold;")
+        btn_print.setStyleSheet(st.primary_button_qss)
         btn_print.clicked.connect(lambda: QMessageBox.information(self, "Print", "Report sent to PDF printer..."))
         top_layout.addWidget(btn_print)
         
@@ -74,7 +85,7 @@ class ReportPreviewWindow(QWidget):
         header = QHBoxLayout()
         info_l = QVBoxLayout()
         name = QLabel(self.template['store']['name'])
-        name.setFont(QFont("Inter", 18, QFont.Bold))
+        name.setFont(st.font(18, bold=True))
         name.setStyleSheet(f"color: {self.template['theme']['primary']};")
         info_l.addWidget(name)
         
@@ -96,7 +107,7 @@ class ReportPreviewWindow(QWidget):
         line = QFrame(); line.setFixedHeight(2); line.setStyleSheet(f"background: {self.template['theme']['primary']};"); p_layout.addWidget(line)
         
         subtitle = QLabel(f"Total Items: {len(self.data)}")
-        subtitle.setFont(QFont("Inter", 10, QFont.Bold))
+        subtitle.setFont(st.font(10, bold=True))
         subtitle.setStyleSheet("color: #475569;")
         p_layout.addWidget(subtitle)
 
@@ -111,32 +122,23 @@ class ReportPreviewWindow(QWidget):
         self.table.setShowGrid(False)
         
         # Styling Table
-        self.table.setStyleSheet(f"""
-            QTableWidget {{ border: none; background: white; }}
-            QHeaderView::section {{
-                background: {self.template['table']['header_bg']};
-                color: {self.template['table']['header_text']};
-                padding: 10px;
-                border: none;
-                font-weight: bold;
-                font-size: 11px;
-            }}
-        """)
+        self.table.setStyleSheet(st.table_header_qss)
         
         h_header = self.table.horizontalHeader()
         for i in range(len(self.columns)):
             h_header.setSectionResizeMode(i, QHeaderView.Stretch)
 
+        cell_font, alert_font, alert_color = st.font(10), st.font(10, bold=True), QColor("#EF4444")
         for r, row_data in enumerate(self.data):
             for c, (key, label) in enumerate(zip(self.columns, self.columns)):
                 val = str(row_data.get(label.lower().replace(" ", "_"), ""))
                 item = QTableWidgetItem(val)
-                item.setFont(QFont("Inter", 10))
+                item.setFont(cell_font)
                 
                 # Highlight stock if low
                 if label.lower() == "stock" and int(val) <= row_data.get('reorder_level', 10):
-                    item.setForeground(QColor("#EF4444"))
-                    item.setFont(QFont("Inter", 10, QFont.Bold))
+                    item.setForeground(alert_color)
+                    item.setFont(alert_font)
                 
                 self.table.setItem(r, c, item)
                 
@@ -93,13 +93,21 @@ class AddUserDialog(QDialog):
             QMessageBox.warning(self, "Required Fields", "Please fill in all fields.")
             return
 
-        try:
-            from database.models import User
-            User.create(u, p, f, r)
-            QMessageBox.information(self, "Success", f"User '{u}' registered successfully.")
-            self.accept()
-        except Exception as e:
-            QMessageBox.critical(self, "Creation Error", f"Failed to create user: {e}")
+        # Hashing the password is slow by design; do it (and the INSERT) on a worker
+        from database.models import User
+        from services.query_executor import get_executor
+        self.setEnabled(False)
+        get_executor().submit(User.create, u, p, f, r).then(
+            lambda _: self.on_created(u), self.on_create_error)
+
+    def on_created(self, username):
+        self.setEnabled(True)
+        QMessageBox.information(self, "Success", f"User '{username}' registered successfully.")
+        self.accept()
+
+    def on_create_error(self, e):
+        self.setEnabled(True)
+        QMessageBox.critical(self, "Creation Error", f"Failed to create user: {e}")
 
 class UserManagerWindow(QWidget):
     def __init__(self, parent=None):
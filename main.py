@@ -50,6 +50,10 @@ def main():
     
     window.show()
 
+    # Queued audit entries are written (or spilled to disk) before exit
+    from database.models import AuditLog
+    app.aboutToQuit.connect(AuditLog.shutdown)
+
     sys.exit(app.exec())
 
 if __name__ == "__main__":
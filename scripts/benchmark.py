@@ -0,0 +1,503 @@
+"""Performance benchmarks for D. Chemist.
+
+Run from the project root against a scratch database, e.g.:
+
+    python scripts/benchmark.py checkout --sizes 1000 5000 20000
+
+Each benchmark cleans up the rows it creates.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add root directory to path to import project modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+BENCH_BATCH = 'BENCH-RUN'
+# Name fragments for synthetic catalogue rows, so searches hit realistic spreads of rows
+NAME_STEMS = ['Para', 'Amoxi', 'Ibu', 'Ceti', 'Metfor', 'Omepra', 'Azithro', 'Losar', 'Panto', 'Diclo']
+NAME_TAILS = ['cetamol', 'cillin', 'profen', 'rizine', 'min', 'zole', 'mycin', 'tan', 'prazole', 'fenac']
+FORMS = ['Tablet', 'Capsule', 'Syrup', 'Injection', 'Cream']
+
+
+def timed(fn, repeat):
+    """Runs fn() `repeat` times, returns per-call timings in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label, samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"{label:<40} median {statistics.median(samples):8.2f} ms   p95 {p95:8.2f} ms   n={len(samples)}")
+
+
+def seed_inventory(count):
+    """Tops the catalogue up with synthetic BENCH rows until it holds `count` rows."""
+    from database.models import BaseModel
+    db = BaseModel.db
+    existing = db.fetch_one("SELECT COUNT(*) AS n FROM inventory")['n']
+    missing = count - existing
+    if missing <= 0:
+        return
+    query = """
+        INSERT INTO inventory (medicine_name, category, company, barcode, batch_no, expiry_date,
+                               stock_qty, price, strength, form)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+    for start in range(0, missing, 1000):
+        rows = []
+        for i in range(start, min(missing, start + 1000)):
+            n = existing + i
+            name = f"{NAME_STEMS[n % 10]}{NAME_TAILS[(n // 10) % 10]} {n:06d}"
+            rows.append((name, 'General', f"Bench Pharma {n % 50}", f"99{n:010d}", BENCH_BATCH, '2030-01-01',
+                         1_000_000, 10.0, f"{(n % 20 + 1) * 25}mg", FORMS[n % len(FORMS)]))
+        db.execute_many(query, rows).close()
+
+
+def cleanup_bench_rows():
+    from database.models import BaseModel, Sale
+    db = BaseModel.db
+    # Benchmark checkouts also landed in sales_daily_rollup; recompute those days once the rows are gone
+    days = db.fetch_one("SELECT MIN(created_at) AS first, MAX(created_at) AS last FROM sales "
+                        "WHERE bill_no LIKE 'BENCH-%'")
+    db.execute_query("DELETE FROM sales WHERE bill_no LIKE 'BENCH-%'").close()
+    if days and days['first']:
+        Sale.rebuild_daily_rollup(days['first'], days['last'])
+    db.execute_query("DELETE FROM inventory WHERE batch_no = %s", (BENCH_BATCH,)).close()
+
+
+def bench_checkout(args):
+    """Checkout latency across catalogue sizes; should stay flat as the catalogue grows."""
+    from database.models import BaseModel, Sale, User
+    db = BaseModel.db
+    user = User.find_by_username('admin')
+    counter = iter(range(10**9))
+
+    try:
+        for size in args.sizes:
+            seed_inventory(size)
+            # The cart carries inventory ids captured when items were added
+            cart_ids = [r['id'] for r in db.fetch_all(
+                "SELECT id FROM inventory WHERE batch_no = %s LIMIT %s", (BENCH_BATCH, args.lines))]
+            items = [(med_id, 1, 10.0, 10.0) for med_id in cart_ids]
+            subtotal = sum(i[3] for i in items)
+
+            def checkout():
+                Sale.create_transaction(f"BENCH-{next(counter)}", user['id'], None, items,
+                                        (subtotal, subtotal * 0.12, subtotal * 1.12))
+
+            report(f"checkout {args.lines} lines / {size} SKUs", timed(checkout, args.repeat))
+    finally:
+        cleanup_bench_rows()
+
+
+def bench_search(args):
+    """Keystroke-to-results latency of Medicine.search on a large catalogue (target < 20 ms)."""
+    from database.models import Medicine
+
+    try:
+        seed_inventory(args.size)
+        for term in args.terms:
+            # Simulate typing: every prefix of the term is a keystroke
+            for n in range(1, len(term) + 1):
+                report(f"search {term[:n]!r} ({args.size} SKUs)",
+                       timed(lambda: Medicine.search(term[:n], limit=50), args.repeat))
+    finally:
+        cleanup_bench_rows()
+
+
+def bench_page(args):
+    """First-page latency of keyset-paged Medicine.page() against a full Medicine.get_all()."""
+    from database.models import Medicine
+    from services.paging import InventoryPager
+
+    try:
+        seed_inventory(args.size)
+        report(f"get_all ({args.size} SKUs)", timed(Medicine.get_all, max(1, args.repeat // 10)))
+        report(f"page first {args.page_size}", timed(lambda: Medicine.page(limit=args.page_size), args.repeat))
+        pager = InventoryPager(page_size=args.page_size)
+        pager.next_page()
+        for _ in range(args.depth):
+            pager.next_page()
+        after_name, after_id = pager.after
+        report(f"page after {args.depth} pages",
+               timed(lambda: Medicine.page(after_name, args.page_size, after_id=after_id), args.repeat))
+    finally:
+        cleanup_bench_rows()
+
+
+def bench_login(args):
+    """Password verification latency per bcrypt cost factor, serial and as a burst of parallel logins."""
+    from concurrent.futures import ThreadPoolExecutor
+    import bcrypt
+    from database.models import User
+
+    password = "correct horse battery staple"
+    for rounds in args.rounds:
+        stored = User.hash_password(password, rounds=rounds).encode('utf-8')
+        check = lambda: bcrypt.checkpw(password.encode('utf-8'), stored)
+        report(f"hash  cost {rounds}", timed(lambda: User.hash_password(password, rounds=rounds), args.repeat))
+        report(f"check cost {rounds}", timed(check, args.repeat))
+        # Shift change: several cashiers signing in at once, verified on worker threads
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            burst = lambda: list(pool.map(lambda _: check(), range(args.workers)))
+            report(f"check cost {rounds} x{args.workers} parallel", timed(burst, args.repeat))
+
+
+def bench_barcode(args):
+    """Scan latency through Medicine.lookup_barcode: cold (database) against warm (cache) scans."""
+    import random
+    from database.models import Medicine
+
+    try:
+        seed_inventory(args.size)
+        codes = [r['barcode'] for r in Medicine.db.fetch_all(
+            "SELECT barcode FROM inventory WHERE batch_no = %s LIMIT %s", (BENCH_BATCH, args.skus))]
+        Medicine._barcode_cache.clear()
+        report(f"cold scans ({len(codes)} SKUs)", timed(lambda: [Medicine.lookup_barcode(c) for c in codes], 1))
+        # Fast movers: the same few SKUs scanned over and over
+        scans = [random.choice(codes) for _ in range(args.scans)]
+        report(f"warm scans x{args.scans}", timed(lambda: [Medicine.lookup_barcode(c) for c in scans], args.repeat))
+        print(Medicine.barcode_cache_stats())
+    finally:
+        cleanup_bench_rows()
+
+
+def synthetic_rows(count):
+    """In-memory catalogue rows shaped like the inventory table (no database needed)."""
+    for n in range(count):
+        yield {
+            'id': n + 1,
+            'medicine_name': f"{NAME_STEMS[n % 10]}{NAME_TAILS[(n // 10) % 10]} {n:06d}",
+            'company': f"Bench Pharma {n % 50}",
+            'strength': f"{(n % 20 + 1) * 25}mg",
+            'form': FORMS[n % len(FORMS)],
+            'barcode': f"{n:012d}",
+            'price': 10.0,
+            'stock_qty': 100,
+        }
+
+
+def bench_index(args):
+    """Build time and per-keystroke latency of the in-memory POS search index."""
+    from services.search_index import InventorySearchIndex
+
+    rows = list(synthetic_rows(args.size))
+    index = InventorySearchIndex()
+    report(f"build index ({args.size} SKUs)", timed(lambda: index.build(rows), 1))
+    for term in args.terms:
+        for n in range(1, len(term) + 1):
+            report(f"index search {term[:n]!r}", timed(lambda: index.search(term[:n], limit=50), args.repeat))
+
+
+def bench_cart(args):
+    """Cost of quantity edits on a large POS cart (model alone and through BillingWindow)."""
+    from services.cart import Cart
+
+    cart = Cart()
+    for n in range(args.lines):
+        cart.add(n + 1, f"Item {n}", 10.0 + n)
+    edits = [((n % args.lines) + 1, 1 if n % 2 == 0 else -1) for n in range(args.edits)]
+    report(f"Cart: {args.edits} edits / {args.lines} lines",
+           timed(lambda: [cart.change_qty(i, d) for i, d in edits], args.repeat))
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PySide6.QtWidgets import QApplication
+    from gui.billing_window import BillingWindow
+
+    app = QApplication.instance() or QApplication([])
+    window = BillingWindow()
+    for n in range(args.lines):
+        window.add_to_cart(f"Item {n}", 10.0 + n, n + 1)
+    app.processEvents()
+
+    def edit_ui():
+        for med_id, delta in edits:
+            window.change_cart_qty(med_id, delta)
+        app.processEvents()
+
+    report(f"BillingWindow: {args.edits} edits / {args.lines} lines", timed(edit_ui, args.repeat))
+
+
+def bench_inventory_table(args):
+    """Load / re-filter / sort cost of the InventoryWindow table model on a large catalogue."""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PySide6.QtCore import Qt
+    from PySide6.QtWidgets import QApplication
+    from gui.inventory_window import InventoryTableModel
+
+    app = QApplication.instance() or QApplication([])
+    rows = [dict(r, category=f"Category {r['id'] % 12}", batch_no='B1', expiry_date='2030-01-01')
+            for r in synthetic_rows(args.size)]
+    model = InventoryTableModel()
+    report(f"load {args.size} rows", timed(lambda: model.load(rows), 3))
+    for term in args.terms:
+        report(f"filter {term!r}", timed(lambda: model.set_filter(text=term), args.repeat))
+    report("filter category", timed(lambda: model.set_filter(text='', category='Category 3'), args.repeat))
+    model.set_filter(category=None)
+    report("sort by stock", timed(lambda: model.sort(InventoryTableModel.STOCK_COL, Qt.DescendingOrder), args.repeat))
+
+
+PRICE_LIST_HEADER = ['Drug Name', 'Manufacturer', 'Strength', 'Form', 'Indication', 'Side Effects',
+                     'Available In', 'Age Restriction', 'Prescription Required', 'Price']
+
+
+def write_price_list(path, count):
+    """Synthetic supplier CSV shaped like the bundled dataset; every 500th row is unusable."""
+    import csv
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(PRICE_LIST_HEADER)
+        for n in range(count):
+            price = 'n/a' if n % 500 == 499 else f"{(n % 400) + 5}.50"
+            writer.writerow([f"{NAME_STEMS[n % 10]}{NAME_TAILS[(n // 10) % 10]} {n:07d}", f"Bench Supplier {n % 50}",
+                             f"{(n % 20 + 1) * 25}mg", FORMS[n % len(FORMS)], "Fever, pain", "Nausea",
+                             "All cities", "None", "Yes" if n % 3 == 0 else "No", price])
+
+
+def bench_import(args):
+    """Rows/s of the bulk price-list import against one INSERT per row."""
+    import itertools
+    import shutil
+    import tempfile
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    import import_data
+    from database.models import BaseModel, Medicine
+
+    workdir = tempfile.mkdtemp(prefix='medi-import-')
+    path = os.path.join(workdir, 'price_list.csv')
+    try:
+        write_price_list(path, args.rows)
+        # Old path: clean and INSERT row by row (a sample, it is slow)
+        rows = list(itertools.islice(import_data.read_csv(path), args.baseline_rows))
+        start = time.perf_counter()
+        for _, raw in rows:
+            try:
+                Medicine.create(import_data.clean_row(raw))
+            except ValueError:
+                pass
+        elapsed = time.perf_counter() - start
+        print(f"{'row-by-row Medicine.create':<40} {len(rows) / elapsed:>10,.0f} rows/s   n={len(rows)}")
+        BaseModel.db.execute_query("DELETE FROM inventory WHERE company LIKE 'Bench Supplier%'").close()
+
+        for label in ("bulk import (all new)", "bulk import (all existing)"):
+            rejects = import_data.RejectsFile(os.path.join(workdir, 'rejects.csv'))
+            summary = import_data.import_rows(import_data.read_csv(path), rejects, args.batch_size, progress_every=0)
+            rejects.close()
+            print(f"{label:<40} {summary['rows_per_sec']:>10,.0f} rows/s   n={summary['read']} "
+                  f"(inserted {summary['inserted']}, updated {summary['updated']}, rejected {summary['rejected']})")
+    finally:
+        BaseModel.db.execute_query("DELETE FROM inventory WHERE company LIKE 'Bench Supplier%'").close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def bench_import_workers(args):
+    """Import throughput by number of cleaning processes on a large synthetic price list."""
+    import shutil
+    import tempfile
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    import import_data
+    from database.models import BaseModel
+
+    workdir = tempfile.mkdtemp(prefix='medi-import-')
+    path = os.path.join(workdir, 'price_list.csv')
+    try:
+        write_price_list(path, args.rows)
+        print(f"{args.rows:,} rows, {os.cpu_count()} CPUs, {'dry run (no database writes)' if args.dry_run else 'full import'}")
+        for workers in args.workers:
+            rejects = import_data.RejectsFile(os.path.join(workdir, 'rejects.csv'))
+            summary = import_data.import_rows(import_data.read_csv(path), rejects, args.batch_size, progress_every=0,
+                                              workers=workers, chunk_size=args.chunk_size, dry_run=args.dry_run)
+            rejects.close()
+            print(f"{f'workers={workers}':<40} {summary['rows_per_sec']:>10,.0f} rows/s   "
+                  f"{summary['seconds']:8.2f} s (staging {summary['stage_seconds']:.2f} s)")
+            if not args.dry_run:
+                BaseModel.db.execute_query("DELETE FROM inventory WHERE company LIKE 'Bench Supplier%'").close()
+    finally:
+        if not args.dry_run:
+            BaseModel.db.execute_query("DELETE FROM inventory WHERE company LIKE 'Bench Supplier%'").close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def synthetic_bills(count, lines):
+    """Bills shaped like BillingWindow's bill_data (no database needed)."""
+    for n in range(count):
+        items = []
+        for i in range(lines):
+            k = n * lines + i
+            rate, qty = 5.0 + k % 400, k % 5 + 1
+            items.append((f"{NAME_STEMS[k % 10]}{NAME_TAILS[(k // 10) % 10]} {(k % 20 + 1) * 25}mg {FORMS[k % len(FORMS)]}",
+                          rate, qty, rate * qty))
+        subtotal = sum(i[3] for i in items)
+        yield {"bill_no": f"BENCH-{n:06d}", "date": "2026-01-01", "customer_name": "Walk-in Customer",
+               "items": items, "subtotal": subtotal, "discount": 0, "gst": subtotal * 0.12, "total": subtotal * 1.12}
+
+
+def bench_pdf(args):
+    """PDF invoice throughput (invoices/s) for the batch API."""
+    import shutil
+    import tempfile
+    from services.pdf_generator import InvoicePDFGenerator
+
+    workdir = tempfile.mkdtemp(prefix='medi-pdf-')
+    try:
+        start = time.perf_counter()
+        generator = InvoicePDFGenerator(output_dir=workdir)
+        generator.render(next(synthetic_bills(1, args.lines)))
+        print(f"{'first invoice (cold caches)':<40} {(time.perf_counter() - start) * 1000:8.2f} ms")
+        bills = list(synthetic_bills(args.count, args.lines))
+        for workers in args.workers:
+            paths, seconds = generator.render_batch(bills, workers=workers)
+            print(f"{f'batch x{args.count}, {args.lines} lines, workers={workers}':<40} "
+                  f"{len(paths) / seconds:8.1f} invoices/s   {seconds * 1000 / len(paths):6.2f} ms each")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+
+def bench_preview(args):
+    """Time to build and first-paint the invoice preview window, by invoice length."""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PySide6.QtWidgets import QApplication
+    from gui.bill_preview_window import BillPreviewWindow
+
+    app = QApplication.instance() or QApplication([])
+    for lines in args.lines:
+        bill = next(synthetic_bills(1, lines))
+
+        def open_preview():
+            window = BillPreviewWindow(None, bill)
+            window.show()
+            app.processEvents()
+            window.close()
+            window.deleteLater()
+        report(f"open preview, {lines} lines", timed(open_preview, args.repeat))
+
+def bench_excel(args):
+    """Excel export rows/s and peak memory, streaming synthetic sale rows (no database needed)."""
+    import resource
+    import tempfile
+    from datetime import datetime, timedelta
+    from decimal import Decimal
+    from services.excel_exporter import write_workbook, sales_sheet
+    from database.models import Sale
+
+    def rows():
+        base = datetime(2026, 1, 1)
+        for n in range(args.rows):
+            total = Decimal(100 + n % 5000) / 4
+            yield {'bill_no': f"BENCH-{n:07d}", 'created_at': base + timedelta(minutes=n),
+                   'customer_name': None, 'cashier_name': 'bench', 'payment_mode': 'Cash',
+                   'total_amount': total, 'discount_amount': Decimal(0), 'tax_amount': total * Decimal('0.12'),
+                   'grand_total': total * Decimal('1.12')}
+
+    # Same columns as the real sales export, fed from the generator instead of the database
+    Sale.iter_report = staticmethod(lambda start, end: rows())
+    Sale.get_report_count = staticmethod(lambda start, end: args.rows)
+    spec = sales_sheet('2026-01-01', '2026-12-31')
+    with tempfile.TemporaryDirectory(prefix='medi-xlsx-') as workdir:
+        path = os.path.join(workdir, 'bench.xlsx')
+        start = time.perf_counter()
+        done = write_workbook(path, [spec])
+        seconds = time.perf_counter() - start
+        size = os.path.getsize(path)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{f'export x{done:,} rows':<40} {done / seconds:8.0f} rows/s   {seconds:6.2f} s   "
+          f"{size / 1e6:6.1f} MB file   peak RSS {peak:.0f} MB")
+
+def main():
+    parser = argparse.ArgumentParser(description="D. Chemist performance benchmarks")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('checkout', help=bench_checkout.__doc__)
+    p.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 20000])
+    p.add_argument('--lines', type=int, default=15)
+    p.add_argument('--repeat', type=int, default=50)
+    p.set_defaults(func=bench_checkout)
+
+    p = sub.add_parser('search', help=bench_search.__doc__)
+    p.add_argument('--size', type=int, default=100_000)
+    p.add_argument('--terms', nargs='+', default=['paracetamol', 'amoxi 250', 'syrup'])
+    p.add_argument('--repeat', type=int, default=20)
+    p.set_defaults(func=bench_search)
+
+    p = sub.add_parser('page', help=bench_page.__doc__)
+    p.add_argument('--size', type=int, default=100_000)
+    p.add_argument('--page-size', type=int, default=200)
+    p.add_argument('--depth', type=int, default=100)
+    p.add_argument('--repeat', type=int, default=20)
+    p.set_defaults(func=bench_page)
+
+    p = sub.add_parser('login', help=bench_login.__doc__)
+    p.add_argument('--rounds', type=int, nargs='+', default=[10, 11, 12, 13])
+    p.add_argument('--workers', type=int, default=4)
+    p.add_argument('--repeat', type=int, default=5)
+    p.set_defaults(func=bench_login)
+
+    p = sub.add_parser('barcode', help=bench_barcode.__doc__)
+    p.add_argument('--size', type=int, default=20_000)
+    p.add_argument('--skus', type=int, default=50)
+    p.add_argument('--scans', type=int, default=1000)
+    p.add_argument('--repeat', type=int, default=20)
+    p.set_defaults(func=bench_barcode)
+
+    p = sub.add_parser('index', help=bench_index.__doc__)
+    p.add_argument('--size', type=int, default=20_000)
+    p.add_argument('--terms', nargs='+', default=['paracetamol', 'amoxi 250', 'paracetmol'])
+    p.add_argument('--repeat', type=int, default=50)
+    p.set_defaults(func=bench_index)
+
+    p = sub.add_parser('cart', help=bench_cart.__doc__)
+    p.add_argument('--lines', type=int, default=100)
+    p.add_argument('--edits', type=int, default=100)
+    p.add_argument('--repeat', type=int, default=20)
+    p.set_defaults(func=bench_cart)
+
+    p = sub.add_parser('inventory-table', help=bench_inventory_table.__doc__)
+    p.add_argument('--size', type=int, default=50_000)
+    p.add_argument('--terms', nargs='+', default=['p', 'para', 'syrup', 'pharma 7'])
+    p.add_argument('--repeat', type=int, default=20)
+    p.set_defaults(func=bench_inventory_table)
+
+    p = sub.add_parser('import', help=bench_import.__doc__)
+    p.add_argument('--rows', type=int, default=50_000)
+    p.add_argument('--baseline-rows', type=int, default=2000)
+    p.add_argument('--batch-size', type=int, default=2000)
+    p.set_defaults(func=bench_import)
+
+    p = sub.add_parser('import-workers', help=bench_import_workers.__doc__)
+    p.add_argument('--rows', type=int, default=1_000_000)
+    p.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    p.add_argument('--batch-size', type=int, default=2000)
+    p.add_argument('--chunk-size', type=int, default=1000)
+    p.add_argument('--dry-run', action='store_true', help="clean and validate only, no database writes")
+    p.set_defaults(func=bench_import_workers)
+
+    p = sub.add_parser('pdf', help=bench_pdf.__doc__)
+    p.add_argument('--count', type=int, default=500)
+    p.add_argument('--lines', type=int, default=15)
+    p.add_argument('--workers', type=int, nargs='+', default=[0])
+    p.set_defaults(func=bench_pdf)
+
+    p = sub.add_parser('preview', help=bench_preview.__doc__)
+    p.add_argument('--lines', type=int, nargs='+', default=[15, 60, 500])
+    p.add_argument('--repeat', type=int, default=10)
+    p.set_defaults(func=bench_preview)
+
+    p = sub.add_parser('excel', help=bench_excel.__doc__)
+    p.add_argument('--rows', type=int, default=200_000)
+    p.set_defaults(func=bench_excel)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""EXPLAIN-based regression check for index-backed queries.
+
+Run from the project root against a migrated database:
+
+    python scripts/check_query_plans.py
+
+For each query it runs EXPLAIN and checks that the expected index is
+usable for the expected table (it appears in possible_keys). A predicate
+wrapped in a function, e.g. DATE(created_at), leaves possible_keys empty,
+so this catches queries that silently stop being sargable. On tiny tables
+the optimizer may still prefer a full scan; that is reported but does not
+fail the check. Exits non-zero if any check fails.
+"""
+import os
+import sys
+from datetime import date
+
+# Add root directory to path to import project modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def plan_checks():
+    """[(label, query, params, table alias, expected index)]"""
+    from database.models import Sale
+    today = date.today()
+    month_start = today.replace(day=1)
+    return [
+        ("Sale.get_report", Sale.REPORT_QUERY, Sale._day_range(month_start, today), 's', 'idx_sales_created_user'),
+        ("Sale.get_summary_stats (today)", Sale.SUMMARY_QUERY, Sale._day_range(month_start, today), 'sales', 'idx_sales_created_user'),
+        ("Sale.get_summary_stats (rollup)", Sale.ROLLUP_SUMMARY_QUERY, (month_start, today),
+         'sales_daily_rollup', 'PRIMARY'),
+        ("Sale.get_todays_stats",
+         "SELECT COUNT(*), SUM(grand_total) FROM sales "
+         "WHERE created_at >= CURDATE() AND created_at < CURDATE() + INTERVAL 1 DAY", (), 'sales', 'idx_sales_created_user'),
+    ]
+
+
+def check(label, query, params, table, index):
+    from database.models import BaseModel
+    rows = BaseModel.db.fetch_all("EXPLAIN " + query, params)
+    row = next((r for r in rows if r.get('table') == table), None)
+    if row is None:
+        print(f"FAIL {label}: no plan row for table {table!r}")
+        return False
+    possible = (row.get('possible_keys') or '').split(',')
+    if index not in possible:
+        print(f"FAIL {label}: {index} not usable (possible_keys={row.get('possible_keys')}, type={row.get('type')})")
+        return False
+    note = "" if row.get('key') == index else f"  (optimizer chose {row.get('key') or 'a full scan'}; table too small?)"
+    print(f"ok   {label}: key={row.get('key')} type={row.get('type')} rows={row.get('rows')}{note}")
+    return True
+
+
+def main():
+    results = [check(*c) for c in plan_checks()]
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,73 +1,415 @@
+"""Bulk import of a supplier price list (.csv or .xlsx) into the inventory.
+
+    python scripts/import_data.py ["data/Pakistan Medicines Dataset.csv"] [--batch-size 2000]
+    python scripts/import_data.py "data/Pakistan Medicines Dataset.xlsx" [--sheet Sheet1]
+    python scripts/import_data.py big_list.csv --workers 4 [--dry-run]
+
+Rows are streamed from the file, cleaned (in --workers processes), and
+staged by a single writer thread in batches of multi-row inserts;
+InventoryImport.merge() then upserts the whole file into inventory keyed
+on barcode, or on name+strength+form. Rows that cannot be imported are
+written with the reason to a rejects CSV next to the input.
+"""
+import argparse
 import csv
+import hashlib
+import math
 import os
+import queue
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date
 
 # Add root directory to path to import database modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from database.models import Medicine
+from database.models import InventoryImport
 
-def clean_dataset():
-    csv_path = os.path.join('data', 'Pakistan Medicines Dataset.csv')
-    if not os.path.exists(csv_path):
-        print(f"Error: CSV file not found at {csv_path}")
-        return
+DEFAULT_PATH = os.path.join('data', 'Pakistan Medicines Dataset.csv')
+
+# CSV Columns: Drug Name, Manufacturer, Strength, Form, Indication, Side Effects, Available In, Age Restriction, Prescription Required, Price
+# Text fields and their inventory column limits
+TEXT_FIELDS = {
+    'medicine_name': ('Drug Name', 255),
+    'company': ('Manufacturer', 100),
+    'barcode': ('Barcode', 100),
+    'strength': ('Strength', 100),
+    'form': ('Form', 100),
+    'age_restriction': ('Age Restriction', 100),
+}
 
-    print(f"Reading dataset from {csv_path}...")
-    
-    success_count = 0
-    fail_count = 0
-    
-    with open(csv_path, mode='r', encoding='utf-8') as f:
+
+def read_csv(path):
+    """Yields (line_no, row dict) one row at a time."""
+    with open(path, mode='r', encoding='utf-8', newline='') as f:
         reader = csv.DictReader(f)
         for row in reader:
-            try:
-                # Clean and map fields
-                # CSV Columns: Drug Name, Manufacturer, Strength, Form, Indication, Side Effects, Available In, Age Restriction, Prescription Required, Price
-                
-                name = row.get('Drug Name', '').strip()
-                if not name:
-                    continue
-                    
-                # Clean Price (remove non-numeric chars, handle NaN)
-                price_str = row.get('Price', '0').strip()
-                try:
-                    price = float(price_str) if price_str.lower() != 'nan' else 0.0
-                except ValueError:
-                    price = 0.0
-
-                # Map to database dictionary
-                data = {
-                    'medicine_name': name,
-                    'category': 'General', # Dataset doesn't have a direct category, use default
-                    'company': row.get('Manufacturer', 'Generic').strip(),
-                    'barcode': None, # Use None (NULL) to avoid duplicate empty string error
-                    'strength': row.get('Strength', '').strip(),
-                    'form': row.get('Form', '').strip(),
-                    'batch_no': 'IMPORT-2026',
-                    'expiry_date': date(2027, 12, 31), # placeholder
-                    'stock_qty': 100, # default stock
-                    'price': price,
-                    'reorder_level': 20,
-                    'indication': row.get('Indication', '').strip(),
-                    'side_effects': row.get('Side Effects', '').strip(),
-                    'age_restriction': row.get('Age Restriction', '').strip(),
-                    'prescription_required': row.get('Prescription Required', 'No').strip().lower() == 'yes'
-                }
-                
-                Medicine.create(data)
-                success_count += 1
-                if success_count % 10 == 0:
-                    print(f"Imported {success_count} items...")
-                    
-            except Exception as e:
-                print(f"Failed to import row {row.get('Drug Name')}: {e}")
-                fail_count += 1
-
-    print(f"\n--- Import Complete ---")
-    print(f"Successfully imported: {success_count}")
-    print(f"Failed: {fail_count}")
+            yield reader.line_num, row
+
+
+def read_xlsx(path, sheet=None):
+    """Yields (row_no, row dict) from a workbook without loading it into memory.
+
+    openpyxl's read-only mode parses the sheet XML lazily, so memory use
+    does not grow with the number of rows. The first row is the header,
+    mapped to the same column names as the CSV.
+    """
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = workbook[sheet] if sheet else workbook.active
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [str(h).strip() if h is not None else None for h in header]
+        for row_no, values in enumerate(rows, start=2):
+            if not any(v is not None and v != '' for v in values):
+                continue
+            yield row_no, {h: v for h, v in zip(header, values) if h}
+    finally:
+        # Read-only workbooks keep the file open until closed
+        workbook.close()
+
+
+def read_rows(path, sheet=None):
+    """Streams rows from a .csv or .xlsx price list."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.xlsx', '.xlsm'):
+        return read_xlsx(path, sheet)
+    if ext == '.csv':
+        return read_csv(path)
+    raise ValueError(f"Unsupported file type {ext!r} (expected .csv or .xlsx)")
+
+
+def text(row, column, default=''):
+    value = row.get(column)
+    if value is None:
+        return default
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # Excel stores 500 as 500.0
+    return " ".join(str(value).split()) or default
+
+
+def parse_price(value):
+    """Supplier price; NaN/blank count as 0, anything else unparseable is rejected."""
+    raw = str(value if value is not None else '').strip().replace(',', '')
+    if raw.lower().startswith('rs'):
+        raw = raw[2:].lstrip('. ')
+    if not raw or raw.lower() == 'nan':
+        return 0.0
+    try:
+        price = float(raw)
+    except ValueError:
+        raise ValueError(f"unreadable price {value!r}")
+    if math.isnan(price):
+        return 0.0
+    if price < 0 or price >= 10 ** 8:
+        raise ValueError(f"price out of range {value!r}")
+    return round(price, 2)
+
+
+def clean_row(row):
+    """Maps one file row to inventory fields; raises ValueError with the reason to reject it."""
+    data = {}
+    for field, (column, limit) in TEXT_FIELDS.items():
+        data[field] = text(row, column)
+        if len(data[field]) > limit:
+            raise ValueError(f"{column} longer than {limit} characters")
+    if not data['medicine_name']:
+        raise ValueError("missing Drug Name")
+
+    data.update({
+        'category': 'General',  # Dataset doesn't have a direct category, use default
+        'company': data['company'] or 'Generic',
+        'barcode': data['barcode'] or None,  # NULL, not '', so UNIQUE(barcode) allows many
+        'batch_no': 'IMPORT-2026',
+        'expiry_date': date(2027, 12, 31),  # placeholder
+        'stock_qty': 100,  # default stock
+        'price': parse_price(row.get('Price')),
+        'reorder_level': 20,
+        'indication': text(row, 'Indication'),
+        'side_effects': text(row, 'Side Effects'),
+        'prescription_required': text(row, 'Prescription Required', 'No').lower() == 'yes',
+    })
+    return data
+
+
+def row_key(data):
+    """Staging key: the barcode, or name+strength+form compared case-insensitively."""
+    if data['barcode']:
+        key = "barcode\x1f" + data['barcode']
+    else:
+        key = "\x1f".join((data['medicine_name'], data['strength'], data['form'])).lower()
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def staged_tuple(line_no, data):
+    values = dict(data, row_key=row_key(data), line_no=line_no)
+    return tuple(values[c] for c in InventoryImport.COLUMNS)
+
+
+class RejectsFile:
+    """CSV of rows that could not be imported, opened on the first reject."""
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def add(self, line_no, row, reason):
+        if self._writer is None:
+            self._file = open(self.path, 'w', encoding='utf-8', newline='')
+            self._writer = csv.writer(self._file)
+            self._fields = [k for k in row if k is not None]
+            self._writer.writerow(['line', 'reason'] + self._fields)
+        self._writer.writerow([line_no, reason] + [row.get(k, '') for k in self._fields])
+        self.count += 1
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+
+class Progress:
+    def __init__(self, every):
+        self.every = every
+        self.start = time.perf_counter()
+        self.rows = 0
+
+    def tick(self, rows):
+        before, self.rows = self.rows, self.rows + rows
+        if self.every and before // self.every != self.rows // self.every:
+            print(f"  {self.rows:>9,} rows read   {self.rate():>9,.0f} rows/s")
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def rate(self):
+        return self.rows / self.elapsed() if self.elapsed() else 0.0
+
+
+def clean_chunk(chunk):
+    """Cleaning stage (runs in worker processes): [(line_no, raw)] -> (staged tuples, rejects)."""
+    staged, rejected = [], []
+    for line_no, raw in chunk:
+        try:
+            staged.append(staged_tuple(line_no, clean_row(raw)))
+        except ValueError as e:
+            rejected.append((line_no, raw, str(e)))
+    return staged, rejected
+
+
+def chunked(rows, size):
+    chunk = []
+    for item in rows:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _put(q, item, stop):
+    """Blocking put that gives up once `stop` is set, so a stage never hangs on a dead consumer."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def cleaned_chunks(rows, workers=0, chunk_size=1000):
+    """Yields clean_chunk results in file order.
+
+    With workers > 0 a reader thread fills a bounded queue of chunks, and up
+    to 2 * workers chunks are cleaned at once in a process pool; reading
+    stalls whenever cleaning or writing falls behind, so memory stays
+    bounded. workers=0 cleans inline.
+    """
+    if workers <= 0:
+        for chunk in chunked(rows, chunk_size):
+            yield clean_chunk(chunk)
+        return
+
+    read_q = queue.Queue(maxsize=workers * 2)
+    stop = threading.Event()
+    read_error = []
+
+    def read():
+        try:
+            for chunk in chunked(rows, chunk_size):
+                if not _put(read_q, chunk, stop):
+                    return
+        except Exception as e:
+            read_error.append(e)
+        _put(read_q, None, stop)
+
+    reader = threading.Thread(target=read, name="import-reader", daemon=True)
+    reader.start()
+    in_flight = deque()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            done_reading = False
+            while not done_reading or in_flight:
+                while not done_reading and len(in_flight) < workers * 2:
+                    chunk = read_q.get()
+                    if chunk is None:
+                        done_reading = True
+                    else:
+                        in_flight.append(pool.submit(clean_chunk, chunk))
+                if in_flight:
+                    yield in_flight.popleft().result()
+    finally:
+        stop.set()
+        for future in in_flight:
+            future.cancel()
+    if read_error:
+        raise read_error[0]
+
+
+class StageWriter(threading.Thread):
+    """Writer stage: the one thread that stages rows, in batches of batch_size.
+
+    Fed through a bounded queue, so cleaning waits when the database is the
+    bottleneck. With dry_run the rows are counted but not written.
+    """
+    def __init__(self, batch_size=2000, maxsize=8, dry_run=False):
+        super().__init__(name="import-writer", daemon=True)
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.stop = threading.Event()
+        self.staged = 0
+        self.error = None
+
+    def put(self, rows):
+        if not _put(self.queue, rows, self.stop):
+            raise self.error
+
+    def close(self):
+        _put(self.queue, None, self.stop)
+        self.join()
+        if self.error:
+            raise self.error
+
+    def run(self):
+        batch = []
+        try:
+            while True:
+                rows = self.queue.get()
+                if rows is not None:
+                    batch.extend(rows)
+                while len(batch) >= self.batch_size or (rows is None and batch):
+                    self._stage(batch[:self.batch_size])
+                    batch = batch[self.batch_size:]
+                if rows is None:
+                    return
+        except Exception as e:
+            self.error = e
+            self.stop.set()
+
+    def _stage(self, rows):
+        if not self.dry_run:
+            InventoryImport.stage(rows)
+        self.staged += len(rows)
+
+
+def import_rows(rows, rejects, batch_size=2000, progress_every=10000, workers=0, chunk_size=1000, dry_run=False):
+    """Cleans and stages (line_no, raw row) pairs, then merges them; returns a summary dict.
+
+    Pipeline: reader -> cleaning (inline or `workers` processes) -> one writer
+    thread, connected by bounded queues. dry_run validates and writes the
+    rejects file without touching the database.
+    """
+    progress = Progress(progress_every)
+    if not dry_run:
+        InventoryImport.clear()
+    writer = StageWriter(batch_size, dry_run=dry_run)
+    writer.start()
+    try:
+        for staged, rejected in cleaned_chunks(rows, workers, chunk_size):
+            for line_no, raw, reason in rejected:
+                rejects.add(line_no, raw, reason)
+            writer.put(staged)
+            progress.tick(len(staged) + len(rejected))
+    finally:
+        writer.close()
+
+    stage_time = progress.elapsed()
+    updated = inserted = 0
+    if not dry_run:
+        updated, inserted = InventoryImport.merge()
+        InventoryImport.clear()
+    return {
+        'read': progress.rows,
+        'staged': writer.staged,
+        'rejected': rejects.count,
+        'updated': updated,
+        'inserted': inserted,
+        'stage_seconds': stage_time,
+        'seconds': progress.elapsed(),
+        'rows_per_sec': progress.rows / progress.elapsed() if progress.elapsed() else 0.0,
+    }
+
+
+def rejects_path_for(path):
+    return os.path.splitext(path)[0] + '.rejects.csv'
+
+
+def clean_dataset(path=DEFAULT_PATH, batch_size=2000, rejects_path=None, progress_every=10000, sheet=None,
+                  workers=0, chunk_size=1000, dry_run=False):
+    if not os.path.exists(path):
+        print(f"Error: file not found at {path}")
+        return None
+
+    print(f"Reading dataset from {path}...")
+    try:
+        rows = read_rows(path, sheet)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return None
+    rejects = RejectsFile(rejects_path or rejects_path_for(path))
+    try:
+        summary = import_rows(rows, rejects, batch_size, progress_every, workers, chunk_size, dry_run)
+    finally:
+        rejects.close()
+
+    print(f"\n--- {'Validation' if dry_run else 'Import'} Complete ---")
+    print(f"Rows read:       {summary['read']:,}")
+    print(f"Updated:         {summary['updated']:,}")
+    print(f"Inserted:        {summary['inserted']:,}")
+    print(f"Rejected:        {summary['rejected']:,}" + (f"  (see {rejects.path})" if rejects.count else ""))
+    if not dry_run and summary['staged'] > summary['updated'] + summary['inserted']:
+        print(f"Duplicates:      {summary['staged'] - summary['updated'] - summary['inserted']:,}  (same product listed again; last row kept)")
+    print(f"Time:            {summary['seconds']:.2f} s  (staging {summary['stage_seconds']:.2f} s)")
+    print(f"Throughput:      {summary['rows_per_sec']:,.0f} rows/s")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a supplier price list into the inventory")
+    parser.add_argument('path', nargs='?', default=DEFAULT_PATH)
+    parser.add_argument('--batch-size', type=int, default=2000, help="rows per multi-row staging insert")
+    parser.add_argument('--rejects', help="rejected-rows CSV (default: <input>.rejects.csv)")
+    parser.add_argument('--progress-every', type=int, default=10000)
+    parser.add_argument('--sheet', help="worksheet to read from an .xlsx file (default: the active sheet)")
+    # One core is left for the reader and writer; on a single core, cleaning inline is fastest
+    parser.add_argument('--workers', type=int, default=min(4, (os.cpu_count() or 1) - 1),
+                        help="processes cleaning rows in parallel (0: clean in the main process)")
+    parser.add_argument('--chunk-size', type=int, default=1000, help="rows handed to a worker at a time")
+    parser.add_argument('--dry-run', action='store_true', help="validate and write the rejects file only")
+    args = parser.parse_args()
+    summary = clean_dataset(args.path, args.batch_size, args.rejects, args.progress_every, args.sheet,
+                            args.workers, args.chunk_size, args.dry_run)
+    sys.exit(0 if summary is not None else 1)
+
 
 if __name__ == "__main__":
-    clean_dataset()
+    main()
@@ -0,0 +1,34 @@
+"""Catch-up job for the sales_daily_rollup table.
+
+Recomputes the per-day sales totals from raw sales rows, e.g. after
+importing historical sales or to repair drift:
+
+    python scripts/rebuild_sales_rollup.py --days 7
+    python scripts/rebuild_sales_rollup.py --start 2024-01-01 --end 2024-12-31
+"""
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+
+# Add root directory to path to import project modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database.models import Sale
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild sales_daily_rollup from raw sales")
+    parser.add_argument('--start', type=date.fromisoformat, help="first day (YYYY-MM-DD)")
+    parser.add_argument('--end', type=date.fromisoformat, help="last day, inclusive (default: today)")
+    parser.add_argument('--days', type=int, default=1, help="days back from --end when --start is not given")
+    args = parser.parse_args()
+
+    end = args.end or date.today()
+    start = args.start or end - timedelta(days=args.days - 1)
+    groups = Sale.rebuild_daily_rollup(start, end)
+    print(f"Rebuilt sales_daily_rollup for {start} .. {end}: {groups} rows.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+from config import GST_RATE
+
+
+class CartLine:
+    __slots__ = ('inventory_id', 'name', 'price', 'qty')
+
+    def __init__(self, inventory_id, name, price, qty=1):
+        self.inventory_id = inventory_id
+        self.name = name
+        self.price = float(price)
+        self.qty = qty
+
+    @property
+    def amount(self):
+        return self.price * self.qty
+
+
+class Cart:
+    """POS cart keyed by inventory id with a running subtotal.
+
+    Every mutation adjusts the subtotal by the delta of the touched line
+    only, so edits cost O(1) however many lines the bill has.
+    """
+    def __init__(self, tax_rate=GST_RATE):
+        self.lines = {}  # inventory_id -> CartLine, in insertion order
+        self.subtotal = 0.0
+        self.tax_rate = tax_rate
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __iter__(self):
+        return iter(self.lines.values())
+
+    def get(self, inventory_id):
+        return self.lines.get(inventory_id)
+
+    def add(self, inventory_id, name, price, qty=1):
+        """Adds qty of an item; returns (line, created)."""
+        line = self.lines.get(inventory_id)
+        created = line is None
+        if created:
+            line = self.lines[inventory_id] = CartLine(inventory_id, name, price, 0)
+        self.set_qty(inventory_id, line.qty + qty)
+        return line, created
+
+    def set_qty(self, inventory_id, qty):
+        """Sets a line's quantity; qty <= 0 removes it. Returns the line or None if removed."""
+        line = self.lines.get(inventory_id)
+        if line is None:
+            return None
+        if qty <= 0:
+            self.remove(inventory_id)
+            return None
+        self.subtotal += line.price * (qty - line.qty)
+        line.qty = qty
+        return line
+
+    def change_qty(self, inventory_id, delta):
+        line = self.lines.get(inventory_id)
+        if line is None:
+            return None
+        return self.set_qty(inventory_id, line.qty + delta)
+
+    def remove(self, inventory_id):
+        line = self.lines.pop(inventory_id, None)
+        if line is not None:
+            self.subtotal -= line.amount
+        if not self.lines:
+            self.subtotal = 0.0  # drop accumulated float drift
+        return line
+
+    def clear(self):
+        self.lines.clear()
+        self.subtotal = 0.0
+
+    def totals(self, discount_percent=0.0, discount_fixed=0.0):
+        """(subtotal, tax, discount, total) for the current lines."""
+        subtotal = round(self.subtotal, 2)
+        tax = subtotal * self.tax_rate / 100
+        discount = subtotal * discount_percent / 100 + discount_fixed
+        total = max(subtotal + tax - discount, 0)
+        return subtotal, tax, discount, total
+
+    def sale_items(self):
+        """[(inventory_id, quantity, unit_price, subtotal)] as Sale.create_transaction expects."""
+        return [(l.inventory_id, l.qty, l.price, l.amount) for l in self.lines.values()]
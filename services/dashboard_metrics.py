@@ -0,0 +1,128 @@
+import threading
+import time
+from datetime import date, timedelta
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from database.events import SALE_COMPLETED, INVENTORY_CHANGED, USER_CHANGED
+from services.gui_events import gui_events
+from services.query_executor import get_executor
+
+
+def pct_change(current, previous):
+    """'+12.5%/Month' style change label; empty when there is nothing to compare with."""
+    if not previous:
+        return ""
+    return f"{(current - previous) / previous * 100:+.1f}%/Month"
+
+
+class DashboardMetrics:
+    """Figures for the MainWindow dashboard, from a handful of aggregate queries.
+
+    One grouped rollup query covers the revenue series and both month-to-date
+    comparisons; the rest are single aggregates. Results are cached for
+    `ttl` seconds so several views asking at once share one computation.
+    """
+    SERIES_DAYS = 10
+    TOP_PRODUCTS_DAYS = 30
+
+    def __init__(self, ttl=15.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._computed_at = 0.0
+
+    def snapshot(self, max_age=None):
+        """Cached figures if younger than max_age (default ttl) seconds, else recomputed."""
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._computed_at < max_age:
+                return self._snapshot
+            self._snapshot = self.compute()
+            self._computed_at = time.monotonic()
+            return self._snapshot
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshot = None
+
+    def compute(self, today=None):
+        from database.models import Medicine, Sale, User
+        today = today or date.today()
+        month_start = today.replace(day=1)
+        prev_month_start = (month_start - timedelta(days=1)).replace(day=1)
+        series_start = today - timedelta(days=self.SERIES_DAYS - 1)
+
+        days = Sale.get_daily_totals(min(prev_month_start, series_start), today)
+
+        def totals(start, end):
+            picked = [d for day, d in days.items() if start <= day <= end]
+            revenue = sum(d['revenue'] for d in picked)
+            return revenue, revenue - sum(d['tax'] for d in picked)
+
+        # Month to date against the same stretch of last month
+        prev_end = min(prev_month_start + timedelta(days=today.day - 1), month_start - timedelta(days=1))
+        revenue, net = totals(month_start, today)
+        prev_revenue, prev_net = totals(prev_month_start, prev_end)
+
+        series_days = [series_start + timedelta(days=i) for i in range(self.SERIES_DAYS)]
+        empty = {'revenue': 0.0, 'tax': 0.0}
+        users = User.get_counts(month_start)
+
+        return {
+            'total_sale': revenue,
+            'total_sale_change': pct_change(revenue, prev_revenue),
+            # No purchase cost is recorded, so profit is net sales (ex-GST)
+            'profit': net,
+            'profit_change': pct_change(net, prev_net),
+            'low_stock': Medicine.get_low_stock_count(),
+            'users': users['total'],
+            'new_users': users['recent'],
+            'series_days': series_days,
+            'revenue_series': [days.get(d, empty)['revenue'] for d in series_days],
+            'profit_series': [days.get(d, empty)['revenue'] - days.get(d, empty)['tax'] for d in series_days],
+            'transactions': Sale.get_recent_items(limit=5),
+            'top_products': Sale.get_top_products(today - timedelta(days=self.TOP_PRODUCTS_DAYS), limit=4),
+        }
+
+
+class DashboardMetricsService(QObject):
+    """Refreshes DashboardMetrics on a worker every `interval_ms` and emits `updated(snapshot)`.
+
+    Sales, inventory and user events also trigger a refresh, debounced by
+    `event_delay_ms` so a burst of writes costs one recomputation.
+    """
+    updated = Signal(object)
+    TOPICS = (SALE_COMPLETED, INVENTORY_CHANGED, USER_CHANGED)
+
+    def __init__(self, metrics=None, interval_ms=30000, executor=None, event_delay_ms=1000, parent=None):
+        super().__init__(parent)
+        self.metrics = metrics or DashboardMetrics()
+        self.executor = executor or get_executor()
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.refresh)
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(event_delay_ms)
+        self.debounce.timeout.connect(lambda: self.refresh(force=True))
+        for topic in self.TOPICS:
+            gui_events().subscribe(topic, self.on_data_changed, owner=self)
+
+    def start(self):
+        self.refresh()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        self.debounce.stop()
+        self.executor.cancel('dashboard.metrics')
+
+    def on_data_changed(self, *_):
+        if self.timer.isActive():
+            self.debounce.start()
+
+    def refresh(self, force=False):
+        max_age = 0 if force else None
+        self.executor.submit(self.metrics.snapshot, max_age, key='dashboard.metrics').then(
+            self.updated.emit, lambda e: print(f"Dashboard metrics refresh failed: {e}"))
@@ -0,0 +1,220 @@
+import threading
+import time
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill
+from openpyxl.utils import get_column_letter
+from PySide6.QtCore import QObject, Signal
+
+DATE_FORMAT = 'yyyy-mm-dd'
+DATETIME_FORMAT = 'yyyy-mm-dd hh:mm'
+MONEY_FORMAT = '#,##0.00'
+INT_FORMAT = '0'
+
+
+class Column:
+    """One exported column: header, how to pull the value from a row, and its Excel number format."""
+    def __init__(self, header, key, number_format=None, width=14):
+        self.header = header
+        self.key = key                  # dict key, or callable(row)
+        self.number_format = number_format
+        self.width = width
+
+    def value(self, row):
+        value = self.key(row) if callable(self.key) else row.get(self.key)
+        if isinstance(value, (bytes, bytearray)):
+            value = value.decode('utf-8', 'replace')
+        return value
+
+
+class SheetSpec:
+    """A worksheet to export: title, columns and an iterable of row dicts (usually a DB stream)."""
+    def __init__(self, title, columns, rows, total=None):
+        self.title = title
+        self.columns = columns
+        self.rows = rows
+        self.total = total              # row count if known up front, for progress
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def write_workbook(path, sheets, progress=None, cancelled=None, progress_every=1000):
+    """Streams every sheet into a write-only workbook at `path`; returns the number of rows written.
+
+    Rows go to disk as they are appended, so memory stays flat however long
+    the result sets are. Values keep their types: datetimes and dates become
+    Excel dates, Decimals and floats numbers, each with its column's number
+    format. progress(rows_done, rows_total or None) is called every
+    `progress_every` rows; cancelled() returning True stops the export.
+    """
+    try:
+        return _write_workbook(path, sheets, progress, cancelled, progress_every)
+    finally:
+        # Close DB streams now (a cancelled export stops mid-result) so their connections are freed
+        for spec in sheets:
+            close = getattr(spec.rows, 'close', None)
+            if close:
+                close()
+
+
+def _write_workbook(path, sheets, progress, cancelled, progress_every):
+    wb = Workbook(write_only=True)
+    try:
+        return _write_sheets(wb, path, sheets, progress, cancelled, progress_every)
+    except BaseException:
+        _discard(wb)
+        raise
+
+
+def _discard(wb):
+    """Deletes the temp files behind a write-only workbook that will not be saved."""
+    # openpyxl only removes them in save() or at interpreter exit
+    for ws in wb.worksheets:
+        try:
+            if not ws.closed:
+                ws.close()
+            if ws._writer is not None:
+                ws._writer.cleanup()
+        except Exception as e:
+            print(f"Could not remove export temp file: {e}")
+
+
+def _write_sheets(wb, path, sheets, progress, cancelled, progress_every):
+    total = sum(s.total for s in sheets) if all(s.total is not None for s in sheets) else None
+    done = 0
+    header_font = Font(bold=True, color='FFFFFF')
+    header_fill = PatternFill('solid', fgColor='2C7878')
+
+    for spec in sheets:
+        ws = wb.create_sheet(title=spec.title[:31])
+        for i, col in enumerate(spec.columns, 1):
+            ws.column_dimensions[get_column_letter(i)].width = col.width
+        ws.freeze_panes = 'A2'
+
+        header = []
+        for col in spec.columns:
+            cell = WriteOnlyCell(ws, value=col.header)
+            cell.font = header_font
+            cell.fill = header_fill
+            header.append(cell)
+        ws.append(header)
+
+        # One styled cell per formatted column, reused for every row: append()
+        # serialises the row immediately, so only the value has to change.
+        cells = [WriteOnlyCell(ws) if col.number_format else None for col in spec.columns]
+        for cell, col in zip(cells, spec.columns):
+            if cell is not None:
+                cell.number_format = col.number_format
+
+        for row in spec.rows:
+            values = []
+            for cell, col in zip(cells, spec.columns):
+                value = col.value(row)
+                if cell is None or value is None:
+                    values.append(value)
+                else:
+                    cell.value = value
+                    values.append(cell)
+            ws.append(values)
+            done += 1
+            if done % progress_every == 0:
+                if cancelled and cancelled():
+                    raise ExportCancelled()
+                if progress:
+                    progress(done, total)
+
+    wb.save(path)
+    if progress:
+        progress(done, total if total is not None else done)
+    return done
+
+
+# --- Report definitions ---
+
+def sales_sheet(start_date, end_date):
+    from database.models import Sale
+    columns = [
+        Column("Bill No", 'bill_no', width=18),
+        Column("Date", 'created_at', DATETIME_FORMAT, width=18),
+        Column("Customer", lambda r: r.get('customer_name') or "Walk-in", width=24),
+        Column("Cashier", 'cashier_name', width=20),
+        Column("Payment", 'payment_mode', width=10),
+        Column("Subtotal", 'total_amount', MONEY_FORMAT),
+        Column("Discount", 'discount_amount', MONEY_FORMAT),
+        Column("Tax", 'tax_amount', MONEY_FORMAT),
+        Column("Grand Total", 'grand_total', MONEY_FORMAT),
+    ]
+    return SheetSpec("Sales", columns, Sale.iter_report(start_date, end_date),
+                     total=Sale.get_report_count(start_date, end_date))
+
+
+def inventory_sheet():
+    from database.models import Medicine
+    columns = [
+        Column("Medicine Name", 'medicine_name', width=32),
+        Column("Strength", 'strength'),
+        Column("Form", 'form'),
+        Column("Category", 'category'),
+        Column("Company", 'company', width=24),
+        Column("Barcode", 'barcode', width=16),
+        Column("Batch", 'batch_no'),
+        Column("Expiry", 'expiry_date', DATE_FORMAT),
+        Column("Stock", 'stock_qty', INT_FORMAT, width=10),
+        Column("Reorder Level", 'reorder_level', INT_FORMAT, width=10),
+        Column("Price", 'price', MONEY_FORMAT, width=12),
+    ]
+    return SheetSpec("Inventory", columns, Medicine.iter_all(), total=Medicine.get_count())
+
+
+def audit_sheet(start_date, end_date):
+    from database.models import AuditLog
+    columns = [
+        Column("Time", 'created_at', DATETIME_FORMAT, width=18),
+        Column("User", 'username', width=16),
+        Column("Action", 'action_type', width=18),
+        Column("Module", 'module_name'),
+        Column("Description", 'description', width=48),
+        Column("IP", 'ip_address'),
+    ]
+    return SheetSpec("Audit Log", columns, AuditLog.iter_range(start_date, end_date))
+
+
+class ExcelExportJob(QObject):
+    """Runs write_workbook on the query executor and reports back on the GUI thread.
+
+    `build_sheets` is called on the worker (it runs the count queries and
+    opens the streams). Signals are emitted from the worker and delivered
+    queued to receivers on the GUI thread.
+    """
+    progress = Signal(int, object)   # rows done, rows total (None if unknown)
+    finished = Signal(str, int)      # path, rows written
+    failed = Signal(object)
+
+    def __init__(self, path, build_sheets, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.build_sheets = build_sheets
+        self._cancel = threading.Event()
+        self.seconds = 0.0
+
+    def start(self, executor=None):
+        from services.query_executor import get_executor
+        (executor or get_executor()).submit(self.run)
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        start = time.perf_counter()
+        try:
+            rows = write_workbook(self.path, self.build_sheets(), progress=self.progress.emit,
+                                  cancelled=self._cancel.is_set)
+        except Exception as e:
+            self.failed.emit(e)
+            return
+        self.seconds = time.perf_counter() - start
+        self.finished.emit(self.path, rows)
@@ -0,0 +1,56 @@
+import threading
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+from database.events import events
+
+
+class GuiEventRelay(QObject):
+    """Re-delivers EventBus events on the GUI thread.
+
+    Models publish from whichever thread did the write (often a query
+    worker); slots registered here always run on the thread that owns the
+    relay, so they can touch widgets. A subscription ends when its owner
+    QObject is destroyed.
+    """
+    _event = Signal(str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._slots = {}  # topic -> [(owner, slot)]
+        self._event.connect(self._dispatch)
+
+    def subscribe(self, topic, slot, owner=None):
+        if topic not in self._slots:
+            self._slots[topic] = []
+            events.subscribe(topic, lambda *args, topic=topic: self._event.emit(topic, args))
+        entry = (owner, slot)
+        self._slots[topic].append(entry)
+        if owner is not None:
+            owner.destroyed.connect(lambda *_: self._remove(topic, entry))
+
+    def _remove(self, topic, entry):
+        slots = self._slots.get(topic, [])
+        if entry in slots:
+            slots.remove(entry)
+
+    @Slot(str, object)
+    def _dispatch(self, topic, args):
+        for owner, slot in list(self._slots.get(topic, ())):
+            try:
+                slot(*args)
+            except Exception as e:
+                print(f"GUI handler for {topic} failed: {e}")
+
+
+_relay = None
+_relay_lock = threading.Lock()
+
+
+def gui_events():
+    """Process-wide relay; create it from the GUI thread first."""
+    global _relay
+    with _relay_lock:
+        if _relay is None:
+            _relay = GuiEventRelay()
+        return _relay
@@ -0,0 +1,84 @@
+from database.models import Medicine
+
+
+class InventoryPager:
+    """Walks the catalogue page by page with Medicine.page().
+
+    Remembers the (sort value, id) key of the last row handed out, so
+    views can ask for the next page whenever the user scrolls near the end.
+    set_query() filters and orders the pages in SQL. fetch()/fetch_remaining()
+    only read, so they can run on a worker thread while advance() applies
+    the rows on the owning thread.
+    """
+    PAGE_SIZE = 200
+
+    def __init__(self, page_size=PAGE_SIZE, columns=None, fetch=None):
+        self.page_size = page_size
+        self.columns = columns
+        self.fetch_page = fetch or Medicine.page
+        self.query = {}     # filter and order keywords for Medicine.page()
+        self.order_by, self.descending = 'medicine_name', False
+        self.reset()
+
+    def set_query(self, text=None, category=None, company=None, order_by='medicine_name', descending=False):
+        """Filters and orders the pages in the database; starts again from the first page."""
+        self.query = {'text': text or None, 'category': category, 'company': company,
+                      'order_by': order_by, 'descending': descending}
+        self.order_by, self.descending = order_by, descending
+        self.reset()
+
+    def reset(self):
+        self.after = None   # (sort value, id) of the last row returned
+        self.exhausted = False
+
+    def has_more(self):
+        return not self.exhausted
+
+    def fetch(self, after=None):
+        """The page following key `after` (None: the first page)."""
+        after_name, after_id = after or (None, None)
+        return self.fetch_page(after_name=after_name, after_id=after_id,
+                               limit=self.page_size, columns=self.columns, **self.query)
+
+    def fetch_remaining(self, after=None):
+        """Every page following key `after`, still read one page at a time."""
+        rows = []
+        while True:
+            page = self.fetch(after)
+            rows.extend(page)
+            if len(page) < self.page_size:
+                return rows
+            after = Medicine.sort_key(page[-1], self.order_by)
+
+    def advance(self, rows, complete=False):
+        """Moves the cursor past `rows` fetched from the current position."""
+        if complete or len(rows) < self.page_size:
+            self.exhausted = True
+        if rows:
+            self.after = Medicine.sort_key(rows[-1], self.order_by)
+        return rows
+
+    def covers(self, row):
+        """True if `row` sorts at or before the last row fetched, i.e. inside the pages read so far."""
+        if self.exhausted:
+            return True
+        if self.after is None:
+            return False
+        key, after = _comparable(Medicine.sort_key(row, self.order_by)), _comparable(self.after)
+        return key >= after if self.descending else key <= after
+
+    def next_page(self):
+        if self.exhausted:
+            return []
+        return self.advance(self.fetch(self.after))
+
+    def remaining(self):
+        if self.exhausted:
+            return []
+        return self.advance(self.fetch_remaining(self.after), complete=True)
+
+
+def _comparable(key):
+    # MySQL compares the text columns case-insensitively
+    value, row_id = key
+    return (value.lower() if isinstance(value, str) else value), row_id
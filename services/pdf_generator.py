@@ -0,0 +1,496 @@
+import json
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+
+from reportlab.lib.colors import Color, HexColor
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+from config import BASE_DIR, FONTS_DIR, GST_RATE, INVOICES_DIR
+from services.template_service import TemplateService
+
+LOGO_PATH = os.path.join(BASE_DIR, 'images', 'logo.png')
+LOGO_SIZE = (46, 40)     # points on the page
+IMAGE_DPI = 200          # the logo is resampled once to this resolution, not re-encoded at full size per PDF
+
+# Built-in PDF fonts used when the template's font family has no TTF in FONTS_DIR
+FALLBACK_FONTS = {'regular': 'Helvetica', 'bold': 'Helvetica-Bold', 'italic': 'Helvetica-Oblique'}
+
+_fonts = {}          # family -> {'regular', 'bold', 'italic'} registered font names
+_images = {}         # (path, size) -> ImageReader, or None if unreadable
+_asset_lock = threading.Lock()
+
+
+def resolve_fonts(family):
+    """Registers <family>-Regular/Bold/Italic.ttf from FONTS_DIR once per process."""
+    with _asset_lock:
+        if family in _fonts:
+            return _fonts[family]
+        fonts = dict(FALLBACK_FONTS)
+        for variant, suffix in (('regular', 'Regular'), ('bold', 'Bold'), ('italic', 'Italic')):
+            path = os.path.join(FONTS_DIR, f"{family}-{suffix}.ttf")
+            if os.path.exists(path):
+                try:
+                    name = f"{family}-{suffix}"
+                    pdfmetrics.registerFont(TTFont(name, path))
+                    fonts[variant] = name
+                except Exception as e:
+                    print(f"Could not load font {path}: {e}")
+        _fonts[family] = fonts
+        return fonts
+
+
+def load_image(path, size):
+    """Image resampled for `size` points at IMAGE_DPI, shared by every invoice; None if unreadable."""
+    key = (path, size)
+    with _asset_lock:
+        if key not in _images:
+            _images[key] = None
+            if path and os.path.exists(path):
+                try:
+                    from PIL import Image
+                    img = Image.open(path)
+                    img.thumbnail((round(size[0] * IMAGE_DPI / 72), round(size[1] * IMAGE_DPI / 72)))
+                    img.load()
+                    _images[key] = ImageReader(img)
+                except Exception as e:
+                    print(f"Could not load image {path}: {e}")
+        return _images[key]
+
+
+@lru_cache(maxsize=8192)
+def fit_text(text, font, size, width):
+    """Text truncated with an ellipsis to fit width points; product names repeat, so results are cached."""
+    if pdfmetrics.stringWidth(text, font, size) <= width:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if pdfmetrics.stringWidth(text[:mid] + "...", font, size) <= width:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo].rstrip() + "..."
+
+
+def to_color(value, default='#0F172A'):
+    """'#RRGGBB' or 'rgba(r, g, b, a)' from the template -> reportlab Color."""
+    value = (value or default).strip()
+    m = re.match(r"rgba?\(\s*([\d.]+)\s*,\s*([\d.]+)\s*,\s*([\d.]+)\s*(?:,\s*([\d.]+)\s*)?\)", value)
+    if m:
+        r, g, b = (float(v) / 255 for v in m.groups()[:3])
+        return Color(r, g, b, alpha=float(m.group(4)) if m.group(4) else 1)
+    try:
+        return HexColor(value)
+    except Exception:
+        return HexColor(default)
+
+
+def amount_in_words(amount):
+    """952.5 -> 'Nine Hundred Fifty-Two Rupees and Fifty Paise Only'"""
+    ones = ["", "One", "Two", "Three", "Four", "Five", "Six", "Seven", "Eight", "Nine", "Ten", "Eleven",
+            "Twelve", "Thirteen", "Fourteen", "Fifteen", "Sixteen", "Seventeen", "Eighteen", "Nineteen"]
+    tens = ["", "", "Twenty", "Thirty", "Forty", "Fifty", "Sixty", "Seventy", "Eighty", "Ninety"]
+
+    def below_thousand(n):
+        words = []
+        if n >= 100:
+            words.append(f"{ones[n // 100]} Hundred")
+            n %= 100
+        if n >= 20:
+            words.append(tens[n // 10] + (f"-{ones[n % 10]}" if n % 10 else ""))
+        elif n:
+            words.append(ones[n])
+        return " ".join(words)
+
+    def spell(n):
+        if n == 0:
+            return "Zero"
+        parts = []
+        for value, label in ((10 ** 7, "Crore"), (10 ** 5, "Lakh"), (1000, "Thousand")):
+            if n >= value:
+                parts.append(f"{spell(n // value)} {label}")
+                n %= value
+        if n:
+            parts.append(below_thousand(n))
+        return " ".join(parts)
+
+    rupees, paise = divmod(int(round(float(amount) * 100)), 100)
+    text = f"{spell(rupees)} Rupees"
+    if paise:
+        text += f" and {spell(paise)} Paise"
+    return text + " Only"
+
+
+class InvoiceStyle:
+    """Everything an invoice needs from a template, derived once per template."""
+    # Relative column widths, same proportions as the on-screen InvoiceTable
+    COLUMN_WEIGHTS = (1, 0.7, 0.7, 0.4, 0.6, 0.4, 0.8)
+    RIGHT_ALIGNED = (3, 4, 5, 6)
+
+    _cache = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, template):
+        store, theme, table, footer = (template.get(k, {}) for k in ('store', 'theme', 'table', 'footer'))
+        self.fonts = resolve_fonts(theme.get('font_family', 'Helvetica'))
+        self.primary = to_color(theme.get('primary'), '#2C7878')
+        self.accent = to_color(theme.get('accent'))
+        self.text = to_color(theme.get('text'))
+        self.muted = HexColor('#64748B')
+        self.faint = HexColor('#94A3B8')
+        self.card_bg = to_color(theme.get('bg_card'), '#F8FAFC')
+        self.watermark = Color(self.primary.red, self.primary.green, self.primary.blue, alpha=0.05)
+        self.store_name = store.get('name', '')
+        self.store_color = to_color(store.get('color'))
+        self.tagline = store.get('tagline', '')
+        self.tagline_color = to_color(store.get('tagline_color'), '#64748B')
+        self.address_lines = (store.get('address') or '').splitlines()
+        self.address_color = to_color(store.get('address_color'), '#64748B')
+        self.header_bg = to_color(table.get('header_bg'), '#EEF5F5')
+        self.header_text = to_color(table.get('header_text'), '#2C7878')
+        self.row_border = to_color(table.get('row_border'), '#F1F5F9')
+        self.columns = list(table.get('columns') or TemplateService.DEFAULT_TEMPLATE['table']['columns'])
+        self.show_qr = footer.get('show_qr', True)
+        self.show_bank = footer.get('show_bank', True)
+        self.thanks_text = footer.get('thanks_text', '')
+        self.thanks_color = to_color(footer.get('thanks_color'), '#2C7878')
+
+    @classmethod
+    def for_template(cls, template):
+        key = json.dumps(template, sort_keys=True)
+        with cls._cache_lock:
+            style = cls._cache.get(key)
+            if style is None:
+                style = cls._cache[key] = cls(template)
+            return style
+
+    def column_edges(self, left, width):
+        """x position of each column's left edge, plus the right edge."""
+        weights = self.COLUMN_WEIGHTS[:len(self.columns)]
+        total = sum(weights)
+        edges = [left]
+        for w in weights:
+            edges.append(edges[-1] + width * w / total)
+        return edges
+
+
+class _InvoiceCanvas(canvas.Canvas):
+    """Canvas that drops setFont/setFillColor calls repeating the current state.
+
+    Each operator costs formatting time and bytes, and invoice rows set the
+    same font and colour cell after cell.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._reset_pen()
+
+    def _reset_pen(self):
+        self.pen_font = None    # (name, size, leading) last set
+        self.pen_fill = None
+
+    def setFont(self, psfontname, size, leading=None):
+        if self.pen_font != (psfontname, size, leading):
+            super().setFont(psfontname, size, leading)
+            self.pen_font = (psfontname, size, leading)
+
+    def setFillColor(self, aColor, alpha=None):
+        if alpha is not None or self.pen_fill is None or self.pen_fill != aColor:
+            super().setFillColor(aColor, alpha)
+            self.pen_fill = aColor if alpha is None else None
+
+    def showPage(self):
+        # A new page starts from the default graphics state
+        super().showPage()
+        self._reset_pen()
+
+
+class InvoicePDFGenerator:
+    """Renders bills to A4 PDFs with reportlab canvas calls (no Qt involved).
+
+    bill_data is the dict BillingWindow builds for the preview: bill_no, date,
+    customer_name, customer_phone, items [(name, rate, qty, amount[, batch,
+    expiry])], subtotal, discount, gst, total. Fonts, the logo and the
+    template-derived style are loaded once and shared by every invoice.
+    """
+    PAGE_W, PAGE_H = A4
+    MARGIN = 40
+    ROW_H = 18
+    HEADER_H = 22
+    FOOTER_RESERVE = 70   # space kept free at the bottom of every page
+
+    def __init__(self, template=None, output_dir=INVOICES_DIR, logo_path=LOGO_PATH):
+        self.template = template or TemplateService.load_template()
+        self.style = InvoiceStyle.for_template(self.template)
+        self.output_dir = output_dir
+        self.logo = load_image(logo_path, LOGO_SIZE)
+
+    def path_for(self, bill_data, output_dir=None):
+        safe = re.sub(r"[^A-Za-z0-9_.-]+", "-", str(bill_data.get('bill_no') or 'invoice')).strip('-')
+        return os.path.join(output_dir or self.output_dir, f"{safe or 'invoice'}.pdf")
+
+    def render(self, bill_data, path=None):
+        """Writes one invoice; `path` may also be a file-like object. Returns the path."""
+        path = path or self.path_for(bill_data)
+        if isinstance(path, str):
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        c = _InvoiceCanvas(path, pagesize=A4)
+        c.setTitle(f"Invoice {bill_data.get('bill_no', '')}")
+        c.setAuthor(self.style.store_name)
+        self._draw(c, bill_data)
+        c.save()
+        return path
+
+    def render_bytes(self, bill_data):
+        import io
+        buf = io.BytesIO()
+        self.render(bill_data, buf)
+        return buf.getvalue()
+
+    def render_batch(self, bills, output_dir=None, progress=None, workers=0, chunk_size=50):
+        """Renders many invoices into output_dir (default INVOICES_DIR); returns (paths, seconds).
+
+        workers > 0 spreads chunks of bills over that many processes, each
+        with its own generator (and font/logo caches) for this template.
+        progress(n) is called with the number of bills done so far.
+        """
+        output_dir = output_dir or self.output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        start = time.perf_counter()
+        paths = []
+        if workers > 0:
+            from concurrent.futures import ProcessPoolExecutor
+            bills = list(bills)
+            chunks = [bills[i:i + chunk_size] for i in range(0, len(bills), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self.template, output_dir)) as pool:
+                done = 0
+                for chunk, chunk_paths in zip(chunks, pool.map(_render_chunk, chunks)):
+                    paths.extend(chunk_paths)
+                    done += len(chunk)
+                    if progress:
+                        progress(done)
+        else:
+            paths = _render_all(self, bills, output_dir, progress)
+        return paths, time.perf_counter() - start
+
+    # --- Drawing ---
+
+    def _font(self, c, variant, size, color):
+        c.setFont(self.style.fonts[variant], size)
+        c.setFillColor(color)
+
+    def _fit(self, text, variant, size, width):
+        return fit_text(str(text), self.style.fonts[variant], size, width)
+
+    def _draw(self, c, bill):
+        s = self.style
+        self._draw_page_background(c)
+        y = self._draw_header(c, bill)
+        edges = s.column_edges(self.MARGIN, self.PAGE_W - 2 * self.MARGIN)
+        y = self._draw_table_header(c, y, edges)
+
+        for item in bill.get('items', []):
+            if y - self.ROW_H < self.MARGIN + self.FOOTER_RESERVE:
+                self._draw_page_footer(c)
+                c.showPage()
+                self._draw_page_background(c)
+                y = self._draw_table_header(c, self.PAGE_H - self.MARGIN, edges)
+            y = self._draw_row(c, y, edges, item)
+
+        # Totals need ~190pt; start a new page rather than overflow
+        if y - 190 < self.MARGIN + self.FOOTER_RESERVE:
+            self._draw_page_footer(c)
+            c.showPage()
+            self._draw_page_background(c)
+            y = self.PAGE_H - self.MARGIN
+        self._draw_totals(c, y - 20, bill)
+        self._draw_page_footer(c)
+
+    def _draw_page_background(self, c):
+        c.setFillColor(self.style.watermark)
+        cx, cy = self.PAGE_W / 2, self.PAGE_H / 2
+        c.rect(cx - 22, cy - 75, 44, 150, stroke=0, fill=1)
+        c.rect(cx - 75, cy - 22, 150, 44, stroke=0, fill=1)
+
+    def _draw_header(self, c, bill):
+        s = self.style
+        left, right, top = self.MARGIN, self.PAGE_W - self.MARGIN, self.PAGE_H - self.MARGIN
+        x = left
+        if self.logo is not None:
+            w, h = LOGO_SIZE
+            c.drawImage(self.logo, left, top - h, width=w, height=h, mask='auto', preserveAspectRatio=True)
+            x = left + w + 10
+        self._font(c, 'bold', 20, s.store_color)
+        c.drawString(x, top - 20, s.store_name)
+        self._font(c, 'bold', 8, s.tagline_color)
+        c.drawString(x, top - 34, s.tagline)
+
+        self._font(c, 'regular', 8.5, s.address_color)
+        for i, line in enumerate(s.address_lines):
+            c.drawRightString(right, top - 10 - i * 12, line)
+
+        # Title
+        y = top - 80
+        self._font(c, 'regular', 16, s.accent)
+        c.drawString(left, y, "TAX INVOICE")
+        c.setStrokeColor(s.primary)
+        c.setLineWidth(1)
+        c.line(left, y - 6, left + 44, y - 6)
+
+        # Bill to / invoice details
+        y -= 34
+        self._font(c, 'bold', 7.5, s.faint)
+        c.drawString(left, y, "BILL TO")
+        self._font(c, 'bold', 11, s.text)
+        c.drawString(left, y - 15, self._fit(bill.get('customer_name') or 'Walk-in Customer', 'bold', 11, 240))
+        self._font(c, 'regular', 8.5, s.muted)
+        c.drawString(left, y - 29, f"PH: {bill.get('customer_phone') or '--'}")
+
+        box_x, box_w = right - 220, 220
+        c.setFillColor(s.card_bg)
+        c.roundRect(box_x, y - 42, box_w, 54, 6, stroke=0, fill=1)
+        for i, (label, value) in enumerate((("INVOICE NO", bill.get('bill_no', '')),
+                                            ("DATE", bill.get('date', '')),
+                                            ("DUE DATE", bill.get('due_date') or bill.get('date', '')))):
+            row_y = y - i * 15
+            self._font(c, 'bold', 7.5, s.muted)
+            c.drawString(box_x + 12, row_y, label)
+            self._font(c, 'bold', 8.5, s.text)
+            c.drawRightString(box_x + box_w - 12, row_y, str(value))
+        return y - 62
+
+    def _draw_table_header(self, c, y, edges):
+        s = self.style
+        left, right = edges[0], edges[-1]
+        c.setStrokeColor(s.primary)
+        c.setLineWidth(1.5)
+        c.line(left, y, right, y)
+        c.setFillColor(s.header_bg)
+        c.rect(left, y - self.HEADER_H, right - left, self.HEADER_H, stroke=0, fill=1)
+        self._font(c, 'bold', 7.5, s.header_text)
+        text_y = y - self.HEADER_H + 8
+        for col, label in enumerate(s.columns[:len(edges) - 1]):
+            if col in s.RIGHT_ALIGNED:
+                c.drawRightString(edges[col + 1] - 6, text_y, label)
+            else:
+                c.drawString(edges[col] + 6, text_y, label)
+        return y - self.HEADER_H
+
+    def _draw_row(self, c, y, edges, item):
+        s = self.style
+        name, rate, qty, amount = item[:4]
+        batch = item[4] if len(item) > 4 else '-'
+        expiry = item[5] if len(item) > 5 else '-'
+        values = (name, batch, expiry, str(qty), f"{float(rate):.2f}", f"{GST_RATE}%", f"{float(amount):.2f}")
+        text_y = y - self.ROW_H + 6
+        for col, value in enumerate(values[:len(edges) - 1]):
+            variant = 'bold' if col == 6 else 'regular'
+            self._font(c, variant, 8.5, s.text)
+            width = edges[col + 1] - edges[col] - 12
+            value = self._fit(value, variant, 8.5, width)
+            if col in s.RIGHT_ALIGNED:
+                c.drawRightString(edges[col + 1] - 6, text_y, value)
+            else:
+                c.drawString(edges[col] + 6, text_y, value)
+        c.setStrokeColor(s.row_border)
+        c.setLineWidth(0.75)
+        c.line(edges[0], y - self.ROW_H, edges[-1], y - self.ROW_H)
+        return y - self.ROW_H
+
+    def _draw_totals(self, c, y, bill):
+        s = self.style
+        left, right = self.MARGIN, self.PAGE_W - self.MARGIN
+        subtotal = float(bill.get('subtotal', 0) or 0)
+        discount = float(bill.get('discount', 0) or 0)
+        gst = float(bill.get('gst', 0) or 0)
+        total = float(bill.get('total', 0) or 0)
+
+        # Left: amount in words and bank details
+        self._font(c, 'bold', 7.5, s.faint)
+        c.drawString(left, y, "TOTAL AMOUNT IN WORDS")
+        self._font(c, 'italic', 9.5, s.text)
+        c.drawString(left, y - 15, self._fit(amount_in_words(total), 'italic', 9.5, 280))
+        if s.show_bank:
+            self._font(c, 'regular', 7, s.muted)
+            for i, line in enumerate(("BANK DETAILS", "Standard Chartered Bank | A/C: 1234567890",
+                                      "IBAN: PK12 SCBL 0000 0001 2345 6789")):
+                c.drawString(left, y - 40 - i * 10, line)
+
+        # Right: summary
+        box_x = right - 220
+        rows = [("Subtotal", subtotal)]
+        if discount > 0:
+            rows.append(("Discount", discount))
+        half = GST_RATE / 2
+        rows += [("Taxable Value", subtotal - discount), (f"CGST ({half:g}%)", gst / 2), (f"SGST ({half:g}%)", gst / 2)]
+        row_y = y
+        for label, value in rows:
+            self._font(c, 'regular', 8.5, s.muted)
+            c.drawString(box_x, row_y, label)
+            self._font(c, 'bold', 8.5, HexColor('#EF4444') if label == "Discount" else s.text)
+            c.drawRightString(right, row_y, f"Rs. {value:.2f}")
+            row_y -= 15
+
+        c.setFillColor(s.primary)
+        c.roundRect(box_x - 10, row_y - 30, right - box_x + 10, 36, 6, stroke=0, fill=1)
+        self._font(c, 'bold', 10, HexColor('#FFFFFF'))
+        c.drawString(box_x, row_y - 17, "GRAND TOTAL")
+        c.drawRightString(right - 8, row_y - 17, f"Rs. {total:.2f}")
+
+    def _draw_page_footer(self, c):
+        s = self.style
+        left, right, y = self.MARGIN, self.PAGE_W - self.MARGIN, self.MARGIN
+        if s.show_qr:
+            c.setFillColor(HexColor('#F1F5F9'))
+            c.roundRect(left, y, 44, 44, 4, stroke=0, fill=1)
+            self._font(c, 'regular', 6, s.faint)
+            c.drawCentredString(left + 22, y + 19, "[QR CODE]")
+        self._font(c, 'italic', 16, s.thanks_color)
+        c.drawRightString(right, y + 14, s.thanks_text)
+        self._font(c, 'regular', 7, s.faint)
+        c.drawCentredString(self.PAGE_W / 2, y - 14, f"Page {c.getPageNumber()}")
+
+
+def _render_all(generator, bills, output_dir, progress=None):
+    paths = []
+    for n, bill in enumerate(bills, 1):
+        try:
+            paths.append(generator.render(bill, generator.path_for(bill, output_dir)))
+        except Exception as e:
+            print(f"Failed to render invoice {bill.get('bill_no')}: {e}")
+        if progress:
+            progress(n)
+    return paths
+
+
+_worker_generator = None
+
+
+def _init_worker(template, output_dir):
+    global _worker_generator
+    _worker_generator = InvoicePDFGenerator(template, output_dir)
+
+
+def _render_chunk(bills):
+    return _render_all(_worker_generator, bills, _worker_generator.output_dir)
+
+
+_generator = None
+_generator_lock = threading.Lock()
+
+
+def get_invoice_generator():
+    """Shared generator for the current template; replaced when the template file changes."""
+    global _generator
+    template = TemplateService.load_template()   # the same dict until the file changes
+    with _generator_lock:
+        if _generator is None or _generator.template is not template:
+            _generator = InvoicePDFGenerator(template)
+        return _generator
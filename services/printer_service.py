@@ -0,0 +1,351 @@
+import atexit
+import itertools
+import os
+import queue
+import socket
+import threading
+import time
+from collections import deque
+
+from database.events import events, PRINT_JOB_FINISHED
+
+# Markers passed through the queue alongside jobs
+_STOP = object()
+
+# ESC/POS commands (Epson TM series and compatibles)
+ESC_INIT = b'\x1b@'
+ESC_ALIGN = {'left': b'\x1ba\x00', 'center': b'\x1ba\x01', 'right': b'\x1ba\x02'}
+ESC_BOLD_ON, ESC_BOLD_OFF = b'\x1bE\x01', b'\x1bE\x00'
+GS_DOUBLE, GS_NORMAL = b'\x1d!\x11', b'\x1d!\x00'
+GS_FEED_CUT = b'\x1dVB\x03'   # feed 3 lines, then partial cut
+
+
+# --- Rendering ---
+
+def build_escpos(bill, template=None, width=42, encoding='cp437'):
+    """Receipt bytes for a thermal printer, `width` characters per line (42 on 80mm paper, 32 on 58mm).
+
+    bill is shaped like BillingWindow's bill_data: bill_no, date,
+    customer_name, items as (name, rate, qty, amount[, batch, expiry]),
+    subtotal, discount, gst and total.
+    """
+    from services.template_service import TemplateService
+    t = template or TemplateService.load_template()
+    store, footer = t.get('store', {}), t.get('footer', {})
+    out = bytearray(ESC_INIT)
+
+    def line(text=""):
+        out.extend(text.encode(encoding, 'replace') + b'\n')
+
+    def pair(left, right):
+        right = str(right)
+        left = str(left)[:max(width - len(right) - 1, 0)]
+        line(left + " " * (width - len(left) - len(right)) + right)
+
+    out += ESC_ALIGN['center'] + GS_DOUBLE + ESC_BOLD_ON
+    line(store.get('name', ''))
+    out += GS_NORMAL + ESC_BOLD_OFF
+    if store.get('tagline'):
+        line(store['tagline'])
+    for address_line in store.get('address', '').splitlines():
+        line(address_line[:width])
+    out += ESC_ALIGN['left']
+    line("-" * width)
+    pair(f"Bill: {bill.get('bill_no', '')}", bill.get('date', ''))
+    line(f"Customer: {bill.get('customer_name') or 'Walk-in Customer'}"[:width])
+    line("-" * width)
+
+    for item in bill.get('items', ()):
+        name, rate, qty, amount = item[:4]   # batch and expiry, when present, are not printed
+        name = str(name)
+        while len(name) > width:
+            line(name[:width])
+            name = name[width:]
+        line(name)
+        pair(f"  {qty} x {float(rate):.2f}", f"{float(amount):.2f}")
+    line("-" * width)
+
+    pair("Subtotal", f"{float(bill.get('subtotal', 0)):.2f}")
+    if bill.get('discount'):
+        pair("Discount", f"-{float(bill['discount']):.2f}")
+    pair("GST", f"{float(bill.get('gst', 0)):.2f}")
+    out += ESC_BOLD_ON
+    pair("TOTAL Rs.", f"{float(bill.get('total', 0)):.2f}")
+    out += ESC_BOLD_OFF
+    line("-" * width)
+    if footer.get('thanks_text'):
+        out += ESC_ALIGN['center']
+        line(footer['thanks_text'])
+    out += GS_FEED_CUT
+    return bytes(out)
+
+
+def build_pdf(bill, template=None):
+    """A4 invoice PDF bytes, for printers that take PDF directly."""
+    from services.pdf_generator import InvoicePDFGenerator, get_invoice_generator
+    generator = InvoicePDFGenerator(template) if template else get_invoice_generator()
+    return generator.render_bytes(dict(bill))
+
+
+RENDERERS = {'escpos': build_escpos, 'pdf': build_pdf}
+
+
+# --- Backends ---
+
+class FilePrinter:
+    """Writes each job to its own file in `directory`; a stand-in printer for testing and for print-to-folder setups."""
+    def __init__(self, directory):
+        self.directory = directory
+
+    def send(self, job):
+        os.makedirs(self.directory, exist_ok=True)
+        ext = 'pdf' if job.format == 'pdf' else 'bin'
+        name = "".join(c if c.isalnum() or c in '-_' else '_' for c in str(job.bill_no))
+        path = os.path.join(self.directory, f"{job.id:06d}_{name}.{ext}")
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(job.data)
+        os.replace(tmp, path)   # a folder watcher never sees half a job
+        return path
+
+
+class SocketPrinter:
+    """Raw TCP printing (port 9100, "JetDirect"), which network thermal and most office printers accept."""
+    def __init__(self, host, port=9100, timeout=10.0):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def send(self, job):
+        with socket.create_connection((self.host, self.port), timeout=self.timeout) as sock:
+            sock.sendall(job.data)
+        return f"{self.host}:{self.port}"
+
+
+# --- Spooler ---
+
+class PrintJob:
+    _ids = itertools.count(1)
+
+    def __init__(self, bill, format='escpos'):
+        self.id = next(self._ids)
+        self.bill = bill
+        self.bill_no = bill.get('bill_no', '')
+        self.format = format
+        self.data = None            # rendered bytes, built once on the spooler thread
+        self.status = 'queued'      # queued -> printing -> printed | failed
+        self.attempts = 0
+        self.error = None
+        self.target = None          # where the backend put it (file path, host:port)
+        self.queued_at = time.monotonic()
+        self.finished_at = None
+
+    @property
+    def latency(self):
+        """Seconds from submit() until the printer accepted the job."""
+        return self.finished_at - self.queued_at if self.finished_at else None
+
+
+class PrintSpooler:
+    """Prints jobs one at a time from a background thread.
+
+    submit() only enqueues, so checkout never waits on a printer. Each job
+    is rendered to raw bytes once and then sent to `backend`; a failed send
+    is retried after `backoff` seconds, doubling up to `max_backoff`, until
+    `max_attempts` is reached. Jobs print in submit order: while one is
+    backing off the ones behind it wait, as they would at a jammed printer.
+    Every finished job (printed or failed) is published as PRINT_JOB_FINISHED.
+    The last FAILED_KEPT failed jobs are kept for retry_failed(); older ones
+    are dropped and counted in stats()['dropped'].
+    """
+    FAILED_KEPT = 50
+
+    def __init__(self, backend, format='escpos', template=None, max_attempts=5,
+                 backoff=1.0, max_backoff=30.0, width=42):
+        self.backend = backend
+        self.format = format
+        self.template = template
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.width = width
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._atexit_registered = False
+        self._lock = threading.Lock()   # metrics and failed_jobs change on both the caller and spooler threads
+        self.failed_jobs = deque()
+
+        # Metrics
+        self.submitted = 0
+        self.printed = 0
+        self.failed = 0             # jobs in failed_jobs, waiting for retry_failed()
+        self.dropped = 0            # failed jobs pushed out of failed_jobs
+        self.retries = 0
+        self.latencies = deque(maxlen=200)  # recent submit-to-printed times, seconds
+        self.last_error = None
+
+    # --- Caller side ---
+
+    def submit(self, bill, format=None):
+        """Queues a receipt for printing and returns its PrintJob at once."""
+        job = PrintJob(dict(bill), format or self.format)
+        with self._lock:
+            self.submitted += 1
+        self._queue.put(job)
+        self.start()
+        return job
+
+    def retry_failed(self):
+        """Re-queues jobs that ran out of attempts (e.g. after the paper was changed)."""
+        with self._lock:
+            jobs = list(self.failed_jobs)
+            self.failed_jobs.clear()
+            self.failed -= len(jobs)
+        for job in jobs:
+            job.status, job.attempts, job.error = 'queued', 0, None
+            job.queued_at = time.monotonic()
+            self._queue.put(job)
+        if jobs:
+            self.start()
+        return jobs
+
+    def close(self, timeout=10.0):
+        """Prints what is already queued (up to timeout), then stops the spooler thread.
+
+        A later submit() or retry_failed() starts a new thread.
+        """
+        with self._start_lock:
+            thread = self._thread
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+        thread.join(timeout)
+        self._stop.set()    # cuts short a backoff wait if the printer is still down
+        thread.join()       # at most one send timeout more
+        with self._start_lock:
+            self._thread = None
+            self._stop.clear()
+        if self.pending():
+            # Jobs submitted while we were stopping landed behind the stop marker
+            self.start()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="print-spooler", daemon=True)
+                self._thread.start()
+                if not self._atexit_registered:
+                    atexit.register(self.close)
+                    self._atexit_registered = True
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def stats(self):
+        with self._lock:
+            recent = sorted(self.latencies)
+            return {
+                'pending': self.pending(),
+                'submitted': self.submitted,
+                'printed': self.printed,
+                'failed': self.failed,
+                'dropped': self.dropped,
+                'retries': self.retries,
+                'latency_avg': sum(recent) / len(recent) if recent else 0.0,
+                'latency_p95': recent[int(len(recent) * 0.95)] if recent else 0.0,
+                'latency_max': recent[-1] if recent else 0.0,
+                'last_error': self.last_error,
+            }
+
+    # --- Spooler thread ---
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            self._print(job)
+            events.publish(PRINT_JOB_FINISHED, job)
+
+    def _print(self, job):
+        job.status = 'printing'
+        if job.data is None:
+            try:
+                job.data = self._render(job)
+            except Exception as e:
+                # Bad data will not render any better on a retry
+                self._give_up(job, f"Could not render receipt: {e}")
+                return
+        while True:
+            job.attempts += 1
+            try:
+                job.target = self.backend.send(job)
+            except Exception as e:
+                job.error = str(e)
+                with self._lock:
+                    self.last_error = job.error
+                if job.attempts >= self.max_attempts:
+                    self._give_up(job, job.error)
+                    return
+                delay = min(self.backoff * 2 ** (job.attempts - 1), self.max_backoff)
+                print(f"Printing {job.bill_no} failed (attempt {job.attempts}), retrying in {delay:.1f}s: {e}")
+                with self._lock:
+                    self.retries += 1
+                if self._stop.wait(delay):
+                    self._give_up(job, "Print spooler stopped")
+                    return
+                continue
+            job.status, job.error = 'printed', None
+            job.finished_at = time.monotonic()
+            with self._lock:
+                self.printed += 1
+                self.latencies.append(job.latency)
+            return
+
+    def _render(self, job):
+        if job.format == 'escpos':
+            return build_escpos(job.bill, self.template, width=self.width)
+        return RENDERERS[job.format](job.bill, self.template)
+
+    def _give_up(self, job, error):
+        print(f"Giving up on printing {job.bill_no}: {error}")
+        job.status, job.error = 'failed', error
+        job.finished_at = time.monotonic()
+        with self._lock:
+            self.last_error = error
+            if len(self.failed_jobs) >= self.FAILED_KEPT:
+                # The oldest failed job can no longer be re-queued
+                self.failed_jobs.popleft()
+                self.failed -= 1
+                self.dropped += 1
+            self.failed_jobs.append(job)
+            self.failed += 1
+
+
+def backend_from_config(settings):
+    if settings.get('backend') == 'socket':
+        return SocketPrinter(settings['host'], settings.get('port', 9100), settings.get('timeout', 10.0))
+    return FilePrinter(settings['directory'])
+
+
+_spooler = None
+_spooler_lock = threading.Lock()
+
+
+def get_printer():
+    """Process-wide spooler configured from config.PRINTER_CONFIG."""
+    global _spooler
+    with _spooler_lock:
+        if _spooler is None:
+            from config import PRINTER_CONFIG
+            _spooler = PrintSpooler(backend_from_config(PRINTER_CONFIG),
+                                    format=PRINTER_CONFIG.get('format', 'escpos'),
+                                    max_attempts=PRINTER_CONFIG.get('max_attempts', 5),
+                                    backoff=PRINTER_CONFIG.get('retry_backoff', 1.0),
+                                    max_backoff=PRINTER_CONFIG.get('retry_backoff_max', 30.0),
+                                    width=PRINTER_CONFIG.get('width', 42))
+        return _spooler
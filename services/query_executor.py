@@ -0,0 +1,202 @@
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Slot
+
+from config import DATABASE_CONFIG
+
+
+class QueryFuture(QObject):
+    """Result of a call submitted to QueryExecutor.
+
+    `finished(result)` / `failed(error)` are emitted on the thread that owns
+    the future (the GUI thread), so connected slots may touch widgets. A
+    cancelled future never emits, even if its worker already ran.
+    """
+    finished = Signal(object)
+    failed = Signal(object)
+    _completed = Signal(object, object)  # worker -> owner thread hand-off
+
+    def __init__(self, executor, parent=None):
+        super().__init__(parent)
+        self._executor = executor
+        self._task = None
+        self._cancelled = False
+        self._done = False
+        self._result = None
+        self._error = None
+        self._completed.connect(self._deliver)
+
+    def then(self, on_result, on_error=None):
+        self.finished.connect(on_result)
+        if on_error is not None:
+            self.failed.connect(on_error)
+        return self
+
+    def cancel(self):
+        """Drops the result; a call still waiting in the queue is not run at all."""
+        if self._done or self._cancelled:
+            return
+        self._cancelled = True
+        if self._task is not None and self._executor.pool.tryTake(self._task):
+            # Never started: nothing will be delivered
+            self._task = None
+            self._executor._forget(self)
+        else:
+            # Running: stays referenced until its (ignored) result arrives
+            self._executor._forget(self, pending=False)
+
+    def cancelled(self):
+        return self._cancelled
+
+    def done(self):
+        return self._done
+
+    def result(self):
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    @Slot(object, object)
+    def _deliver(self, result, error):
+        self._task = None
+        self._executor._forget(self)
+        if self._cancelled:
+            return
+        self._done = True
+        self._result, self._error = result, error
+        try:
+            if error is None:
+                self.finished.emit(result)
+            else:
+                self.failed.emit(error)
+        except RuntimeError as e:
+            # Receiver widget was closed while the query ran
+            print(f"Dropped query result: {e}")
+
+
+class _QueryTask(QRunnable):
+    def __init__(self, future, fn, args, kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.future = future
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+
+    def run(self):
+        if self.future._cancelled:
+            self.future._completed.emit(None, None)
+            return
+        try:
+            result, error = self.fn(*self.args, **self.kwargs), None
+        except Exception as e:
+            print(f"Background query failed: {e}")
+            result, error = None, e
+        self.future._completed.emit(result, error)
+
+
+class QueryExecutor:
+    """Runs model calls on a QThreadPool so the Qt event loop never waits on MySQL.
+
+    Worker threads are capped at the connection pool size; each call borrows
+    its own pooled connection. submit(..., key=...) cancels the previous
+    call submitted under the same key, so a superseded search or reload
+    never lands on screen.
+    """
+    def __init__(self, max_threads=None):
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads or max(1, DATABASE_CONFIG.get('pool_size', 1)))
+        self._lock = threading.Lock()
+        self._pending = set()   # keeps futures alive until delivered
+        self._latest = {}       # key -> most recent future
+
+    def submit(self, fn, *args, key=None, **kwargs):
+        future = QueryFuture(self)
+        with self._lock:
+            if key is not None:
+                previous = self._latest.get(key)
+                self._latest[key] = future
+            self._pending.add(future)
+        if key is not None and previous is not None:
+            previous.cancel()
+        future._task = _QueryTask(future, fn, args, kwargs)
+        self.pool.start(future._task)
+        return future
+
+    def cancel(self, key):
+        with self._lock:
+            future = self._latest.get(key)
+        if future is not None:
+            future.cancel()
+
+    def _forget(self, future, pending=True):
+        with self._lock:
+            if pending:
+                self._pending.discard(future)
+            for key, latest in list(self._latest.items()):
+                if latest is future:
+                    del self._latest[key]
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def wait(self, msecs=-1):
+        """Blocks until queued calls finish (shutdown, scripts)."""
+        return self.pool.waitForDone(msecs)
+
+
+class _CompletedFuture:
+    def __init__(self, result=None, error=None):
+        self._result, self._error = result, error
+
+    def then(self, on_result, on_error=None):
+        if self._error is None:
+            on_result(self._result)
+        elif on_error is not None:
+            on_error(self._error)
+        return self
+
+    def cancel(self):
+        pass
+
+    def cancelled(self):
+        return False
+
+    def done(self):
+        return True
+
+    def result(self):
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class ImmediateExecutor:
+    """Same interface as QueryExecutor but runs calls inline (scripts, benchmarks)."""
+    def submit(self, fn, *args, key=None, **kwargs):
+        try:
+            return _CompletedFuture(fn(*args, **kwargs))
+        except Exception as e:
+            print(f"Query failed: {e}")
+            return _CompletedFuture(error=e)
+
+    def cancel(self, key):
+        pass
+
+    def pending(self):
+        return 0
+
+    def wait(self, msecs=-1):
+        return True
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Process-wide executor shared by every window."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = QueryExecutor()
+        return _executor
@@ -0,0 +1,188 @@
+import bisect
+import heapq
+import re
+import threading
+
+from database.events import events, INVENTORY_CHANGED
+from database.models import Medicine
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+
+def trigrams(word):
+    padded = f"${word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class InventorySearchIndex:
+    """In-memory product finder for the POS.
+
+    Words from name, company, strength and form go into a sorted vocabulary
+    (prefix lookups by bisection, i.e. a flattened trie) and a trigram index
+    used to rescue misspelt words. Rows are projected to the columns the POS
+    list needs; stock figures in here are only a hint, callers should re-read
+    the authoritative value with Medicine.get_stock_levels().
+    """
+    FIELDS = ('medicine_name', 'company', 'strength', 'form')
+    COLUMNS = "id, medicine_name, company, strength, form, barcode, price, stock_qty"
+    MAX_PREFIX_WORDS = 2000   # cap for very short prefixes such as "a"
+    FUZZY_MIN_SIMILARITY = 0.4
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.docs = {}          # id -> row dict
+        self._words = {}        # word -> set(ids)
+        self._vocab = []        # sorted list of words
+        self._trigrams = {}     # trigram -> set(words)
+        self._barcodes = {}     # barcode -> id
+        self._doc_words = {}    # id -> set(words), for removal
+        self._names = {}        # id -> lower-cased medicine_name, for ranking
+        self.built = False
+
+    # --- Maintenance -------------------------------------------------------
+    def build(self, rows=None):
+        if rows is None:
+            rows = Medicine.db.fetch_all(f"SELECT {self.COLUMNS} FROM inventory")
+        with self._lock:
+            self._reset()
+            for row in rows:
+                self._add(row, bulk=True)
+            self._vocab = sorted(self._words)
+            self.built = True
+
+    def refresh_ids(self, ids):
+        """Re-reads the given inventory rows and patches them into the index."""
+        ids = list(ids or [])
+        if not ids:
+            return
+        placeholders = ", ".join(["%s"] * len(ids))
+        rows = Medicine.db.fetch_all(
+            f"SELECT {self.COLUMNS} FROM inventory WHERE id IN ({placeholders})", ids)
+        with self._lock:
+            for med_id in ids:
+                self._remove(med_id)
+            for row in rows:
+                self._add(row)
+
+    def _add(self, row, bulk=False):
+        med_id = row['id']
+        self.docs[med_id] = row
+        self._names[med_id] = (row.get('medicine_name') or "").lower()
+        words = set()
+        for field in self.FIELDS:
+            words.update(tokenize(row.get(field)))
+        self._doc_words[med_id] = words
+        for word in words:
+            if word not in self._words:
+                self._words[word] = set()
+                if not bulk:
+                    bisect.insort(self._vocab, word)
+                for tri in trigrams(word):
+                    self._trigrams.setdefault(tri, set()).add(word)
+            self._words[word].add(med_id)
+        if row.get('barcode'):
+            self._barcodes[row['barcode']] = med_id
+
+    def _remove(self, med_id):
+        row = self.docs.pop(med_id, None)
+        if row is None:
+            return
+        self._names.pop(med_id, None)
+        for word in self._doc_words.pop(med_id, ()):
+            ids = self._words.get(word)
+            if ids is None:
+                continue
+            ids.discard(med_id)
+            if not ids:
+                del self._words[word]
+                del self._vocab[bisect.bisect_left(self._vocab, word)]
+                for tri in trigrams(word):
+                    self._trigrams.get(tri, set()).discard(word)
+        if row.get('barcode') and self._barcodes.get(row['barcode']) == med_id:
+            del self._barcodes[row['barcode']]
+
+    # --- Queries -----------------------------------------------------------
+    def _prefix_words(self, prefix):
+        start = bisect.bisect_left(self._vocab, prefix)
+        for word in self._vocab[start:start + self.MAX_PREFIX_WORDS]:
+            if not word.startswith(prefix):
+                break
+            yield word
+
+    def _fuzzy_words(self, token):
+        grams = trigrams(token)
+        counts = {}
+        for tri in grams:
+            for word in self._trigrams.get(tri, ()):
+                counts[word] = counts.get(word, 0) + 1
+        for word, shared in counts.items():
+            similarity = shared / max(len(grams), len(word) + 1)
+            if similarity >= self.FUZZY_MIN_SIMILARITY:
+                yield word, similarity
+
+    def _token_scores(self, token):
+        scores = {}
+        for word in self._prefix_words(token):
+            weight = 1.0 if word == token else 0.8
+            for med_id in self._words[word]:
+                if scores.get(med_id, 0) < weight:
+                    scores[med_id] = weight
+        if not scores and len(token) >= 3:
+            # Nothing starts with it: treat as a typo and fall back to trigram similarity
+            for word, similarity in self._fuzzy_words(token):
+                weight = 0.6 * similarity
+                for med_id in self._words[word]:
+                    if scores.get(med_id, 0) < weight:
+                        scores[med_id] = weight
+        return scores
+
+    def search(self, term, limit=50):
+        tokens = tokenize(term)
+        if not tokens:
+            return []
+        with self._lock:
+            scores = None
+            for token in tokens:
+                token_scores = self._token_scores(token)
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {i: s + token_scores[i] for i, s in scores.items() if i in token_scores}
+                if not scores:
+                    return []
+
+            needle = term.strip().lower()
+            names = self._names
+
+            def rank(med_id):
+                bonus = 2.0 if names[med_id].startswith(needle) else 0.0
+                return (-(scores[med_id] + bonus), names[med_id])
+
+            return [dict(self.docs[i]) for i in heapq.nsmallest(limit, scores, key=rank)]
+
+    def find_by_barcode(self, barcode):
+        with self._lock:
+            med_id = self._barcodes.get(barcode)
+            return dict(self.docs[med_id]) if med_id is not None else None
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_inventory_index():
+    """Process-wide index, built on first use and kept current through inventory.changed events."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = InventorySearchIndex()
+            _index.build()
+            events.subscribe(INVENTORY_CHANGED, _index.refresh_ids)
+        return _index
@@ -1,5 +1,9 @@
+import copy
 import json
 import os
+import threading
+
+from database.events import events, TEMPLATE_CHANGED
 
 class TemplateService:
     DEFAULT_TEMPLATE = {
@@ -34,31 +38,159 @@ class TemplateService:
 
     FILE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "bill_template.json")
 
+    # (mtime_ns, size, template) of the file as last read; see load_template
+    _cache = None
+    _lock = threading.Lock()
+    _styles = {}
+
     @classmethod
     def load_template(cls):
-        if not os.path.exists(cls.FILE_PATH):
-            os.makedirs(os.path.dirname(cls.FILE_PATH), exist_ok=True)
-            cls.save_template(cls.DEFAULT_TEMPLATE)
-            return cls.DEFAULT_TEMPLATE
-        
+        """The saved template, parsed once per version of the file.
+
+        Every caller shares the returned dict until the file changes (its
+        mtime or size differ), so treat it as read-only; deep-copy it to edit.
+        """
         try:
-            with open(cls.FILE_PATH, 'r') as f:
-                return json.load(f)
-        except Exception as e:
+            st = os.stat(cls.FILE_PATH)
+        except FileNotFoundError:
+            # First run: nothing was loaded before, so there is no change to announce
+            if cls._write(cls.DEFAULT_TEMPLATE):
+                return cls.load_template()
+            return copy.deepcopy(cls.DEFAULT_TEMPLATE)
+        except OSError as e:
             print(f"Error loading template: {e}")
-            return cls.DEFAULT_TEMPLATE
+            return copy.deepcopy(cls.DEFAULT_TEMPLATE)
+
+        cached = cls._cache
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        with cls._lock:
+            try:
+                with open(cls.FILE_PATH, 'r') as f:
+                    template = json.load(f)
+            except Exception as e:
+                print(f"Error loading template: {e}")
+                return copy.deepcopy(cls.DEFAULT_TEMPLATE)
+            cls._cache = (st.st_mtime_ns, st.st_size, template)
+            return template
 
     @classmethod
-    def save_template(cls, template_data):
+    def style(cls, template=None):
+        """TemplateStyle for `template` (default: the saved one), derived once per template version.
+
+        Builds Qt objects, so call it from the GUI thread.
+        """
+        template = template or cls.load_template()
+        cached = cls._cache
+        if cached and template is cached[2]:
+            key = cached[:2]
+        else:
+            # An unsaved template, e.g. the designer's live preview
+            key = json.dumps(template, sort_keys=True)
+        style = cls._styles.get(key)
+        if style is None:
+            if len(cls._styles) >= 32:
+                cls._styles.clear()
+            style = cls._styles[key] = TemplateStyle(template)
+        return style
+
+    @classmethod
+    def _write(cls, template_data):
         try:
             os.makedirs(os.path.dirname(cls.FILE_PATH), exist_ok=True)
             with open(cls.FILE_PATH, 'w') as f:
                 json.dump(template_data, f, indent=4)
-            return True
         except Exception as e:
             print(f"Error saving template: {e}")
             return False
+        return True
+
+    @classmethod
+    def save_template(cls, template_data):
+        if not cls._write(template_data):
+            return False
+        with cls._lock:
+            # Keep our own copy: the caller (usually the designer) goes on editing its dict
+            cls._cache = None
+        events.publish(TEMPLATE_CHANGED, cls.load_template())
+        return True
 
     @classmethod
     def reset_template(cls):
-        return cls.save_template(cls.DEFAULT_TEMPLATE)
+        return cls.save_template(copy.deepcopy(cls.DEFAULT_TEMPLATE))
+
+
+def to_qcolor(value, fallback="#000000"):
+    """QColor from a template colour: #hex, a colour name or CSS rgba(r, g, b, a)."""
+    from PySide6.QtGui import QColor
+    value = (value or fallback).strip()
+    if value.startswith('rgb'):
+        try:
+            parts = [float(p) for p in value[value.index('(') + 1:value.rindex(')')].split(',')]
+            color = QColor(*[int(p) for p in parts[:3]])
+            if len(parts) > 3:
+                color.setAlphaF(parts[3])
+            return color
+        except ValueError:
+            value = fallback
+    color = QColor(value)
+    return color if color.isValid() else QColor(fallback)
+
+
+class TemplateStyle:
+    """Qt fonts, colours and stylesheet strings derived from one template version."""
+    MONO_FAMILY = "JetBrains Mono"
+
+    def __init__(self, template):
+        self.template = template
+        store, theme, table, footer = (template.get(k, {}) for k in ('store', 'theme', 'table', 'footer'))
+        self.family = theme.get('font_family', 'Inter')
+        self.primary = to_qcolor(theme.get('primary'), '#2C7878')
+        self.accent = to_qcolor(theme.get('accent'), '#0F172A')
+        self.text = to_qcolor(theme.get('text'), '#0F172A')
+        self.store_color = to_qcolor(store.get('color'), '#0F172A')
+        self.header_bg = to_qcolor(table.get('header_bg'), '#EEF5F5')
+        self.header_text = to_qcolor(table.get('header_text'), '#2C7878')
+        self.row_border = to_qcolor(table.get('row_border'), '#F1F5F9')
+        self.thanks_color = to_qcolor(footer.get('thanks_color'), '#2C7878')
+        self.columns = list(table.get('columns') or TemplateService.DEFAULT_TEMPLATE['table']['columns'])
+        self._fonts = {}
+        self._metrics = {}
+
+        primary = theme.get('primary', '#2C7878')
+        self.primary_button_qss = f"background: {primary}; color: white; border-radius: 8px; font-weight: bold;"
+        self.outline_button_qss = (f"background: white; color: {primary}; border: 2px solid {primary}; "
+                                   f"border-radius: 8px; font-weight: bold;")
+        self.table_header_qss = f"""
+            QTableWidget {{ border: none; background: white; }}
+            QHeaderView::section {{
+                background: {table.get('header_bg', '#EEF5F5')};
+                color: {table.get('header_text', '#2C7878')};
+                padding: 10px;
+                border: none;
+                font-weight: bold;
+                font-size: 11px;
+            }}
+        """
+
+    def font(self, size, bold=False, italic=False, weight=None, mono=False):
+        """Shared QFont in the template's family (or the monospace one); don't modify it."""
+        key = (size, bold, italic, weight, mono)
+        font = self._fonts.get(key)
+        if font is None:
+            from PySide6.QtGui import QFont
+            font = QFont(self.MONO_FAMILY if mono else self.family, size)
+            font.setBold(bold)
+            font.setItalic(italic)
+            if weight is not None:
+                font.setWeight(weight)
+            self._fonts[key] = font
+        return font
+
+    def metrics(self, *font_args, **font_kwargs):
+        key = (font_args, tuple(sorted(font_kwargs.items())))
+        metrics = self._metrics.get(key)
+        if metrics is None:
+            from PySide6.QtGui import QFontMetrics
+            metrics = self._metrics[key] = QFontMetrics(self.font(*font_args, **font_kwargs))
+        return metrics
@@ -0,0 +1,142 @@
+import json
+import time
+from datetime import datetime
+
+import pytest
+from mysql.connector import errors
+
+from database.audit import AuditWriter, _decode, _encode, is_connection_error
+
+
+def entry(n, action='LOGIN'):
+    return (1, action, f"detail {n}", datetime(2024, 5, 1, 10, 0, n))
+
+
+class FakeTable:
+    """Stands in for AuditLog.write_many; `down` makes it unreachable, `refuse` rejects those actions."""
+    def __init__(self):
+        self.rows = []
+        self.calls = 0
+        self.down = False
+        self.down_after = None      # fail once this many calls have succeeded
+        self.refuse = set()
+
+    def __call__(self, batch):
+        self.calls += 1
+        if self.down or (self.down_after is not None and self.calls > self.down_after):
+            raise errors.InterfaceError(msg="Can't connect to MySQL server", errno=2003)
+        if any(e[1] in self.refuse for e in batch):
+            raise errors.IntegrityError(msg="foreign key constraint fails", errno=1452)
+        self.rows.extend(batch)
+
+
+@pytest.fixture
+def table():
+    return FakeTable()
+
+
+@pytest.fixture
+def make_writer(tmp_path, table):
+    writers = []
+
+    def make(**kwargs):
+        kwargs.setdefault('spill_path', str(tmp_path / 'audit_spill.jsonl'))
+        kwargs.setdefault('rejects_path', str(tmp_path / 'audit_rejects.jsonl'))
+        kwargs.setdefault('retry_interval', 0)
+        writer = AuditWriter(table, **kwargs)
+        writers.append(writer)
+        return writer
+
+    yield make
+    for writer in writers:
+        writer.close()
+
+
+def read_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_entries_are_written_in_batches(make_writer, table):
+    writer = make_writer(batch_size=3, flush_interval=60)
+    for n in range(7):
+        writer.log(entry(n))
+    assert writer.flush()
+    assert table.rows == [entry(n) for n in range(7)]
+    stats = writer.stats()
+    assert stats['written'] == 7 and stats['logged'] == 7
+    assert stats['batches'] == 3
+
+
+def test_unreachable_database_spills_then_replays_in_order(make_writer, table, tmp_path):
+    writer = make_writer(retry_interval=0.05)
+    table.down = True
+    writer.log(entry(1))
+    writer.log(entry(2))
+    assert writer.flush()
+    assert table.rows == []
+    assert writer._spill_waiting()
+    assert writer.stats()['spilled'] == 2
+
+    table.down = False
+    time.sleep(0.1)     # entries logged within retry_interval of the failure are spilled too
+    writer.log(entry(3))
+    assert writer.flush()
+    # Spilled entries go in ahead of the new one
+    assert table.rows == [entry(1), entry(2), entry(3)]
+    assert writer.stats()['replayed'] == 2
+    assert not any(p.name.startswith('audit_spill') for p in tmp_path.iterdir())
+
+
+def test_refused_entry_is_isolated_into_rejects_file(make_writer, table):
+    writer = make_writer(batch_size=10, flush_interval=60)
+    table.refuse = {'BAD'}
+    for n in range(5):
+        writer.log(entry(n, 'BAD' if n == 3 else 'LOGIN'))
+    assert writer.flush()
+    assert table.rows == [entry(n) for n in (0, 1, 2, 4)]
+    rejects = read_lines(writer.rejects_path)
+    assert len(rejects) == 1
+    assert _decode(rejects[0]['entry']) == entry(3, 'BAD')
+    assert '1452' in rejects[0]['error']
+    stats = writer.stats()
+    assert (stats['written'], stats['rejected'], stats['spilled']) == (4, 1, 0)
+
+
+def test_partial_replay_keeps_only_the_unsent_tail(make_writer, table):
+    writer = make_writer(batch_size=2)
+    writer._spill([entry(n) for n in range(5)])
+    table.down_after = 1    # the second chunk finds the database gone
+
+    writer._replay()
+    assert table.rows == [entry(0), entry(1)]
+    left = [_decode(v) for v in read_lines(writer._replay_path())]
+    assert left == [entry(2), entry(3), entry(4)]
+
+    # A restart must not insert the first chunk again
+    table.down_after = None
+    writer._replay()
+    assert table.rows == [entry(n) for n in range(5)]
+    assert writer.replayed == 5
+    assert not writer._spill_waiting()
+
+
+def test_log_after_close_goes_to_spill_file(make_writer, table):
+    writer = make_writer()
+    writer.log(entry(1))
+    writer.close()
+    writer.log(entry(2))
+    assert table.rows == [entry(1)]
+    assert [_decode(v) for v in read_lines(writer.spill_path)] == [entry(2)]
+
+
+def test_encode_round_trip():
+    assert _decode(json.loads(json.dumps(_encode(entry(7))))) == entry(7)
+
+
+def test_connection_errors_are_transient():
+    assert is_connection_error(errors.InterfaceError(msg="gone", errno=2013))
+    assert is_connection_error(errors.DatabaseError(msg="server has gone away", errno=2006))
+    assert is_connection_error(ConnectionResetError())
+    assert not is_connection_error(errors.IntegrityError(msg="duplicate", errno=1062))
+    assert not is_connection_error(ValueError("bad entry"))
@@ -0,0 +1,87 @@
+import pytest
+
+from database import cache
+from database.cache import LRUCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, 'monotonic', clock)
+    return clock
+
+
+def row(med_id):
+    return {'id': med_id, 'medicine_name': f"Med {med_id}"}
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    c = LRUCache(maxsize=2, ttl=60)
+    c.put('a', 1)
+    c.put('b', 2)
+    assert c.get('a') == 1   # 'b' is now the oldest
+    c.put('c', 3)
+    assert c.get('b') is None
+    assert c.get('a') == 1 and c.get('c') == 3
+    assert c.stats()['evictions'] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    c = LRUCache(maxsize=10, ttl=5)
+    c.put('a', 1)
+    clock.now += 4.9
+    assert c.get('a') == 1
+    clock.now += 0.2
+    assert c.get('a') is None
+    stats = c.stats()
+    assert stats['expirations'] == 1 and stats['size'] == 0
+
+
+def test_put_refreshes_ttl_and_replaces_value(clock):
+    c = LRUCache(maxsize=10, ttl=5)
+    c.put('a', 1)
+    clock.now += 4
+    c.put('a', 2)
+    clock.now += 4
+    assert c.get('a') == 2
+    assert c.stats()['size'] == 1
+
+
+def test_invalidate_index_drops_every_key_for_a_row(clock):
+    c = LRUCache(maxsize=10, ttl=60, index=lambda r: r['id'])
+    c.put('111', row(1))
+    c.put('0111', row(1))   # same product scanned with a different barcode
+    c.put('222', row(2))
+    c.invalidate_index([1, 99])
+    assert c.get('111') is None and c.get('0111') is None
+    assert c.get('222') == row(2)
+    assert c.stats()['invalidations'] == 2
+
+
+def test_index_follows_replaced_and_evicted_values(clock):
+    c = LRUCache(maxsize=1, ttl=60, index=lambda r: r['id'])
+    c.put('111', row(1))
+    c.put('111', row(2))     # barcode moved to another product
+    c.invalidate_index([1])
+    assert c.get('111') == row(2)
+    c.put('222', row(3))     # evicts '111'
+    assert c._keys_by_index == {3: {'222'}}
+
+
+def test_hit_rate_and_uncounted_misses(clock):
+    c = LRUCache(maxsize=10, ttl=60)
+    c.put('a', 1)
+    c.get('a')
+    c.get('b')
+    c.get('c', count_miss=False)
+    stats = c.stats()
+    assert (stats['hits'], stats['misses']) == (1, 1)
+    assert stats['hit_rate'] == 0.5
@@ -0,0 +1,137 @@
+import threading
+import time
+
+import pytest
+from mysql.connector import errors
+
+from database.connection import ConnectionPool, Database, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self, n):
+        self.n = n
+        self.connected = True
+        self.closed = False
+        self.reconnects = 0
+
+    def is_connected(self):
+        return self.connected
+
+    def reconnect(self, attempts=1, delay=0):
+        self.reconnects += 1
+        self.connected = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool():
+    pool = ConnectionPool({}, size=2, timeout=0.05, health_check_idle=0.0)
+    made = []
+
+    def new_connection():
+        conn = FakeConnection(len(made))
+        made.append(conn)
+        return conn
+
+    pool._new_connection = new_connection
+    pool.made = made
+    return pool
+
+
+def test_release_reuses_idle_connection(pool):
+    conn = pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn
+    assert len(pool.made) == 1
+    assert pool.stats()['borrows'] == 2
+
+
+def test_acquire_times_out_when_pool_exhausted(pool):
+    pool.acquire()
+    pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    stats = pool.stats()
+    assert stats['in_use'] == 2 and stats['open'] == 2
+    assert stats['waits'] == 0  # only waits that ended with a connection are counted
+
+
+def test_release_wakes_a_waiting_thread(pool):
+    pool.timeout = 2.0
+    first, second = pool.acquire(), pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    time.sleep(0.05)
+    pool.release(first)
+    waiter.join(1.0)
+    assert got == [first]
+    assert pool.stats()['waits'] == 1
+
+
+def test_discard_frees_the_slot_for_a_new_connection(pool):
+    first, second = pool.acquire(), pool.acquire()
+    pool.discard(first)
+    assert first.closed
+    third = pool.acquire()
+    assert third is not first and len(pool.made) == 3
+    assert pool.stats()['open'] == 2
+
+
+def test_failed_connect_does_not_leak_a_slot(pool):
+    def refuse():
+        raise OSError("connection refused")
+    good = pool._new_connection
+    pool._new_connection = refuse
+    for _ in range(3):
+        with pytest.raises(OSError):
+            pool.acquire()
+    assert pool.stats()['open'] == 0 and pool.stats()['in_use'] == 0
+    pool._new_connection = good
+    pool.acquire()
+    pool.acquire()
+
+
+def test_idle_dead_connection_is_reconnected(pool):
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.connected = False
+    time.sleep(0.01)
+    assert pool.acquire() is conn
+    assert conn.reconnects == 1
+    assert pool.stats()['reconnects'] == 1
+
+
+def test_close_drops_idle_connections(pool):
+    a, b = pool.acquire(), pool.acquire()
+    pool.release(a)
+    pool.close()
+    assert a.closed and not b.closed
+    assert pool.stats()['open'] == 1
+
+
+@pytest.fixture
+def db(pool, monkeypatch):
+    monkeypatch.setattr(Database, '_pool', pool)
+    return Database(pooled=True)
+
+
+def test_lease_discards_connection_lost_mid_block(db, pool):
+    with pytest.raises(errors.OperationalError):
+        with db.lease() as conn:
+            raise errors.OperationalError(msg="Lost connection to MySQL server during query", errno=2013)
+    assert conn.closed
+    assert pool.stats()['open'] == 0 and pool.stats()['in_use'] == 0
+    with db.lease() as fresh:
+        assert fresh is not conn
+
+
+def test_lease_returns_connection_after_other_errors(db, pool):
+    with pytest.raises(ValueError):
+        with db.lease() as conn:
+            raise ValueError("bad row")
+    assert not conn.closed
+    with db.lease() as again:
+        assert again is conn
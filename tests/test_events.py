@@ -0,0 +1,56 @@
+from database.events import EventBus
+
+
+def test_publish_reaches_every_subscriber_of_the_topic():
+    bus = EventBus()
+    got = []
+    bus.subscribe('a', lambda *args: got.append(('first', args)))
+    bus.subscribe('a', lambda *args: got.append(('second', args)))
+    bus.subscribe('b', lambda *args: got.append(('other', args)))
+    bus.publish('a', [1, 2])
+    assert got == [('first', ([1, 2],)), ('second', ([1, 2],))]
+
+
+def test_unsubscribe_stops_delivery():
+    bus = EventBus()
+    got = []
+    callback = bus.subscribe('a', got.append)
+    bus.unsubscribe('a', callback)
+    bus.publish('a', 1)
+    assert got == []
+
+
+def test_unsubscribe_unknown_callback_is_a_no_op():
+    bus = EventBus()
+    bus.unsubscribe('a', print)
+    bus.subscribe('a', print)
+    bus.unsubscribe('a', len)
+
+
+def test_unsubscribing_during_publish_does_not_skip_others():
+    bus = EventBus()
+    got = []
+
+    def once(value):
+        got.append(('once', value))
+        bus.unsubscribe('a', once)
+
+    bus.subscribe('a', once)
+    bus.subscribe('a', lambda value: got.append(('always', value)))
+    bus.publish('a', 1)
+    bus.publish('a', 2)
+    assert got == [('once', 1), ('always', 1), ('always', 2)]
+
+
+def test_failing_subscriber_is_skipped(capsys):
+    bus = EventBus()
+    got = []
+
+    def broken(value):
+        raise RuntimeError("boom")
+
+    bus.subscribe('a', broken)
+    bus.subscribe('a', got.append)
+    bus.publish('a', 1)
+    assert got == [1]
+    assert "boom" in capsys.readouterr().out
@@ -0,0 +1,95 @@
+import glob
+import os
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from openpyxl import load_workbook
+
+from services.excel_exporter import (DATE_FORMAT, DATETIME_FORMAT, INT_FORMAT, MONEY_FORMAT, Column,
+                                     ExportCancelled, SheetSpec, write_workbook)
+
+
+class Stream:
+    """Generator of row dicts that records close(), like Database.stream()."""
+    def __init__(self, rows):
+        self.rows = rows
+        self.closed = False
+        self.yielded = 0
+
+    def __iter__(self):
+        for row in self.rows:
+            self.yielded += 1
+            yield row
+
+    def close(self):
+        self.closed = True
+
+
+COLUMNS = [
+    Column("Bill No", 'bill_no'),
+    Column("Date", 'created_at', DATETIME_FORMAT),
+    Column("Expiry", 'expiry', DATE_FORMAT),
+    Column("Qty", 'qty', INT_FORMAT),
+    Column("Total", 'total', MONEY_FORMAT),
+    Column("Customer", lambda r: r.get('customer') or "Walk-in"),
+]
+
+
+def sale(n, **overrides):
+    row = {'bill_no': f"INV-{n}", 'created_at': datetime(2024, 5, 1, 9, n), 'expiry': date(2026, 1, n + 1),
+           'qty': n, 'total': Decimal(f"{n}.50"), 'customer': None}
+    row.update(overrides)
+    return row
+
+
+def test_rows_stream_into_typed_cells(tmp_path):
+    path = str(tmp_path / 'sales.xlsx')
+    stream = Stream([sale(1, customer="Ali"), sale(2, total=None, created_at=None)])
+    progress = []
+    assert write_workbook(path, [SheetSpec("Sales", COLUMNS, stream)], progress=lambda *a: progress.append(a)) == 2
+    assert stream.closed
+    assert progress == [(2, 2)]
+
+    ws = load_workbook(path)['Sales']
+    rows = list(ws.iter_rows())
+    assert [c.value for c in rows[0]] == [c.header for c in COLUMNS]
+    bill, created, expiry, qty, total, customer = rows[1]
+    assert bill.value == 'INV-1' and customer.value == 'Ali'
+    assert created.value == datetime(2024, 5, 1, 9, 1) and created.number_format == DATETIME_FORMAT
+    assert expiry.value == datetime(2026, 1, 2) and expiry.number_format == DATE_FORMAT
+    assert qty.value == 1 and qty.number_format == INT_FORMAT
+    assert total.value == 1.5 and total.number_format == MONEY_FORMAT
+    # None stays an empty cell rather than a formatted blank
+    second = rows[2]
+    assert second[1].value is None and second[4].value is None
+    assert second[5].value == 'Walk-in'
+
+
+def test_sheets_report_progress_against_known_total(tmp_path):
+    path = str(tmp_path / 'two.xlsx')
+    sheets = [SheetSpec("A", COLUMNS, Stream([sale(n) for n in range(1, 4)]), total=3),
+              SheetSpec("B" * 40, COLUMNS, Stream([sale(4)]), total=1)]
+    progress = []
+    assert write_workbook(path, sheets, progress=lambda *a: progress.append(a), progress_every=2) == 4
+    assert progress == [(2, 4), (4, 4), (4, 4)]
+    assert load_workbook(path).sheetnames == ["A", "B" * 31]
+
+
+def openpyxl_temp_files():
+    return set(glob.glob(os.path.join(tempfile.gettempdir(), 'openpyxl.*')))
+
+
+def test_cancel_stops_and_closes_every_stream(tmp_path):
+    path = tmp_path / 'cancelled.xlsx'
+    temp_files = openpyxl_temp_files()
+    first = Stream([sale(n) for n in range(1, 10)])
+    second = Stream([sale(1)])
+    with pytest.raises(ExportCancelled):
+        write_workbook(str(path), [SheetSpec("A", COLUMNS, first), SheetSpec("B", COLUMNS, second)],
+                       cancelled=lambda: True, progress_every=3)
+    assert first.yielded == 3
+    assert first.closed and second.closed
+    assert not path.exists()
+    assert openpyxl_temp_files() <= temp_files
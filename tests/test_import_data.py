@@ -0,0 +1,141 @@
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
+
+import import_data
+from database.events import events, INVENTORY_CHANGED
+from import_data import clean_chunk, clean_row, parse_price, read_rows, row_key, text
+
+
+def raw(**overrides):
+    row = {'Drug Name': 'Panadol', 'Manufacturer': 'GSK', 'Strength': '500mg', 'Form': 'Tablet',
+           'Indication': 'Pain', 'Side Effects': '', 'Age Restriction': '',
+           'Prescription Required': 'No', 'Price': '30'}
+    row.update(overrides)
+    return row
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('Rs. 1,200', 1200.0),
+    ('rs 45.5', 45.5),
+    (12.345, 12.35),
+    ('', 0.0),
+    (None, 0.0),
+    ('nan', 0.0),
+    (float('nan'), 0.0),
+])
+def test_parse_price(value, expected):
+    assert parse_price(value) == expected
+
+
+@pytest.mark.parametrize('value', ['-5', '100000000', 'ask supplier'])
+def test_parse_price_rejects(value):
+    with pytest.raises(ValueError):
+        parse_price(value)
+
+
+def test_text_collapses_whitespace_and_excel_floats():
+    row = {'Drug Name': '  Panadol \n Extra ', 'Strength': 500.0, 'Form': 2.5, 'Blank': '   '}
+    assert text(row, 'Drug Name') == 'Panadol Extra'
+    assert text(row, 'Strength') == '500'
+    assert text(row, 'Form') == '2.5'
+    assert text(row, 'Blank', 'No') == 'No'
+    assert text(row, 'Missing', 'No') == 'No'
+
+
+def test_clean_row_defaults():
+    data = clean_row(raw(Manufacturer='', Barcode='  ', **{'Prescription Required': 'YES'}))
+    assert data['medicine_name'] == 'Panadol'
+    assert data['company'] == 'Generic'
+    assert data['barcode'] is None
+    assert data['prescription_required'] is True
+    assert data['price'] == 30.0
+
+
+@pytest.mark.parametrize('row, reason', [
+    (raw(**{'Drug Name': '  '}), 'missing Drug Name'),
+    (raw(Strength='x' * 101), 'Strength longer than 100'),
+    (raw(Price='free'), 'unreadable price'),
+])
+def test_clean_row_rejects(row, reason):
+    with pytest.raises(ValueError, match=reason):
+        clean_row(row)
+
+
+def test_row_key_ignores_case_and_prefers_barcode():
+    assert row_key(clean_row(raw())) == row_key(clean_row(raw(**{'Drug Name': 'PANADOL', 'Form': 'tablet'})))
+    assert row_key(clean_row(raw())) != row_key(clean_row(raw(Strength='1g')))
+    with_barcode = clean_row(raw(Barcode='8964000000011'))
+    assert row_key(with_barcode) == row_key(clean_row(raw(Barcode='8964000000011', **{'Drug Name': 'Other'})))
+    assert row_key(with_barcode) != row_key(clean_row(raw()))
+
+
+def test_clean_chunk_splits_staged_and_rejected():
+    staged, rejected = clean_chunk([(2, raw()), (3, raw(Price='-1')), (4, raw(**{'Drug Name': 'Brufen'}))])
+    columns = import_data.InventoryImport.COLUMNS
+    assert [dict(zip(columns, t))['line_no'] for t in staged] == [2, 4]
+    assert [(line_no, reason) for line_no, _, reason in rejected] == [(3, "price out of range '-1'")]
+
+
+def test_cleaned_chunks_inline_keeps_file_order():
+    rows = [(n, raw(**{'Drug Name': f"Med {n}"})) for n in range(2, 9)]
+    results = list(import_data.cleaned_chunks(iter(rows), workers=0, chunk_size=3))
+    assert [len(staged) for staged, _ in results] == [3, 3, 1]
+    columns = import_data.InventoryImport.COLUMNS
+    names = [dict(zip(columns, t))['medicine_name'] for staged, _ in results for t in staged]
+    assert names == [f"Med {n}" for n in range(2, 9)]
+
+
+def test_read_rows_streams_csv_with_line_numbers(tmp_path):
+    path = tmp_path / 'prices.csv'
+    path.write_text('Drug Name,Price\nPanadol,30\n"Brufen\nSyrup",90\nCalpol,45\n', encoding='utf-8')
+    rows = list(read_rows(str(path)))
+    # A quoted newline makes the reader's line number skip ahead
+    assert [(n, r['Drug Name']) for n, r in rows] == [(2, 'Panadol'), (4, 'Brufen\nSyrup'), (5, 'Calpol')]
+
+
+def test_read_rows_rejects_unknown_extension(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported file type '.txt'"):
+        read_rows(str(tmp_path / 'prices.txt'))
+
+
+class FakeCursor:
+    def __init__(self, rowcount=0, lastrowid=None):
+        self.rowcount = rowcount
+        self.lastrowid = lastrowid
+
+    def close(self):
+        pass
+
+
+def test_merge_publishes_updated_and_inserted_ids_after_commit(monkeypatch):
+    db = import_data.InventoryImport.db
+    log = []
+
+    @contextmanager
+    def transaction():
+        yield
+        log.append('commit')
+
+    def execute_query(query, params=None):
+        return FakeCursor(3, 41) if query.strip().startswith('INSERT') else FakeCursor()
+
+    def fetch_all(query, params=None):
+        if 'matched_id' in query:
+            return [{'matched_id': 7}, {'matched_id': 2}, {'matched_id': 7}]
+        assert params == (41,)
+        return [{'id': 41}, {'id': 42}, {'id': 43}]
+
+    monkeypatch.setattr(db, 'transaction', transaction)
+    monkeypatch.setattr(db, 'execute_query', execute_query)
+    monkeypatch.setattr(db, 'fetch_all', fetch_all)
+    callback = events.subscribe(INVENTORY_CHANGED, lambda ids: log.append(ids))
+    try:
+        assert import_data.InventoryImport.merge() == (3, 3)
+    finally:
+        events.unsubscribe(INVENTORY_CHANGED, callback)
+    assert log == ['commit', [7, 2, 41, 42, 43]]
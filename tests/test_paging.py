@@ -0,0 +1,70 @@
+from datetime import date
+
+import pytest
+
+from database.models import Medicine
+from services.paging import InventoryPager
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    sent = []
+
+    def fetch_all(query, params=None):
+        sent.append((" ".join(query.split()), params))
+        return []
+
+    monkeypatch.setattr(Medicine.db, 'fetch_all', fetch_all)
+    return sent
+
+
+def test_first_page_is_name_ordered(queries):
+    Medicine.page(limit=50, columns=['price'])
+    query, params = queries[-1]
+    assert query == "SELECT id, medicine_name, price FROM inventory ORDER BY medicine_name ASC, id ASC LIMIT %s"
+    assert params == (50,)
+
+
+def test_filtered_descending_page_continues_after_key(queries):
+    Medicine.page(after_name=date(2026, 1, 1), after_id=7, limit=20, text='50%', category='Syrup',
+                  order_by='expiry_date', descending=True)
+    query, params = queries[-1]
+    assert "LIKE %s AND category = %s AND " in query
+    assert ("(COALESCE(expiry_date, '9999-12-31') < %s OR (COALESCE(expiry_date, '9999-12-31') = %s AND id < %s))"
+            in query)
+    assert query.endswith("ORDER BY COALESCE(expiry_date, '9999-12-31') DESC, id DESC LIMIT %s")
+    assert params == ('%50\\%%', 'Syrup', date(2026, 1, 1), date(2026, 1, 1), 7, 20)
+
+
+def test_unknown_order_column_is_refused(queries):
+    with pytest.raises(ValueError):
+        Medicine.page(order_by='side_effects')
+    assert queries == []
+
+
+def test_pager_passes_query_and_keys_on_sort_column():
+    calls = []
+
+    def fetch(**kwargs):
+        calls.append(kwargs)
+        return [{'id': 4, 'medicine_name': 'Brufen', 'stock_qty': None},
+                {'id': 2, 'medicine_name': 'Amoxil', 'stock_qty': 9}]
+
+    pager = InventoryPager(page_size=2, fetch=fetch)
+    pager.set_query(text='b', order_by='stock_qty', descending=True)
+    pager.next_page()
+    assert calls[-1]['text'] == 'b' and calls[-1]['order_by'] == 'stock_qty' and calls[-1]['descending']
+    assert pager.after == (9, 2)
+    pager.next_page()
+    assert (calls[-1]['after_name'], calls[-1]['after_id']) == (9, 2)
+
+
+def test_pager_covers_rows_up_to_the_last_key():
+    pager = InventoryPager(page_size=2, fetch=lambda **kwargs: [
+        {'id': 1, 'medicine_name': 'Amoxil'}, {'id': 5, 'medicine_name': 'Calpol'}])
+    assert not pager.covers({'id': 3, 'medicine_name': 'Brufen'})
+    pager.next_page()
+    assert pager.covers({'id': 3, 'medicine_name': 'brufen'})
+    assert pager.covers({'id': 5, 'medicine_name': 'Calpol'})
+    assert not pager.covers({'id': 6, 'medicine_name': 'Calpol'})
+    assert not pager.covers({'id': 2, 'medicine_name': 'Panadol'})
@@ -0,0 +1,68 @@
+import copy
+import os
+import re
+from decimal import Decimal
+
+import pytest
+
+from services.pdf_generator import InvoicePDFGenerator, amount_in_words
+from services.template_service import TemplateService
+
+
+@pytest.mark.parametrize('amount, words', [
+    (952.5, "Nine Hundred Fifty-Two Rupees and Fifty Paise Only"),
+    (0, "Zero Rupees Only"),
+    (0.5, "Zero Rupees and Fifty Paise Only"),
+    (19.99, "Nineteen Rupees and Ninety-Nine Paise Only"),
+    (250, "Two Hundred Fifty Rupees Only"),
+    (100000, "One Lakh Rupees Only"),
+    (1234567.89, "Twelve Lakh Thirty-Four Thousand Five Hundred Sixty-Seven Rupees and Eighty-Nine Paise Only"),
+    (20000000, "Two Crore Rupees Only"),
+    (1000000000, "One Hundred Crore Rupees Only"),
+])
+def test_amount_in_words(amount, words):
+    assert amount_in_words(amount) == words
+
+
+def test_amount_in_words_accepts_decimal_and_string_and_rounds_to_paise():
+    assert amount_in_words(Decimal('1500.10')) == "One Thousand Five Hundred Rupees and Ten Paise Only"
+    assert amount_in_words('75') == "Seventy-Five Rupees Only"
+    assert amount_in_words(0.1 + 0.2) == "Zero Rupees and Thirty Paise Only"
+    assert amount_in_words(99.999) == "One Hundred Rupees Only"
+
+
+def bill(bill_no, items):
+    total = sum(item[3] for item in items)
+    return {'bill_no': bill_no, 'date': '2024-05-01', 'customer_name': 'Ali', 'customer_phone': '0300',
+            'items': items, 'subtotal': total, 'discount': 0, 'gst': 0, 'total': total}
+
+
+def page_count(pdf):
+    return len(re.findall(rb"/Type /Page\b", pdf))
+
+
+@pytest.fixture
+def generator(tmp_path):
+    return InvoicePDFGenerator(copy.deepcopy(TemplateService.DEFAULT_TEMPLATE), output_dir=str(tmp_path))
+
+
+def test_render_bytes_single_and_multi_page(generator):
+    short = generator.render_bytes(bill('INV-1', [('Panadol', 30.0, 2, 60.0, 'B-1', '2026-01')]))
+    assert short.startswith(b'%PDF') and page_count(short) == 1
+
+    items = [(f"Medicine {n}", 10.0, 1, 10.0) for n in range(80)]
+    long = generator.render_bytes(bill('INV-2', items))
+    assert long.startswith(b'%PDF') and page_count(long) == 3
+
+
+def test_render_batch_writes_one_file_per_bill(generator, tmp_path):
+    done = []
+    paths, seconds = generator.render_batch(
+        [bill('INV/7', [('Calpol', 90.0, 1, 90.0)]), bill('INV 8', [('Brufen', 50.0, 3, 150.0)])],
+        output_dir=str(tmp_path / 'batch'), progress=done.append)
+    assert [os.path.basename(p) for p in paths] == ['INV-7.pdf', 'INV-8.pdf']
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        assert data.startswith(b'%PDF') and page_count(data) == 1
+    assert done == [1, 2] and seconds >= 0
@@ -0,0 +1,161 @@
+import re
+import threading
+
+import pytest
+
+from database.events import events, PRINT_JOB_FINISHED
+from services.printer_service import GS_FEED_CUT, FilePrinter, PrintSpooler, build_escpos
+
+TEMPLATE = {'store': {'name': 'TEST PHARMACY', 'address': 'Shop 1\nMain Road'},
+            'footer': {'thanks_text': 'Thank you'}}
+
+BILL = {
+    'bill_no': 'INV-0001', 'date': '2024-05-01 10:00', 'customer_name': '',
+    'items': [('Panadol Extra', 30.0, 2, 60.0),
+              ('A' * 50, 10.0, 1, 10.0, 'B-12', '2026-01-31')],
+    'subtotal': 70.0, 'discount': 5.0, 'gst': 0.0, 'total': 65.0,
+}
+
+
+def receipt_lines(data, encoding='cp437'):
+    # Drop the ESC/POS command bytes so only the printed text is left
+    text = re.sub(r'\x1b@|\x1b[aE].|\x1d!.|\x1dVB.', '', data.decode(encoding))
+    return text.split('\n')
+
+
+class FlakyPrinter:
+    """Fails the first `failures` sends, then accepts everything."""
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.sent = []
+
+    def send(self, job):
+        if self.failures:
+            self.failures -= 1
+            raise OSError("printer offline")
+        self.sent.append(job.bill_no)
+        return 'fake'
+
+
+@pytest.fixture
+def finished():
+    jobs = []
+    callback = events.subscribe(PRINT_JOB_FINISHED, jobs.append)
+    yield jobs
+    events.unsubscribe(PRINT_JOB_FINISHED, callback)
+
+
+def spooler_for(backend, **kwargs):
+    kwargs.setdefault('backoff', 0.001)
+    kwargs.setdefault('max_backoff', 0.001)
+    return PrintSpooler(backend, template=TEMPLATE, **kwargs)
+
+
+def test_escpos_layout():
+    data = build_escpos(BILL, TEMPLATE, width=32)
+    assert data.endswith(GS_FEED_CUT)
+    lines = receipt_lines(data)
+    assert 'TEST PHARMACY' in lines and 'Main Road' in lines
+    assert 'Customer: Walk-in Customer' in lines
+    assert all(len(line) <= 32 for line in lines)
+    # A long name wraps onto a second line; batch and expiry are not printed
+    assert 'A' * 32 in lines and 'A' * 18 in lines
+    assert not any('B-12' in line for line in lines)
+    assert any(line.startswith('  2 x 30.00') and line.endswith('60.00') for line in lines)
+    assert any(line.startswith('Discount') and line.endswith('-5.00') for line in lines)
+    assert any(line.startswith('TOTAL Rs.') and line.endswith('65.00') for line in lines)
+
+
+def test_file_printer_writes_one_file_per_job(tmp_path, finished):
+    spooler = spooler_for(FilePrinter(str(tmp_path / 'out')))
+    job = spooler.submit(dict(BILL, bill_no='INV/0002'))
+    spooler.close()
+    assert job.status == 'printed' and job.attempts == 1
+    assert job.target.endswith('_INV_0002.bin')
+    with open(job.target, 'rb') as f:
+        assert f.read() == job.data
+    assert [p.name for p in (tmp_path / 'out').iterdir()] == [f"{job.id:06d}_INV_0002.bin"]
+    assert finished == [job]
+
+
+def test_failed_send_is_retried():
+    printer = FlakyPrinter(failures=2)
+    spooler = spooler_for(printer)
+    job = spooler.submit(BILL)
+    spooler.close()
+    assert job.status == 'printed' and job.attempts == 3
+    assert printer.sent == ['INV-0001']
+    stats = spooler.stats()
+    assert (stats['printed'], stats['failed'], stats['retries']) == (1, 0, 2)
+    assert job.latency is not None and stats['latency_max'] > 0
+
+
+def test_gives_up_after_max_attempts(finished):
+    spooler = spooler_for(FlakyPrinter(failures=10), max_attempts=3)
+    job = spooler.submit(BILL)
+    spooler.close()
+    assert job.status == 'failed' and job.attempts == 3
+    assert job.error == 'printer offline'
+    assert list(spooler.failed_jobs) == [job]
+    assert spooler.stats()['failed'] == 1
+    assert finished == [job]
+
+
+def test_render_failure_is_not_retried():
+    printer = FlakyPrinter()
+    spooler = spooler_for(printer)
+    job = spooler.submit(dict(BILL, items=[('Panadol', 'thirty', 1, 30.0)]))
+    spooler.close()
+    assert job.status == 'failed' and job.attempts == 0
+    assert job.error.startswith('Could not render receipt')
+    assert printer.sent == []
+
+
+def test_retry_failed_requeues_and_corrects_count():
+    printer = FlakyPrinter(failures=2)
+    spooler = spooler_for(printer, max_attempts=2)
+    job = spooler.submit(BILL)
+    spooler.close()
+    assert spooler.stats()['failed'] == 1
+
+    assert spooler.retry_failed() == [job]
+    spooler.close()
+    assert job.status == 'printed' and job.attempts == 1
+    stats = spooler.stats()
+    assert (stats['printed'], stats['failed']) == (1, 0)
+    assert not spooler.failed_jobs
+
+
+def test_submit_after_close_starts_a_new_thread():
+    printer = FlakyPrinter()
+    spooler = spooler_for(printer)
+    spooler.submit(BILL)
+    spooler.close()
+    spooler.submit(dict(BILL, bill_no='INV-0002'))
+    spooler.close()
+    assert printer.sent == ['INV-0001', 'INV-0002']
+    assert spooler.pending() == 0
+
+
+def test_close_cuts_short_a_backoff_wait():
+    spooler = spooler_for(FlakyPrinter(failures=10), backoff=30.0, max_backoff=30.0)
+    job = spooler.submit(BILL)
+    closer = threading.Thread(target=spooler.close, kwargs={'timeout': 0.05})
+    closer.start()
+    closer.join(5.0)
+    assert not closer.is_alive()
+    assert job.status == 'failed' and job.error == 'Print spooler stopped'
+
+
+def test_failed_jobs_past_the_limit_are_counted_as_dropped():
+    spooler = spooler_for(FlakyPrinter(failures=3), max_attempts=1)
+    spooler.FAILED_KEPT = 2
+    jobs = [spooler.submit(dict(BILL, bill_no=f"INV-{n}")) for n in range(3)]
+    spooler.close()
+    assert list(spooler.failed_jobs) == jobs[1:]
+    stats = spooler.stats()
+    assert (stats['failed'], stats['dropped']) == (2, 1)
+    assert spooler.retry_failed() == jobs[1:]
+    spooler.close()
+    stats = spooler.stats()
+    assert (stats['printed'], stats['failed'], stats['dropped']) == (2, 0, 1)
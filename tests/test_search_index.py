@@ -0,0 +1,90 @@
+import pytest
+
+from services import search_index
+from services.search_index import InventorySearchIndex
+
+
+ROWS = [
+    {'id': 1, 'medicine_name': 'Panadol Extra', 'company': 'GSK', 'strength': '500mg', 'form': 'Tablet',
+     'barcode': '8964000000011', 'price': 30.0, 'stock_qty': 10},
+    {'id': 2, 'medicine_name': 'Paracetamol', 'company': 'Generic', 'strength': '500mg', 'form': 'Tablet',
+     'barcode': None, 'price': 5.0, 'stock_qty': 100},
+    {'id': 3, 'medicine_name': 'Calpol', 'company': 'GSK', 'strength': '120mg', 'form': 'Syrup',
+     'barcode': '8964000000028', 'price': 90.0, 'stock_qty': 4},
+    {'id': 4, 'medicine_name': 'Amoxil', 'company': 'GSK', 'strength': '250mg', 'form': 'Capsule',
+     'barcode': None, 'price': 120.0, 'stock_qty': 0},
+]
+
+
+@pytest.fixture
+def index():
+    index = InventorySearchIndex()
+    index.build([dict(r) for r in ROWS])
+    return index
+
+
+def ids(results):
+    return [r['id'] for r in results]
+
+
+def test_whole_name_prefix_ranks_first():
+    index = InventorySearchIndex()
+    index.build([
+        {'id': 20, 'medicine_name': 'Brufen', 'company': 'Abbott', 'strength': '', 'form': 'Syrup', 'barcode': None},
+        {'id': 21, 'medicine_name': 'Syrup Base', 'company': 'Abbott', 'strength': '', 'form': 'Liquid', 'barcode': None},
+    ])
+    # Both contain the word "syrup"; only one name starts with the term
+    assert ids(index.search("syrup")) == [21, 20]
+
+
+def test_equal_scores_are_ordered_by_name(index):
+    assert ids(index.search("gsk")) == [4, 3, 1]
+
+
+def test_exact_word_beats_prefix():
+    index = InventorySearchIndex()
+    index.build([
+        {'id': 10, 'medicine_name': 'Zeta', 'company': 'Para', 'strength': '', 'form': '', 'barcode': None},
+        {'id': 11, 'medicine_name': 'Xylo', 'company': 'Paramount', 'strength': '', 'form': '', 'barcode': None},
+    ])
+    assert ids(index.search("para")) == [10, 11]
+
+
+def test_all_tokens_must_match(index):
+    assert ids(index.search("gsk 500")) == [1]
+    assert ids(index.search("gsk capsule")) == [4]
+    assert index.search("gsk injection") == []
+
+
+def test_misspelling_falls_back_to_trigrams(index):
+    assert ids(index.search("paracetmol")) == [2]
+
+
+def test_empty_or_symbol_only_term(index):
+    assert index.search("") == []
+    assert index.search("  --  ") == []
+
+
+def test_results_are_copies(index):
+    index.search("calpol")[0]['price'] = 0
+    assert index.search("calpol")[0]['price'] == 90.0
+
+
+def test_limit(index):
+    assert len(index.search("gsk", limit=2)) == 2
+
+
+def test_barcode_lookup(index):
+    assert index.find_by_barcode('8964000000028')['id'] == 3
+    assert index.find_by_barcode('000') is None
+
+
+def test_refresh_ids_replaces_and_removes_rows(index, monkeypatch):
+    renamed = dict(ROWS[2], medicine_name='Calpol Six Plus', barcode='8964000000099')
+    monkeypatch.setattr(search_index.Medicine.db, 'fetch_all', lambda query, params: [renamed])
+    index.refresh_ids([3, 4])   # 4 no longer exists in the database
+    assert ids(index.search("six")) == [3]
+    assert index.search("amoxil") == []
+    assert index.find_by_barcode('8964000000028') is None
+    assert index.find_by_barcode('8964000000099')['id'] == 3
+    assert 'amoxil' not in index._vocab
@@ -0,0 +1,64 @@
+import copy
+import json
+
+import pytest
+
+from database.events import events, TEMPLATE_CHANGED
+from services.template_service import TemplateService
+
+
+@pytest.fixture
+def template_file(tmp_path, monkeypatch):
+    path = tmp_path / 'config' / 'bill_template.json'
+    monkeypatch.setattr(TemplateService, 'FILE_PATH', str(path))
+    monkeypatch.setattr(TemplateService, '_cache', None)
+    monkeypatch.setattr(TemplateService, '_styles', {})
+    return path
+
+
+@pytest.fixture
+def changes():
+    published = []
+    callback = events.subscribe(TEMPLATE_CHANGED, published.append)
+    yield published
+    events.unsubscribe(TEMPLATE_CHANGED, callback)
+
+
+def test_missing_file_writes_default_quietly(template_file, changes):
+    template = TemplateService.load_template()
+    assert template == TemplateService.DEFAULT_TEMPLATE
+    assert template is not TemplateService.DEFAULT_TEMPLATE
+    assert json.loads(template_file.read_text()) == TemplateService.DEFAULT_TEMPLATE
+    assert TemplateService.load_template() is template
+    assert changes == []
+
+
+def test_repeat_loads_share_one_dict(template_file):
+    template_file.parent.mkdir()
+    template_file.write_text(json.dumps(TemplateService.DEFAULT_TEMPLATE))
+    first = TemplateService.load_template()
+    assert TemplateService.load_template() is first
+
+
+def test_save_invalidates_cache_and_publishes_once(template_file, changes):
+    before = TemplateService.load_template()
+    edited = copy.deepcopy(before)
+    edited['store']['name'] = "NEW CHEMIST"
+    assert TemplateService.save_template(edited)
+
+    after = TemplateService.load_template()
+    assert after is not before and after is not edited
+    assert after['store']['name'] == "NEW CHEMIST"
+    assert changes == [after]
+
+
+def test_style_is_reused_until_the_file_changes(template_file):
+    style = TemplateService.style()
+    assert TemplateService.style() is style
+
+    edited = copy.deepcopy(TemplateService.load_template())
+    edited['theme']['font_family'] = "Roboto Condensed"
+    template_file.write_text(json.dumps(edited))
+    changed = TemplateService.style()
+    assert changed is not style and changed.family == "Roboto Condensed"
+    assert TemplateService.style() is changed